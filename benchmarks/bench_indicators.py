@@ -0,0 +1,89 @@
+"""
+Indicator Microbenchmark
+========================
+Tek geçişte (N sembol × T bar) indikatör hesaplama süresi ile sembol
+başına pandas döngüsünü karşılaştırır.
+
+Usage:
+    py benchmarks/bench_indicators.py
+    py benchmarks/bench_indicators.py --bars 504
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import indicators
+
+
+SYMBOL_COUNTS = [1, 10, 50, 100, 250, 500]
+
+
+def random_walk(n_symbols: int, n_bars: int, seed: int = 42):
+    """Log-normal rastgele yürüyüş: close, high, low (N × T)."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_symbols, n_bars)), axis=1))
+    spread = np.abs(rng.normal(0, 0.01, (n_symbols, n_bars))) * close
+    return close, close + spread, close - spread
+
+
+def run_vectorized(close, high, low):
+    indicators.rsi(close)
+    indicators.ema(close, 20)
+    indicators.sma(close, 20)
+    indicators.macd(close)
+    indicators.bollinger(close)
+    indicators.atr(high, low, close)
+    indicators.rolling_volatility(close)
+
+
+def run_pandas_loop(close, high, low):
+    """Referans: sembol başına pandas hesaplaması."""
+    for c, h, l in zip(close, high, low):
+        s = pd.Series(c)
+        d = s.diff()
+        gain = d.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-d.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+        _ = 100 - 100 / (1 + gain / loss)
+        _ = s.ewm(span=20, adjust=False).mean()
+        _ = s.rolling(20).mean()
+        macd_line = s.ewm(span=12, adjust=False).mean() - s.ewm(span=26, adjust=False).mean()
+        _ = macd_line.ewm(span=9, adjust=False).mean()
+        _ = s.rolling(20).std()
+        prev = s.shift(1)
+        tr = pd.concat([pd.Series(h) - pd.Series(l), (pd.Series(h) - prev).abs(), (pd.Series(l) - prev).abs()], axis=1).max(axis=1)
+        _ = tr.ewm(alpha=1 / 14, adjust=False).mean()
+        _ = np.log(s).diff().rolling(20).std()
+
+
+def timeit(fn, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indicator engine microbenchmark")
+    parser.add_argument("--bars", type=int, default=252, help="Bars per symbol (default: 1 year daily)")
+    args = parser.parse_args()
+
+    print(f"{'symbols':>8} | {'vectorized ms':>14} | {'pandas loop ms':>15} | {'speedup':>8}")
+    print("-" * 56)
+    for n in SYMBOL_COUNTS:
+        data = random_walk(n, args.bars)
+        vec = timeit(run_vectorized, *data)
+        loop = timeit(run_pandas_loop, *data)
+        print(f"{n:>8} | {vec:>14.2f} | {loop:>15.2f} | {loop / vec:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Portfolio Benchmark
+===================
+Büyüyen evren boyutlarında (sentetik 1 yıllık günlük kapanışlar) her
+ağırlıklandırma modunun optimize + tam lot dağıtım süresini ölçer.
+
+Usage:
+    py benchmarks/bench_portfolio.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.portfolio import MODES, allocate_lots, optimize
+
+
+UNIVERSE_SIZES = [10, 50, 100, 250, 500]
+PERIODS = 253
+AMOUNT = 1_000_000
+REPEAT = 5
+
+
+def synthetic_closes(n: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.012, PERIODS)
+    beta = rng.uniform(0.5, 1.5, (n, 1))
+    idio = rng.uniform(0.005, 0.03, (n, 1)) * rng.standard_normal((n, PERIODS))
+    return rng.uniform(5, 300, (n, 1)) * np.cumprod(1 + beta * market + 0.0004 + idio, axis=1)
+
+
+def timed(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'symbols':>7} | " + " | ".join(f"{m:>12}" for m in MODES) + " |  cash left")
+    print("-" * (12 + 15 * len(MODES) + 12))
+    for n in UNIVERSE_SIZES:
+        closes = synthetic_closes(n)
+        prices = closes[:, -1]
+        cells, leftover = [], 0.0
+
+        for mode in MODES:
+            def run():
+                w, _ = optimize(closes, mode)
+                return allocate_lots(AMOUNT, w, prices)
+            cells.append(f"{timed(run) * 1000:>10.1f}ms")
+            leftover = max(leftover, AMOUNT - float(run() @ prices))
+        print(f"{n:>7} | " + " | ".join(cells) + f" | {leftover:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Offline Replay Benchmark
+========================
+Tool'ları kayıtlı piyasa verisi (RecordedProvider) üzerinde, ağ olmadan ve
+deterministik olarak çalıştırıp soğuk (boş fiyat deposu) ve sıcak süreleri ölçer.
+
+Kayıt dizini verilmezse BIST evreni + USD çaprazları için sentetik 5 yıllık
+günlük barlar üretilir. Gerçek veriyle kayıt almak için ajanı
+MARKET_DATA=record MARKET_DATA_DIR=<dizin> ile çalıştırın.
+
+Usage:
+    py benchmarks/bench_replay.py [kayıt_dizini] [--latency 0.05]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Fiyat deposu ve önbellekler geçici dizine yazılsın (tools import edilmeden önce)
+os.environ["YATIRIM_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench-replay-cache-")
+os.environ.setdefault("SCREENER_WARMUP", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.fx import FX_BASES
+from tools.market_data import RecordedProvider, set_provider
+from tools.screener import get_screener, load_universe
+from tools import market_tools as mt
+
+
+PERIODS = 1260               # ≈ 5 yıl günlük bar
+LAST_BAR = "2026-03-02"
+
+
+def synthetic_recording(root: str, seed: int = 1) -> int:
+    """Evren sembolleri ve USD çaprazları için sentetik OHLCV kaydı."""
+    rng = np.random.default_rng(seed)
+    recorder = RecordedProvider(root, upstream=None)
+    dates = pd.bdate_range(end=LAST_BAR, periods=PERIODS, tz="Europe/Istanbul", name="Date")
+    symbols = list(load_universe()) + [f"USD{c}=X" for c in FX_BASES]
+    for sym in symbols:
+        close = rng.uniform(5, 300) * np.cumprod(1 + rng.normal(0.0004, 0.02, PERIODS))
+        spread = close * rng.uniform(0, 0.01, PERIODS)
+        recorder.record(sym, "1d", pd.DataFrame({
+            "Open": close, "High": close + spread, "Low": close - spread, "Close": close,
+            "Volume": rng.integers(10_000, 5_000_000, PERIODS).astype(float),
+        }, index=dates))
+        recorder.record_info(sym, {"shortName": sym, "trailingPE": float(rng.uniform(3, 30)),
+                                   "marketCap": float(rng.uniform(1e9, 1e11))})
+    return len(symbols)
+
+
+SCENARIOS = [
+    # screen_stocks snapshot'ı istek yolunda kurmaz; kurulum ayrı ölçülür
+    ("screener_warmup", lambda: get_screener().refresh()),
+    ("screen_stocks", lambda: mt.screen_stocks.invoke({"rsi_below": 40, "top": 5})),
+    ("scan_sector", lambda: mt.scan_sector.invoke({"sector": "banka"})),
+    ("compare", lambda: mt.compare.invoke({"symbols": ["GARAN.IS", "AKBNK.IS", "THYAO.IS"]})),
+    ("analyze_stock", lambda: mt.analyze_stock.invoke({"symbol": "GARAN.IS"})),
+    ("build_portfolio", lambda: mt.build_portfolio.invoke(
+        {"amount": 100000, "symbols": ["GARAN.IS", "AKBNK.IS", "THYAO.IS", "ASELS.IS"], "mode": "min_variance"})),
+    ("get_forex", lambda: mt.get_forex.invoke({"pair": ""})),
+    ("backtest_signal", lambda: mt.backtest_signal.invoke({"period": "5y"})),
+]
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    if isinstance(result, dict) and "err" in result:
+        raise RuntimeError(result["err"])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("recording", nargs="?")
+    parser.add_argument("--latency", type=float, default=0.0, help="çağrı başına eklenen gecikme (s)")
+    args = parser.parse_args()
+
+    root = args.recording
+    if root is None:
+        root = tempfile.mkdtemp(prefix="bench-replay-data-")
+        print(f"Sentetik kayıt: {synthetic_recording(root)} sembol → {root}")
+
+    provider = RecordedProvider(root, latency=args.latency)
+    set_provider(provider)
+
+    print(f"{'scenario':>16} | {'cold':>9} | {'warm':>9} | provider calls")
+    print("-" * 56)
+    for name, fn in SCENARIOS:
+        before = provider.calls
+        cold = timed(fn)
+        calls = provider.calls - before
+        warm = timed(fn)
+        print(f"{name:>16} | {cold * 1000:>7.0f}ms | {warm * 1000:>7.0f}ms | {calls}")
+
+
+if __name__ == "__main__":
+    main()
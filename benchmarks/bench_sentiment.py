@@ -0,0 +1,58 @@
+"""
+Sentiment Benchmark
+===================
+Derlenmiş sözlüğün toplu skorlamasını, eski kelime-varlık döngüsünün
+başlık başına uygulanmasıyla karşılaştırır (sentetik Türkçe başlıklar).
+Eski yöntem yalnızca varlık sayar ve Türkçe normalizasyon yapmaz; referans
+olarak verilmiştir, sonuçları eşdeğer değildir.
+
+Usage:
+    py benchmarks/bench_sentiment.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.sentiment import POSITIVE_TERMS, NEGATIVE_TERMS, score_headline, score_headlines
+
+
+BATCH_SIZES = [100, 1000, 10000, 50000]
+FILLER = ["borsa", "istanbul", "hisse", "endeks", "günü", "piyasalarda", "yatırımcı",
+          "şirket", "bilanço", "açıkladı", "beklenti", "sektör", "dolar", "faiz"]
+
+
+def synthetic_headlines(n: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    words = FILLER * 3 + list(POSITIVE_TERMS) + list(NEGATIVE_TERMS)
+    return [" ".join(rng.choices(words, k=rng.randint(6, 14))).capitalize() for _ in range(n)]
+
+
+def legacy_score(text: str) -> int:
+    """get_news'in eski yöntemi: kelime varlığı, alt dizgi araması."""
+    t = text.lower()
+    return sum(1 for w in POSITIVE_TERMS if w in t) - sum(1 for w in NEGATIVE_TERMS if w in t)
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'headlines':>9} | {'legacy ms':>9} | {'single ms':>9} | {'batch ms':>9} | {'batch /s':>10}")
+    print("-" * 60)
+    for n in BATCH_SIZES:
+        texts = synthetic_headlines(n)
+        legacy = timed(lambda: [legacy_score(t) for t in texts])
+        single = timed(lambda: [score_headline(t) for t in texts])
+        batch = timed(score_headlines, texts)
+        print(f"{n:>9} | {legacy * 1000:>9.1f} | {single * 1000:>9.1f} | {batch * 1000:>9.1f} | {n / batch:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
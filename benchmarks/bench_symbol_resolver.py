@@ -0,0 +1,72 @@
+"""
+Symbol Resolver Benchmark
+=========================
+SymbolIndex ile eski doğrusal kısmi eşleşme döngüsünü karşılaştırır.
+Takma ad tablosu SYMBOL_MAP + sentetik BIST/kripto isimleriyle büyütülür.
+
+Usage:
+    py benchmarks/bench_symbol_resolver.py
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.market_tools import SYMBOL_MAP
+from tools.symbol_index import SymbolIndex
+
+
+TABLE_SIZES = [len(SYMBOL_MAP), 1000, 5000, 20000]
+QUERIES = ["altın", "thy", "türk hava yolları hissesi", "apple pie", "bitc", "asdfghjkl", "ereğli demir çelik"]
+
+
+def synthetic_table(size: int, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    table = dict(SYMBOL_MAP)
+    while len(table) < size:
+        name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 14)))
+        table[name] = name[:5].upper() + ".IS"
+    return table
+
+
+def legacy_lookup(table: dict, query: str):
+    """resolve_symbol'ün eski tablo/kısmi eşleşme adımı."""
+    q = query.lower().strip()
+    if q in table:
+        return table[q]
+    for key, symbol in table.items():
+        if key in q or q in key:
+            return symbol
+    return None
+
+
+def per_call_us(fn, queries, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for q in queries:
+            fn(q)
+    return (time.perf_counter() - start) / (rounds * len(queries)) * 1e6
+
+
+def main():
+    print(f"{'aliases':>8} | {'legacy µs/call':>15} | {'index µs/call':>14} | {'build ms':>9} | {'speedup':>8}")
+    print("-" * 68)
+    for size in TABLE_SIZES:
+        table = synthetic_table(size)
+        start = time.perf_counter()
+        index = SymbolIndex(table)
+        index.lookup("warmup")
+        build_ms = (time.perf_counter() - start) * 1000
+
+        rounds = max(5, 20000 // size)
+        legacy = per_call_us(lambda q: legacy_lookup(table, q), QUERIES, rounds)
+        indexed = per_call_us(index.lookup, QUERIES, rounds * 20)
+        print(f"{size:>8} | {legacy:>15.1f} | {indexed:>14.2f} | {build_ms:>9.1f} | {legacy / indexed:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Telegram Bot for Financial Research Agent
 Webhook-based bot for Render deployment.
 """
 
+import atexit
 import os
 import sys
 from dotenv import load_dotenv
@@ -17,7 +18,13 @@ from flask import Flask, request
 from telegram import Update, Bot
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
 
-from react_agent import run_react_agent
+from react_agent import arun_react_agent
+from tools.fundamentals import start_warmup
+from tools.screener import start_refresh as start_screener_refresh
+from tools.market_tools import watchlist
+from tools.http import aclose_async_client
+from tools.parallel import BackgroundLoop
+from tools.tavily_search import aclose_async_clients as aclose_tavily_clients
 
 # Configuration
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -25,6 +32,17 @@ WEBHOOK_URL = os.getenv("RENDER_EXTERNAL_URL", "")
 
 app = Flask(__name__)
 
+# Webhook'lar tek, uzun ömürlü loop'ta işlenir: loop başına kurulan httpx/Tavily
+# istemcileri keep-alive bağlantılarını istekler arasında korur, kapanışta kapatılır
+event_loop = BackgroundLoop(closers=[aclose_async_client, aclose_tavily_clients])
+atexit.register(event_loop.stop)
+
+# Temel verileri (P/E, piyasa değeri...) ve BIST tarama snapshot'ını istek yolunun dışında ısıt
+if os.getenv("FUNDAMENTALS_WARMUP", "1") == "1":
+    start_warmup(watchlist())
+if os.getenv("SCREENER_WARMUP", "1") == "1":
+    start_screener_refresh()
+
 
 def format_for_telegram(text: str) -> str:
     """
@@ -107,7 +125,7 @@ async def handle_message(update: Update, context):
         )
         
         # Run the financial research agent
-        report = run_react_agent(user_message)
+        report = await arun_react_agent(user_message)
         
         # Delete status message
         await status_msg.delete()
@@ -133,8 +151,6 @@ async def handle_message(update: Update, context):
 @app.route(f"/{TELEGRAM_TOKEN}", methods=["POST"])
 def webhook():
     """Handle incoming Telegram updates via webhook."""
-    import asyncio
-    
     update = Update.de_json(request.get_json(), Bot(TELEGRAM_TOKEN))
     
     async def process():
@@ -152,7 +168,7 @@ def webhook():
         finally:
             await bot_app.shutdown()
     
-    asyncio.run(process())
+    event_loop.run(process())
     
     return "OK", 200
 
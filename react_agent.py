@@ -4,8 +4,7 @@ ReAct Agent v5 - With bind_tools
 Native LangGraph tool calling with Reflection.
 """
 
-import os
-import time
+import operator
 from typing import TypedDict, Annotated
 from datetime import datetime
 
@@ -14,14 +13,12 @@ load_dotenv()
 
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
 
 from tools.market_tools import ALL_TOOLS
-
-# Rate limit delay
-RATE_LIMIT_DELAY = 2
+from tools.compaction import compact_messages
+from tools.llm import LLMCall, LLMClient, get_llm_registry
+from tools.tool_node import ParallelToolNode, get_tool_memo
 
 
 # =============================================================================
@@ -34,6 +31,8 @@ class AgentState(TypedDict):
     draft_answer: str
     final_report: str
     needs_more_work: bool
+    rate_limit_delay: Annotated[float, operator.add]   # LLM kovasında beklenen toplam süre (s)
+    tokens_saved: Annotated[int, operator.add]         # geçmiş sıkıştırmasıyla gönderilmeyen tahmini token
 
 
 # =============================================================================
@@ -62,9 +61,12 @@ BU YÜZDEN:
 | analyze_stock(symbol) | Spesifik varlık analizi (altın, bitcoin, THYAO vb.) |
 | get_news(company) | Haberler, piyasa yorumları ve sentiment analizi için (ÖNCELİKLİ) |
 | scan_sector(sector) | Sektör karşılaştırması (banka, holding, enerji) |
+| screen_stocks(...) | Tüm BIST taraması: "RSI < 30 bankalar", "en iyi 5 momentum" |
 | web_search(query) | Sadece veri bulunamazsa kullan |
 | compare(symbols) | 2-3 varlık karşılaştırması |
-| get_forex(pair) | Döviz kurları (USDTRY, EURTRY) |
+| backtest_signal(sector, symbols, period) | AL/SAT/TUT sinyalinin geçmiş başarısı (isabet, getiri, düşüş); sektör ya da semboller zorunlu |
+| build_portfolio(amount, symbols, mode) | Bütçe dağıtımı: equal, min_variance, risk_parity, max_sharpe, inverse_vol |
+| get_forex(pair, pairs) | Döviz kurları: tek çağrıda birden çok parite (USDTRY, EURTRY, EURUSD); boş pair = ana TRY kurları |
 
 ## ÖRNEK KARARLAR (Bunlardan öğren!)
 
@@ -167,7 +169,7 @@ def rewrite_query(user_query: str) -> str:
     try:
         llm = get_llm()
         prompt = QUERY_REWRITER_PROMPT.format(query=user_query)
-        response = llm.invoke([HumanMessage(content=prompt)])
+        response = call_llm(llm, [HumanMessage(content=prompt)], "Query Rewriter").response
         rewritten = response.content.strip()
         
         print(f"[Query Rewriter] Rewritten: {rewritten}")
@@ -180,42 +182,30 @@ def rewrite_query(user_query: str) -> str:
 # =============================================================================
 # LLM SETUP
 # =============================================================================
-def get_llm():
-    """Get base LLM instance."""
-    openrouter_key = os.getenv("OPENROUTER_API_KEY")
-    google_key = os.getenv("GOOGLE_API_KEY")
-    
-    if openrouter_key:
-        return ChatOpenAI(
-            model="xiaomi/mimo-v2-flash:free",
-            openai_api_key=openrouter_key,
-            openai_api_base="https://openrouter.ai/api/v1",
-            temperature=0.3,
-            default_headers={
-                "HTTP-Referer": "http://localhost",
-                "X-Title": "FinAgent"
-            }
-        )
-    elif google_key:
-        from langchain_google_genai import ChatGoogleGenerativeAI
-        return ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=google_key,
-            temperature=0.3
-        )
-    else:
-        raise ValueError("No API key found. Set OPENROUTER_API_KEY or GOOGLE_API_KEY.")
+def get_llm() -> LLMClient:
+    """Base LLM (cached per provider, OpenRouter → Gemini failover)."""
+    return LLMClient(get_llm_registry())
 
 
-def get_llm_with_tools():
-    """Get LLM with tools bound for native tool calling."""
-    return get_llm().bind_tools(ALL_TOOLS)
+def get_llm_with_tools() -> LLMClient:
+    """LLM with tools bound for native tool calling (bind_tools runs once per provider)."""
+    return LLMClient(get_llm_registry(), ALL_TOOLS)
+
+
+def call_llm(llm: LLMClient, messages, node: str) -> LLMCall:
+    """LLM çağrısı; hız sınırı kuyruğunda beklenen süreyi raporlar."""
+    call = llm.call(messages)
+    if call.waited:
+        print(f"[RateLimit] {node}: {call.waited:.2f}s kuyrukta beklendi ({call.provider})")
+    return call
 
 
 # =============================================================================
-# TOOL NODE (using LangGraph prebuilt)
+# TOOL NODE (LangGraph ToolNode + per-call timeout, timing & memoization)
 # =============================================================================
-tool_node = ToolNode(ALL_TOOLS)
+# Bir turdaki tool çağrıları eşzamanlı çalışır; tur en yavaş çağrı kadar sürer.
+# Taze sonuçlar oturumlar arasında paylaşılır (tools.tool_node.TOOL_FRESHNESS).
+tool_node = ParallelToolNode(ALL_TOOLS, memo=get_tool_memo())
 
 
 # =============================================================================
@@ -224,7 +214,6 @@ tool_node = ToolNode(ALL_TOOLS)
 def agent_node(state: AgentState) -> AgentState:
     """Agent node that uses native tool calling."""
     print("\n[Agent] Thinking...")
-    time.sleep(RATE_LIMIT_DELAY)
     
     messages = state["messages"]
     
@@ -236,9 +225,15 @@ def agent_node(state: AgentState) -> AgentState:
     if state.get("needs_more_work"):
         messages = list(messages) + [HumanMessage(content="Cevabın yetersiz bulundu. Daha fazla veri topla ve analiz yap.")]
     
+    # Eski tool çıktılarını token bütçesine sığdır (state'teki geçmiş değişmez)
+    compacted = compact_messages(messages)
+    if compacted.saved:
+        print(f"[Compact] Agent: ~{compacted.before} → ~{compacted.after} token ({compacted.saved} tasarruf)")
+
     # Call LLM with bound tools
     llm = get_llm_with_tools()
-    response = llm.invoke(messages)
+    call = call_llm(llm, compacted.messages, "Agent")
+    response = call.response
     
     # Update iteration count
     new_iteration = state.get("iteration", 0) + 1
@@ -260,7 +255,9 @@ def agent_node(state: AgentState) -> AgentState:
         "needs_more_work": False,
         "draft_answer": state.get("draft_answer", ""),
         "final_report": state.get("final_report", ""),
-        "user_query": state.get("user_query", "")
+        "user_query": state.get("user_query", ""),
+        "rate_limit_delay": call.waited,
+        "tokens_saved": compacted.saved
     }
 
 
@@ -270,7 +267,6 @@ def agent_node(state: AgentState) -> AgentState:
 def reflection_node(state: AgentState) -> AgentState:
     """Evaluate answer quality and decide if more work is needed."""
     print("\n[Reflection] Evaluating answer quality...")
-    time.sleep(RATE_LIMIT_DELAY)
     
     llm = get_llm()
     
@@ -279,8 +275,8 @@ def reflection_node(state: AgentState) -> AgentState:
         answer=state["draft_answer"]
     )
     
-    response = llm.invoke([HumanMessage(content=prompt)])
-    result = response.content.strip()
+    call = call_llm(llm, [HumanMessage(content=prompt)], "Reflection")
+    result = call.response.content.strip()
     
     print(f"[Reflection] Result: {result[:50]}...")
     
@@ -292,7 +288,8 @@ def reflection_node(state: AgentState) -> AgentState:
             "needs_more_work": False,
             "draft_answer": state["draft_answer"],
             "iteration": state["iteration"],
-            "user_query": state["user_query"]
+            "user_query": state["user_query"],
+            "rate_limit_delay": call.waited
         }
     else:
         print("[Reflection] Needs more work...")
@@ -302,7 +299,8 @@ def reflection_node(state: AgentState) -> AgentState:
             "draft_answer": state["draft_answer"],
             "final_report": "",
             "iteration": state["iteration"],
-            "user_query": state["user_query"]
+            "user_query": state["user_query"],
+            "rate_limit_delay": call.waited
         }
 
 
@@ -385,8 +383,7 @@ def build_react_agent():
 react_agent = build_react_agent()
 
 
-def run_react_agent(user_query: str) -> str:
-    """Run the ReAct agent with a user query."""
+def _initial_state(user_query: str) -> dict:
     print("="*50)
     print("  FINANCIAL RESEARCH AGENT v6 (bind_tools)")
     print("="*50)
@@ -398,15 +395,19 @@ def run_react_agent(user_query: str) -> str:
     
     print("="*50)
     
-    result = react_agent.invoke({
+    return {
         "messages": [HumanMessage(content=rewritten_query)],
         "user_query": user_query,
         "iteration": 0,
         "draft_answer": "",
         "final_report": "",
-        "needs_more_work": False
-    })
-    
+        "needs_more_work": False,
+        "rate_limit_delay": 0.0,
+        "tokens_saved": 0
+    }
+
+
+def _extract_report(result: dict) -> str:
     print("\n" + "="*50)
     print("  FINAL REPORT")
     print("="*50)
@@ -426,10 +427,30 @@ def run_react_agent(user_query: str) -> str:
     
     if not report:
         report = "Rapor oluşturulamadı. (Iterasyon limiti veya teknik hata)"
+
+    if result.get("rate_limit_delay"):
+        print(f"[RateLimit] Toplam kuyruk beklemesi: {result['rate_limit_delay']:.2f}s")
+    if result.get("tokens_saved"):
+        print(f"[Compact] Toplam tasarruf: ~{result['tokens_saved']} token")
         
     print(report)
     return report
 
 
+def run_react_agent(user_query: str) -> str:
+    """Run the ReAct agent with a user query."""
+    result = react_agent.invoke(_initial_state(user_query))
+    return _extract_report(result)
+
+
+async def arun_react_agent(user_query: str) -> str:
+    """
+    Async variant of run_react_agent. Tools run through their async
+    implementations, so one event loop can serve many concurrent runs.
+    """
+    result = await react_agent.ainvoke(_initial_state(user_query))
+    return _extract_report(result)
+
+
 if __name__ == "__main__":
     run_react_agent("Gümüş alınır mı?")
@@ -8,6 +8,7 @@ from .models import ScoutInput, ScoutOutput
 from .market import fetch_market_data
 from .news import fetch_news
 from .scrubber import clean_news
+from tools.sentiment import score_headlines
 
 class ScoutAgent:
     def __init__(self):
@@ -68,6 +69,10 @@ class ScoutAgent:
             print(f"[News] Cleaning {len(raw_news)} raw items...")
             cleaned = clean_news(raw_news, [input_data.target_company])
             
+            # Tüm başlıklar tek geçişte skorlanır
+            for item, score in zip(cleaned, score_headlines(f"{n.title} {n.snippet}" for n in cleaned)):
+                item.sentiment = score.score
+            
             self.news_data = cleaned
             print(f"[News] Processed {len(cleaned)} relevant items.")
         except Exception as e:
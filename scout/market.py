@@ -1,16 +1,17 @@
-import yfinance as yf
 from datetime import datetime, timedelta
 from typing import List
 import pandas as pd
+from tools.price_store import get_price_store
 from .models import MarketData
 
 def fetch_market_data(symbol: str, start_time: datetime, end_time: datetime) -> List[MarketData]:
     """
-    Fetches hourly OHLCV data for the given symbol from yfinance.
+    Fetches hourly OHLCV data for the given symbol from the local price store (market data provider).
     Uses a broader period and filters locally to avoid empty returns on strict start/end.
     """
-    # Fetch 5 days to cover weekends/holidays and ensure we have ample data
-    df = yf.download(symbol, period="5d", interval="1h", progress=False)
+    # Fetch 5 days to cover weekends/holidays and ensure we have ample data.
+    # Yerel fiyat deposu yalnızca son saklanan bardan sonrasını indirir.
+    df = get_price_store().history(symbol, period="5d", interval="1h")
     
     market_data_list = []
     
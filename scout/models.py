@@ -28,6 +28,7 @@ class NewsItem:
     source: str
     snippet: str
     language: str = "unknown"
+    sentiment: int = 0  # olumlu - olumsuz sözlük eşleşmesi (tools.sentiment)
 
 @dataclass
 class ScoutOutput:
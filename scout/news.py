@@ -1,7 +1,7 @@
-import feedparser
 from datetime import datetime
 from typing import List
 import urllib.parse
+from tools.feeds import FEED_CACHE
 from .models import NewsItem
 
 def fetch_news(query: str) -> List[NewsItem]:
@@ -11,7 +11,7 @@ def fetch_news(query: str) -> List[NewsItem]:
     encoded_query = urllib.parse.quote(query)
     rss_url = f"https://news.google.com/rss/search?q={encoded_query}&hl=tr&gl=TR&ceid=TR:tr"
     
-    feed = feedparser.parse(rss_url)
+    feed = FEED_CACHE.get(rss_url)
     news_items = []
     
     for entry in feed.entries:
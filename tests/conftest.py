@@ -4,10 +4,83 @@ Test Fixtures and Mocks
 Shared fixtures for all tests.
 """
 
+import os
+import tempfile
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 
+# Kalıcı önbellekler (alias deposu vb.) testlerde geçici dizine yazılsın
+os.environ.setdefault("YATIRIM_CACHE_DIR", tempfile.mkdtemp(prefix="yatirim-test-cache-"))
+
+
+# =============================================================================
+# SHARED HELPERS (from tests.conftest import FakeClock, make_bars, wide_frame)
+# =============================================================================
+
+class FakeClock:
+    """Manually advanced clock; time.time / time.monotonic yerine enjekte edilir."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_bars(start: str = "2026-01-05", periods: Optional[int] = None, freq: str = "D",
+              tz: Optional[str] = None, close_start: float = 100.0,
+              closes: Optional[Sequence[float]] = None, dates: Optional[Sequence] = None) -> pd.DataFrame:
+    """
+    yfinance history biçiminde OHLCV tablosu.
+    Dizin: `dates` ya da start/periods/freq; kapanışlar: `closes` ya da close_start'tan birer artan seri.
+    Open = Close - 0.5, High/Low = Close ± 1, Volume = 1000.
+    """
+    if dates is not None:
+        index = pd.DatetimeIndex(pd.to_datetime(dates))
+        index = index.tz_localize(tz) if tz else index
+    else:
+        index = pd.date_range(start=start, periods=periods if periods is not None else len(closes),
+                              freq=freq, tz=tz)
+    close = (np.asarray(closes, dtype=float) if closes is not None
+             else close_start + np.arange(len(index), dtype=float))
+    return pd.DataFrame({
+        "Open": close - 0.5, "High": close + 1, "Low": close - 1,
+        "Close": close, "Volume": np.full(len(close), 1000.0),
+    }, index=index)
+
+
+def wide_frame(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """yf.download(group_by='ticker') biçiminde geniş tablo."""
+    return pd.concat(frames, axis=1, sort=True)
+
+
+# =============================================================================
+# CACHE ISOLATION
+# =============================================================================
+
+@pytest.fixture(autouse=True)
+def reset_market_caches():
+    """Clear process-wide caches so mocked data never leaks between tests."""
+    from tools.cache import HISTORY_CACHE, TICKER_CACHE
+    from tools.fundamentals import get_fundamentals_cache
+    from tools.feeds import FEED_CACHE
+    from tools.tavily_search import TAVILY_CACHE
+    from tools.price_store import get_price_store
+    from tools.fx import get_fx_engine
+    from tools.tool_node import get_tool_memo
+    caches = [HISTORY_CACHE, TICKER_CACHE, get_fundamentals_cache(), FEED_CACHE, TAVILY_CACHE,
+              get_price_store(), get_fx_engine(), get_tool_memo()]
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
 
 # =============================================================================
 # SAMPLE DATA FIXTURES
@@ -0,0 +1,156 @@
+"""
+Unit Tests for Alias Store
+===========================
+Tests for persistent positive aliases and expiring negative entries.
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.alias_store import AliasStore
+from tools.symbol_index import SymbolIndex
+from tools import market_tools
+from tests.conftest import FakeClock
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = AliasStore(str(tmp_path / "aliases.db"))
+    yield s
+    s.close()
+
+
+class TestAliasStore:
+    """Tests for AliasStore persistence and expiry."""
+
+    @pytest.mark.unit
+    def test_positive_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "aliases.db")
+        first = AliasStore(path)
+        first.put("ereğli", "EREGL.IS")
+        first.close()
+
+        second = AliasStore(path)
+        assert second.positives() == {"ereğli": "EREGL.IS"}
+        second.close()
+
+    @pytest.mark.unit
+    def test_negative_expires(self, tmp_path):
+        clock = FakeClock()
+        store = AliasStore(str(tmp_path / "aliases.db"), clock=clock)
+        store.put_negative("asdfghjkl", ttl=60)
+        assert store.is_negative("asdfghjkl")
+        clock.now += 61
+        assert not store.is_negative("asdfghjkl")
+        assert store.purge_expired() == 1
+        store.close()
+
+    @pytest.mark.unit
+    def test_negative_loaded_on_reopen(self, tmp_path):
+        path = str(tmp_path / "aliases.db")
+        first = AliasStore(path)
+        first.put_negative("asdfghjkl")
+        first.close()
+
+        second = AliasStore(path)
+        assert second.is_negative("asdfghjkl")
+        second.close()
+
+    @pytest.mark.unit
+    def test_guess_expires_and_is_not_a_positive(self, tmp_path):
+        clock = FakeClock()
+        path = str(tmp_path / "aliases.db")
+        store = AliasStore(path, clock=clock)
+        store.put("astor enerji", "ASTOR", ttl=60)
+        assert store.positives() == {}
+        store.close()
+
+        store = AliasStore(path, clock=clock)
+        assert store.guessed("astor enerji") == "ASTOR"
+        clock.now += 61
+        assert store.guessed("astor enerji") is None
+        assert store.purge_expired() == 1
+        store.close()
+
+    @pytest.mark.unit
+    def test_positive_overrides_negative(self, store):
+        store.put_negative("petkim")
+        store.put("petkim", "PETKM.IS")
+        assert not store.is_negative("petkim")
+        assert store.positives()["petkim"] == "PETKM.IS"
+
+
+class TestResolverUsesStore:
+    """resolve_symbol ↔ alias store integration."""
+
+    @pytest.fixture
+    def isolated_store(self, store):
+        """Fresh store, symbol table and index so learned aliases do not leak."""
+        with patch.object(market_tools, "get_alias_store", return_value=store), \
+             patch.dict(market_tools.SYMBOL_MAP), \
+             patch.object(market_tools, "SYMBOL_INDEX", SymbolIndex(market_tools.SYMBOL_MAP)):
+            yield store
+
+    @pytest.mark.unit
+    def test_negative_skips_web_search(self, isolated_store, mock_ddgs):
+        mock_ddgs.return_value.text.return_value = [{"title": "-", "body": "?", "href": ""}]
+        assert market_tools.resolve_symbol("qwzx anlamsız") == "QWZXAN"
+        assert isolated_store.is_negative("qwzx anlamsız")
+
+        market_tools.resolve_symbol("qwzx anlamsız")
+        assert mock_ddgs.call_count == 1
+
+    @pytest.mark.unit
+    def test_web_hit_is_persisted(self, isolated_store, mock_ddgs):
+        assert market_tools.resolve_symbol("ereğli demir çelik") == "EREGL.IS"
+        assert isolated_store.positives()["ereğli demir çelik"] == "EREGL.IS"
+        assert market_tools.SYMBOL_INDEX.lookup("ereğli demir çelik")[0] == "EREGL.IS"
+
+    @pytest.mark.unit
+    def test_unvalidated_guess_is_cached_negative(self, isolated_store, mock_ddgs):
+        # Gerçek sonuçlar hep 3-5 harfli büyük kelimeler içerir; hiçbiri ticker değil
+        mock_ddgs.return_value.text.return_value = [
+            {"title": "Borsa İstanbul BIST 100 endeksi", "body": "KAP bildirimi, SPK onayı ve TCMB faiz kararı", "href": ""},
+            {"title": "Hisse senedi nedir?", "body": "Yatırımcılar için ETF ve FON rehberi", "href": ""},
+        ]
+        provider = MagicMock()
+        provider.history.return_value = pd.DataFrame()
+        with patch.object(market_tools, "get_provider", return_value=provider), \
+             patch.object(market_tools, "get_history") as history:
+            assert market_tools.resolve_symbol("asdfghjkl") == "ASDFGH"
+            assert provider.history.call_count == market_tools.MAX_TICKER_GUESSES
+            assert isolated_store.is_negative("asdfghjkl")
+
+            market_tools.resolve_symbol("asdfghjkl")
+        assert mock_ddgs.call_count == 1
+        assert provider.history.call_count == market_tools.MAX_TICKER_GUESSES
+        # Adaylar doğrudan sağlayıcıyla doğrulanır; fiyat deposuna geri doldurma yazılmaz
+        history.assert_not_called()
+        assert provider.history.call_args.kwargs == {"interval": "1d", "period": "5d"}
+
+    @pytest.mark.unit
+    def test_validated_guess_is_cached_positive(self, isolated_store, mock_ddgs):
+        mock_ddgs.return_value.text.return_value = [
+            {"title": "SPK onaylı Astor Enerji", "body": "ASTOR hisse fiyatı ve grafik", "href": ""},
+        ]
+        with patch.object(market_tools, "_ticker_exists", side_effect=lambda s: s == "ASTOR"):
+            assert market_tools.resolve_symbol("astor enerji") == "ASTOR"
+        assert market_tools.resolve_symbol("astor enerji") == "ASTOR"
+        assert mock_ddgs.call_count == 1
+        # Tahmin süreli kaydedilir; kalıcı tabloya ve kısmi eşleşme indeksine girmez
+        assert isolated_store.guessed("astor enerji") == "ASTOR"
+        assert "astor enerji" not in isolated_store.positives()
+        assert market_tools.SYMBOL_INDEX.lookup("astor enerji holding") is None
+
+    @pytest.mark.unit
+    def test_store_error_does_not_break_resolution(self, mock_ddgs):
+        with patch.object(market_tools, "get_alias_store", side_effect=RuntimeError("database is locked")):
+            assert market_tools.resolve_symbol("qwzx anlamsız") == "QWZXAN"
+        mock_ddgs.assert_not_called()
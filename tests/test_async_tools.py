@@ -0,0 +1,114 @@
+"""
+Unit Tests for Async Tool Variants
+===================================
+Tests for the ainvoke paths of ALL_TOOLS.
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import market_tools
+from tools.market_tools import ALL_TOOLS, analyze_stock, get_forex, get_news, web_search
+from tools.http import get_async_client
+from tools.fx import FX_BASES
+
+
+RSS_FEED = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>t</title>
+<item><title>Bitcoin rekor yükseliş - Kaynak</title></item>
+<item><title>Alakasiz haber - Kaynak</title></item>
+</channel></rss>""".encode("utf-8")
+
+PAGE = b"<html><body><nav>menu</nav><article>Asil   icerik metni</article></body></html>"
+
+
+def mock_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestAsyncVariants:
+    """Every tool exposes a coroutine and returns the same result as invoke."""
+
+    @pytest.mark.unit
+    def test_all_tools_have_coroutine(self):
+        assert all(t.coroutine is not None for t in ALL_TOOLS)
+
+    @pytest.mark.unit
+    def test_analyze_stock_matches_sync(self, mock_yfinance):
+        sync_result = analyze_stock.invoke({"symbol": "NVDA"})
+        async_result = asyncio.run(analyze_stock.ainvoke({"symbol": "NVDA"}))
+        assert async_result == sync_result
+
+    @pytest.mark.unit
+    def test_concurrent_calls_overlap(self, mock_yfinance):
+        def slow_history(symbol, period="1mo", interval="1d"):
+            time.sleep(0.2)
+            return mock_yfinance.return_value.history.return_value
+
+        async def run():
+            return await asyncio.gather(*[
+                get_forex.ainvoke({"pair": f"P{i}TRY"}) for i in range(8)
+            ])
+
+        with patch.object(market_tools, "get_history", side_effect=slow_history):
+            start = time.perf_counter()
+            results = asyncio.run(run())
+        assert time.perf_counter() - start < 1.0
+        assert all("rate" in r for r in results)
+
+    @pytest.mark.unit
+    def test_cached_forex_stays_on_loop(self, mock_yfinance):
+        dates = pd.date_range("2025-12-01", periods=5, freq="B")
+        frame = pd.concat({f"USD{c}=X": pd.DataFrame({"Close": np.linspace(1, 2, 5)}, index=dates)
+                           for c in FX_BASES}, axis=1)
+        with patch("yfinance.download", return_value=frame):
+            get_forex.invoke({"pair": "USDTRY"})
+        with patch.object(market_tools, "run_blocking", side_effect=AssertionError("offloaded")):
+            result = asyncio.run(get_forex.ainvoke({"pair": "USDTRY"}))
+        assert result["pair"] == "USDTRY"
+
+
+class TestAsyncHttp:
+    """get_news / web_search use the shared async HTTP client."""
+
+    @pytest.mark.unit
+    def test_get_news_rss(self, monkeypatch):
+        monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+        seen = []
+
+        def handler(request):
+            seen.append(str(request.url))
+            return httpx.Response(200, content=RSS_FEED)
+
+        with patch("tools.feeds.get_async_client", return_value=mock_client(handler)):
+            result = asyncio.run(get_news.ainvoke({"company": "Bitcoin"}))
+        assert "news.google.com" in seen[0]
+        assert result["news"] == ["Bitcoin rekor yükseliş"]
+        assert result["sentiment"] == "OLUMLU"
+
+    @pytest.mark.unit
+    def test_web_search_extracts_page(self):
+        hits = [{"title": "T", "snippet": "S", "url": "https://example.com/a"}]
+        handler = lambda request: httpx.Response(200, content=PAGE)
+        with patch.object(market_tools, "_ddgs_search", return_value=hits), \
+             patch("tools.http.get_async_client", return_value=mock_client(handler)):
+            result = asyncio.run(web_search.ainvoke({"query": "q"}))
+        assert result["full_content"] == "Asil icerik metni"
+        assert result["source_url"] == "https://example.com/a"
+
+    @pytest.mark.unit
+    def test_client_reused_within_loop(self):
+        async def run():
+            return get_async_client() is get_async_client()
+        assert asyncio.run(run())
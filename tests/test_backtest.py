@@ -0,0 +1,158 @@
+"""
+Unit Tests for Signal Backtest
+==============================
+Tests for the vectorized AL/SAT/TUT backtest and history deepening.
+"""
+
+import pytest
+import sys
+import os
+import time
+from unittest.mock import patch
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.backtest import (
+    DEFAULT_RULE, _prepare, backtest, classify, evaluate, max_drawdown,
+    positions, rule_grid, signal_label,
+)
+from tools.price_store import PriceStore
+from tools.market_tools import backtest_signal
+from tests.conftest import make_bars, wide_frame
+
+
+def random_closes(n: int, periods: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.cumprod(1 + rng.normal(0.0003, 0.02, (n, periods)), axis=1)
+
+
+class TestRule:
+    """Tests for the signal rule shared with analyze_stock."""
+
+    @pytest.mark.unit
+    def test_classify_matches_inline_rule(self):
+        for rsi in (10, 29.9, 30, 50, 70, 70.1, 90):
+            for chg in (-8, -5, -4.9, 0, 5, 5.1, 9):
+                legacy = "AL" if rsi < 30 or chg > 5 else "SAT" if rsi > 70 or chg < -5 else "TUT"
+                assert signal_label(rsi, chg) == legacy
+
+    @pytest.mark.unit
+    def test_classify_is_vectorized_and_nan_is_hold(self):
+        out = classify(np.array([[20, 80, np.nan]]), np.array([[0, 0, np.nan]]))
+        assert out.tolist() == [[1, -1, 0]]
+
+    @pytest.mark.unit
+    def test_rule_grid(self):
+        grid = rule_grid()
+        assert len(grid) == 27
+        assert DEFAULT_RULE in grid
+
+
+class TestEngine:
+    """Tests for positions, returns and metrics."""
+
+    @pytest.mark.unit
+    def test_positions_carry_last_signal(self):
+        signals = np.array([[0, 1, 0, 0, -1, 0, 1]])
+        assert positions(signals).tolist() == [[0, 1, 1, 1, 0, 0, 1]]
+
+    @pytest.mark.unit
+    def test_max_drawdown(self):
+        assert max_drawdown(np.array([0.1, -0.5, 0.2])) == pytest.approx(-0.5)
+        assert max_drawdown(np.array([-0.1, 0.0])) == pytest.approx(-0.1)
+
+    @pytest.mark.unit
+    def test_signal_trades_from_next_bar(self):
+        closes = np.array([[100.0, 110.0, 121.0, 108.9]])
+        inputs = _prepare(closes, horizon=1)
+        # Bar 0'da AL, bar 2'de SAT: yalnızca bar 1 ve 2 getirisi kazanılır
+        rsi = np.array([[10.0, 50.0, 90.0, 50.0]])
+        chg = np.zeros((1, 4))
+        r = evaluate(DEFAULT_RULE, inputs, rsi, chg, cost_bps=0)
+        assert r["mean_return"] == pytest.approx(0.21)
+        assert r["trades"] == 1
+        # AL (bar 0 → +10%) ve SAT (bar 2 → -10%) doğru; bar 3'ün ileri getirisi yok
+        assert r["hit_rate"] == pytest.approx(1.0)
+        assert r["signals"] == 2
+
+    @pytest.mark.unit
+    def test_costs_reduce_returns(self):
+        closes = random_closes(20, 300)
+        free = backtest(closes, cost_bps=0)[0]
+        paid = backtest(closes, cost_bps=50)[0]
+        assert paid["mean_return"] < free["mean_return"]
+
+    @pytest.mark.unit
+    def test_variants_sorted_by_portfolio_return(self):
+        results = backtest(random_closes(30, 400), rule_grid())
+        returns = [r["portfolio_return"] for r in results]
+        assert returns == sorted(returns, reverse=True)
+        assert all(-1 <= r["portfolio_drawdown"] <= 0 for r in results)
+
+    @pytest.mark.unit
+    def test_leading_gaps_are_not_traded(self):
+        closes = random_closes(2, 200)
+        closes[1, :100] = np.nan
+        r = backtest(closes)[0]
+        assert np.isfinite(r["per_symbol_return"]).all()
+
+    @pytest.mark.unit
+    def test_full_universe_sweep_is_fast(self):
+        closes = random_closes(300, 1260)
+        start = time.perf_counter()
+        backtest(closes, rule_grid())
+        assert time.perf_counter() - start < 5
+
+
+class TestEnsureDepth:
+    """Tests for deepening stored history before long backtests."""
+
+    @pytest.mark.unit
+    def test_rewrite_keeps_newer_stored_bars(self, tmp_path):
+        store = PriceStore(str(tmp_path / "prices"))
+        recent = make_bars("2025-06-02", closes=np.arange(5, dtype=float) + 1000, freq="B")
+        store.write("AAA.IS", "1d", recent)
+        version = store.meta("AAA.IS", "1d")["version"]
+
+        deep = wide_frame({"AAA.IS": make_bars("2023-01-02", closes=np.arange(600, dtype=float), freq="B")})
+        with patch("yfinance.download", return_value=deep) as download:
+            assert store.ensure_depth(["AAA.IS"], "2y") == 1
+            assert store.ensure_depth(["AAA.IS"], "2y") == 0
+        assert download.call_count == 1
+        assert download.call_args.kwargs["period"] == "2y"
+
+        closes = np.array(store.columns("AAA.IS", "1d")["Close"])
+        assert len(closes) == 605
+        assert closes[-1] == 1004
+        assert store.depth_days("AAA.IS", "1d") > 700
+        assert store.meta("AAA.IS", "1d")["version"] > version
+
+
+class TestBacktestTool:
+    """backtest_signal tool."""
+
+    @pytest.mark.unit
+    def test_tool_summary(self):
+        symbols = ["AAA.IS", "BBB.IS", "CCC.IS", "DDD.IS"]
+        frame = wide_frame({s: make_bars("2023-01-02", closes=c, freq="B")
+                            for s, c in zip(symbols, random_closes(4, 500))})
+        with patch("yfinance.download", return_value=frame):
+            result = backtest_signal.invoke({"symbols": symbols, "period": "2y", "variants": True})
+        assert result["symbols"] == 4
+        assert {"hit", "ret", "dd", "buy_hold", "exposure"} <= set(result)
+        assert len(result["best"]) == 3
+        assert 1 <= result["rank"] <= 27
+
+    @pytest.mark.unit
+    def test_whole_universe_is_not_deepened_in_request(self):
+        with patch("tools.price_store.PriceStore.ensure_depth") as deepen:
+            result = backtest_signal.invoke({"period": "5y"})
+        assert result["err"].startswith("Sector or symbols required")
+        deepen.assert_not_called()
+
+    @pytest.mark.unit
+    def test_invalid_period(self):
+        assert "err" in backtest_signal.invoke({"symbols": ["AAA.IS"], "period": "10y"})
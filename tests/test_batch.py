@@ -0,0 +1,78 @@
+"""
+Unit Tests for Batch Market Data
+=================================
+Tests for bulk download splitting and vectorized ranking.
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.batch import _split_frame, period_returns, rank_by_return
+from tools.market_tools import scan_sector
+from tests.conftest import make_bars, wide_frame
+
+
+@pytest.fixture
+def mock_download():
+    """Mock yfinance.download with three tickers of known performance."""
+    closes = {
+        "GARAN.IS": [100, 105, 110],       # +10%
+        "AKBNK.IS": [50, 49, 45],          # -10%
+        "YKBNK.IS": [20, np.nan, 21],      # +5%
+        "ISCTR.IS": [np.nan, np.nan, np.nan],
+    }
+    frame = wide_frame({sym: make_bars("2025-12-01", closes=c) for sym, c in closes.items()})
+    with patch("yfinance.download", return_value=frame) as mock:
+        yield mock
+
+
+class TestSplitFrame:
+    """Tests for splitting a batched download into per-symbol frames."""
+
+    @pytest.mark.unit
+    def test_missing_closes_are_dropped(self, mock_download):
+        symbols = ["GARAN.IS", "AKBNK.IS", "YKBNK.IS", "ISCTR.IS", "EKGYO.IS"]
+        frames = _split_frame(mock_download.return_value, symbols)
+        assert set(frames) == {"GARAN.IS", "AKBNK.IS", "YKBNK.IS", "ISCTR.IS"}
+        assert frames["ISCTR.IS"].empty
+        assert len(frames["YKBNK.IS"]) == 2
+
+    @pytest.mark.unit
+    def test_flat_frame_is_single_symbol(self):
+        flat = make_bars("2025-12-01", 3)
+        assert list(_split_frame(flat, ["GARAN.IS"])) == ["GARAN.IS"]
+        assert _split_frame(flat, ["GARAN.IS", "AKBNK.IS"]) == {}
+
+
+class TestRanking:
+    """Tests for vectorized return ranking."""
+
+    @pytest.mark.unit
+    def test_period_returns_skip_nan(self):
+        closes = pd.DataFrame({"A": [np.nan, 10, 12], "B": [4, np.nan, 2]})
+        chg = period_returns(closes)
+        assert chg["A"] == pytest.approx(20.0)
+        assert chg["B"] == pytest.approx(-50.0)
+
+    @pytest.mark.unit
+    def test_rank_order(self):
+        closes = pd.DataFrame({"GARAN.IS": [100, 105, 110], "AKBNK.IS": [50, 49, 45], "YKBNK.IS": [20, np.nan, 21]})
+        ranked = rank_by_return(closes)
+        assert list(ranked.index) == ["GARAN.IS", "YKBNK.IS", "AKBNK.IS"]
+        assert ranked.loc["YKBNK.IS", "p"] == 21
+
+    @pytest.mark.unit
+    def test_scan_sector_uses_batch(self, mock_download):
+        result = scan_sector.invoke({"sector": "banka"})
+        assert mock_download.call_count == 1
+        assert result["best"] == "GARAN"
+        assert [r["s"] for r in result["top3"]] == ["GARAN", "YKBNK", "AKBNK"]
+        assert result["top3"][0]["chg"] == "+10.0%"
@@ -0,0 +1,122 @@
+"""
+Unit Tests for Market Data Cache
+=================================
+Tests for TTL/LRU behaviour and market-hours aware TTLs.
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.cache import (
+    TTLCache,
+    HISTORY_CACHE,
+    CACHE_TTL_OPEN,
+    CACHE_TTL_CLOSED,
+    get_history,
+    history_ttl,
+    is_market_open,
+    market_for_symbol,
+)
+from tests.conftest import FakeClock
+
+
+class TestTTLCache:
+    """Tests for the generic TTLCache."""
+
+    @pytest.mark.unit
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(maxsize=4)
+        assert cache.get("a") == (False, None)
+        cache.set("a", 1, ttl=60)
+        assert cache.get("a") == (True, 1)
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.unit
+    def test_entry_expires(self):
+        clock = FakeClock()
+        cache = TTLCache(maxsize=4, clock=clock)
+        cache.set("a", 1, ttl=60)
+        clock.now += 59
+        assert cache.get("a")[0]
+        clock.now += 2
+        assert not cache.get("a")[0]
+        assert len(cache) == 0
+
+    @pytest.mark.unit
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")              # a en son kullanılan oldu
+        cache.set("c", 3, ttl=60)   # b çıkarılmalı
+        assert cache.get("a")[0]
+        assert not cache.get("b")[0]
+        assert cache.stats()["evictions"] == 1
+
+
+class TestMarketHours:
+    """Tests for market classification and TTL selection."""
+
+    @pytest.mark.unit
+    def test_market_for_symbol(self):
+        assert market_for_symbol("THYAO.IS") == "BIST"
+        assert market_for_symbol("BTC-USD") == "CRYPTO"
+        assert market_for_symbol("GC=F") == "GLOBAL"
+        assert market_for_symbol("USDTRY=X") == "GLOBAL"
+        assert market_for_symbol("^GSPC") == "US"
+        assert market_for_symbol("NVDA") == "US"
+
+    @pytest.mark.unit
+    def test_bist_open_and_closed(self):
+        ist = ZoneInfo("Europe/Istanbul")
+        # 2025-12-03 Çarşamba
+        assert is_market_open("BIST", datetime(2025, 12, 3, 11, 0, tzinfo=ist))
+        assert not is_market_open("BIST", datetime(2025, 12, 3, 19, 0, tzinfo=ist))
+        # 2025-12-06 Cumartesi
+        assert not is_market_open("BIST", datetime(2025, 12, 6, 11, 0, tzinfo=ist))
+
+    @pytest.mark.unit
+    def test_ttl_depends_on_market(self):
+        ist = ZoneInfo("Europe/Istanbul")
+        during = datetime(2025, 12, 3, 11, 0, tzinfo=ist)
+        after = datetime(2025, 12, 3, 20, 0, tzinfo=ist)
+        assert history_ttl("THYAO.IS", during) == CACHE_TTL_OPEN
+        assert history_ttl("THYAO.IS", after) == CACHE_TTL_CLOSED
+        assert history_ttl("BTC-USD", after) == CACHE_TTL_OPEN
+
+
+class TestGetHistory:
+    """Tests for the cached history accessor."""
+
+    @pytest.mark.unit
+    def test_repeated_calls_hit_cache(self, mock_yfinance):
+        first = get_history("THYAO.IS", period="1mo")
+        second = get_history("THYAO.IS", period="1mo")
+        assert first is second
+        assert mock_yfinance.return_value.history.call_count == 1
+        assert HISTORY_CACHE.stats()["hits"] == 1
+
+    @pytest.mark.unit
+    def test_key_includes_period(self, mock_yfinance):
+        get_history("THYAO.IS", period="1mo")
+        get_history("THYAO.IS", period="3mo")
+        assert HISTORY_CACHE.peek(("THYAO.IS", "1mo", "1d"))[0]
+        assert HISTORY_CACHE.peek(("THYAO.IS", "3mo", "1d"))[0]
+        # İki pencere de yerel fiyat deposundaki tek indirmeden kesilir
+        assert mock_yfinance.return_value.history.call_count == 1
+
+    @pytest.mark.unit
+    def test_short_period_sliced_from_wider(self, mock_yfinance):
+        wide = get_history("THYAO.IS", period="1mo")
+        short = get_history("THYAO.IS", period="5d")
+        assert mock_yfinance.return_value.history.call_count == 1
+        assert len(short) == 5
+        assert short.index[-1] == wide.index[-1]
@@ -0,0 +1,140 @@
+"""
+Unit Tests for Message History Compaction
+=========================================
+Tests for field pruning, trimming of older tool output and the token budget.
+"""
+
+import pytest
+import sys
+import os
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.compaction import (
+    MAX_FIELD_CHARS, MAX_LIST_ITEMS, SUMMARY_CHARS, compact_messages, estimate_tokens,
+)
+from tools.llm import LLMRegistry
+from tools.rate_limit import TokenBucket
+
+
+def tool_turn(prefix, *outputs):
+    """AIMessage(tool_calls) + eşleşen ToolMessage'lar."""
+    calls = [{"name": name, "args": {}, "id": f"{prefix}-{i}"} for i, (name, _) in enumerate(outputs)]
+    return [AIMessage(content="", tool_calls=calls)] + [
+        ToolMessage(content=json.dumps(payload, ensure_ascii=False), name=name, tool_call_id=f"{prefix}-{i}")
+        for i, (name, payload) in enumerate(outputs)
+    ]
+
+
+NEWS = {"asset": "altın", "source": "Tavily API (High Quality)", "news": [f"Başlık {i}" for i in range(8)],
+        "summaries": ["x" * 1000], "sentiment": "Pozitif", "sentiment_score": "+3",
+        "headline_scores": [1, 0, 2, 0, 0, 0, 0, 0], "urls": ["https://example.com/a"]}
+STOCK = {"sembol": "GC", "fiyat": 2650.5, "degisim": "+1.2%", "rsi": 55.0, "sinyal": "TUT"}
+
+
+def history(*turns):
+    messages = [SystemMessage(content="sistem"), HumanMessage(content="Altın alınır mı?")]
+    for i, outputs in enumerate(turns):
+        messages += tool_turn(f"t{i}", *outputs)
+    return messages
+
+
+class TestPruning:
+    """Unused fields are dropped; older outputs are trimmed, the latest turn is not."""
+
+    @pytest.mark.unit
+    def test_unused_fields_dropped_everywhere(self):
+        result = compact_messages(history([("get_news", NEWS)]), budget=10**6)
+        payload = json.loads(result.messages[-1].content)
+        assert "headline_scores" not in payload and "urls" not in payload
+        assert payload["sentiment"] == "Pozitif"
+        assert len(payload["summaries"][0]) == 1000          # son tur kırpılmaz
+
+    @pytest.mark.unit
+    def test_older_turns_are_trimmed(self):
+        result = compact_messages(history([("get_news", NEWS)], [("analyze_stock", STOCK)]), budget=10**6)
+        old = json.loads(result.messages[3].content)
+        assert len(old["news"]) == MAX_LIST_ITEMS
+        assert len(old["summaries"][0]) == MAX_FIELD_CHARS + 1
+        assert json.loads(result.messages[-1].content) == STOCK
+        assert result.saved > 0
+
+    @pytest.mark.unit
+    def test_input_is_not_mutated(self):
+        messages = history([("get_news", NEWS)], [("analyze_stock", STOCK)])
+        original = [m.content for m in messages]
+        compact_messages(messages, budget=0)
+        assert [m.content for m in messages] == original
+
+
+class TestBudget:
+    """Over budget, the oldest tool outputs collapse to one-line summaries."""
+
+    @pytest.mark.unit
+    def test_oldest_outputs_summarized_first(self):
+        messages = history([("get_news", NEWS)], [("get_news", NEWS)], [("analyze_stock", STOCK)])
+        trimmed = compact_messages(messages, budget=10**6)
+        budget = trimmed.after - 10
+        result = compact_messages(messages, budget=budget)
+        first, second = result.messages[3], result.messages[5]
+        assert first.content.startswith("[özet] get_news:")
+        assert "sentiment=Pozitif" in first.content
+        assert len(first.content) <= SUMMARY_CHARS + 1
+        assert second.content.startswith("{")                 # bütçeye sığınca durur
+        assert result.after <= budget
+
+    @pytest.mark.unit
+    def test_tool_call_pairs_preserved(self):
+        messages = history([("get_news", NEWS)], [("get_news", NEWS)], [("analyze_stock", STOCK)])
+        result = compact_messages(messages, budget=0)
+        assert len(result.messages) == len(messages)
+        assert [getattr(m, "tool_call_id", None) for m in result.messages] == \
+               [getattr(m, "tool_call_id", None) for m in messages]
+        assert json.loads(result.messages[-1].content) == STOCK
+
+    @pytest.mark.unit
+    def test_small_history_untouched(self):
+        messages = history([("analyze_stock", STOCK)])
+        result = compact_messages(messages)
+        assert result.saved == 0
+        assert result.messages == messages
+
+    @pytest.mark.unit
+    def test_estimate_counts_tool_call_args(self):
+        plain = AIMessage(content="abcd")
+        with_calls = AIMessage(content="abcd", tool_calls=[{"name": "compare", "args": {"symbols": ["A"] * 50}, "id": "1"}])
+        assert estimate_tokens([with_calls]) > estimate_tokens([plain]) == 1
+
+
+class TestAgentWiring:
+    """agent_node sends the compacted history and reports the savings."""
+
+    class FakeModel:
+        def __init__(self, seen):
+            self.seen = seen
+
+        def bind_tools(self, tools):
+            return self
+
+        def invoke(self, messages):
+            self.seen.append(messages)
+            return AIMessage(content="Rapor")
+
+    @pytest.mark.unit
+    def test_agent_node_compacts_prompt(self, monkeypatch):
+        import react_agent
+        seen = []
+        registry = LLMRegistry(["openrouter"], factory=lambda provider: self.FakeModel(seen))
+        monkeypatch.setattr(react_agent, "get_llm_registry", lambda: registry)
+        monkeypatch.setattr("tools.llm.get_limiter", lambda provider: TokenBucket(rate=100, burst=100))
+        messages = history([("get_news", NEWS)], [("analyze_stock", STOCK)])[1:]
+        out = react_agent.agent_node({"messages": messages, "iteration": 0})
+        assert out["tokens_saved"] > 0
+        sent = seen[0]
+        assert isinstance(sent[0], SystemMessage) and sent[0].content == react_agent.REACT_SYSTEM_PROMPT
+        assert "headline_scores" not in sent[2].content
+        assert "headline_scores" in messages[2].content
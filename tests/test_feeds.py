@@ -0,0 +1,125 @@
+"""
+Unit Tests for Feed Cache
+==========================
+Tests for conditional-GET RSS caching.
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import feeds
+from tools.feeds import FeedCache
+from tests.conftest import FakeClock
+
+
+URL = "https://news.google.com/rss/search?q=altin"
+RSS = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>t</title>
+<item><title>Altın rekor kırdı - Kaynak</title><link>https://x/1</link>
+<pubDate>Mon, 01 Jan 2024 10:00:00 GMT</pubDate></item>
+</channel></rss>""".encode("utf-8")
+
+
+def response(status, content=b"", headers=None):
+    return MagicMock(status_code=status, content=content, headers=headers or {})
+
+
+@pytest.fixture
+def session():
+    s = MagicMock()
+    with patch.object(feeds, "get_session", return_value=s):
+        yield s
+
+
+class TestFeedCache:
+    """Tests for FeedCache.get / aget."""
+
+    @pytest.mark.unit
+    def test_fresh_copy_served_from_memory(self, session):
+        session.get.return_value = response(200, RSS, {"ETag": '"v1"'})
+        cache = FeedCache(fresh_ttl=300, clock=FakeClock())
+        first = cache.get(URL)
+        second = cache.get(URL)
+        assert second is first
+        assert session.get.call_count == 1
+        assert cache.stats()["fresh_hits"] == 1
+
+    @pytest.mark.unit
+    def test_revalidates_with_validators(self, session):
+        clock = FakeClock()
+        cache = FeedCache(fresh_ttl=300, clock=clock)
+        session.get.return_value = response(200, RSS, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"})
+        first = cache.get(URL)
+
+        clock.now += 301
+        session.get.return_value = response(304)
+        with patch.object(feeds.feedparser, "parse") as parse:
+            again = cache.get(URL)
+        parse.assert_not_called()
+        assert again is first
+        headers = session.get.call_args.kwargs["headers"]
+        assert headers == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024"}
+        assert cache.stats()["revalidated"] == 1
+
+        # 304 tazeliği yeniler
+        cache.get(URL)
+        assert session.get.call_count == 2
+
+    @pytest.mark.unit
+    def test_stale_copy_on_error(self, session):
+        clock = FakeClock()
+        cache = FeedCache(fresh_ttl=300, clock=clock)
+        session.get.return_value = response(200, RSS)
+        first = cache.get(URL)
+
+        clock.now += 301
+        session.get.side_effect = ConnectionError("down")
+        assert cache.get(URL) is first
+        assert FeedCache(clock=clock).get(URL).entries == []
+
+        session.get.side_effect = None
+        session.get.return_value = response(503, b"unavailable")
+        assert cache.get(URL) is first
+
+    @pytest.mark.unit
+    def test_first_fetch_without_validators(self, session):
+        session.get.return_value = response(200, RSS)
+        feed = FeedCache(clock=FakeClock()).get(URL)
+        assert session.get.call_args.kwargs["headers"] == {}
+        assert feed.entries[0].title == "Altın rekor kırdı - Kaynak"
+
+    @pytest.mark.unit
+    def test_async_shares_cache(self, session):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, content=RSS, headers={"ETag": '"v1"'})
+
+        cache = FeedCache(clock=FakeClock())
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch.object(feeds, "get_async_client", return_value=client):
+            feed = asyncio.run(cache.aget(URL))
+        assert cache.get(URL) is feed
+        assert len(calls) == 1
+        session.get.assert_not_called()
+
+
+class TestConsumers:
+    """get_news and scout.news share the cache."""
+
+    @pytest.mark.unit
+    def test_scout_news_uses_cache(self, session):
+        from scout.news import fetch_news
+        session.get.return_value = response(200, RSS)
+        fetch_news("altın")
+        fetch_news("altın")
+        assert session.get.call_count == 1
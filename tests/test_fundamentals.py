@@ -0,0 +1,70 @@
+"""
+Unit Tests for Fundamentals Cache
+==================================
+Tests for day-granularity expiry, persistence and warm-up refresh.
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.fundamentals import FundamentalsCache, get_info, refresh, get_fundamentals_cache
+from tools.market_tools import compare, get_fundamentals
+
+
+class FakeDay:
+    def __init__(self, day="2025-12-03"):
+        self.day = day
+
+    def __call__(self):
+        return self.day
+
+
+class TestFundamentalsCache:
+    """Tests for FundamentalsCache."""
+
+    @pytest.mark.unit
+    def test_expires_on_new_day(self, tmp_path):
+        today = FakeDay()
+        cache = FundamentalsCache(str(tmp_path / "f.db"), today=today)
+        cache.put("SAHOL.IS", {"trailingPE": 5.2, "unused": "x"})
+        assert cache.get("SAHOL.IS") == {"trailingPE": 5.2}
+        today.day = "2025-12-04"
+        assert cache.get("SAHOL.IS") is None
+
+    @pytest.mark.unit
+    def test_persists_across_instances(self, tmp_path):
+        today = FakeDay()
+        FundamentalsCache(str(tmp_path / "f.db"), today=today).put("THYAO.IS", {"shortName": "THY"})
+        reopened = FundamentalsCache(str(tmp_path / "f.db"), today=today)
+        assert reopened.get("THYAO.IS") == {"shortName": "THY"}
+
+
+class TestGetInfo:
+    """Tests for the cached .info accessor used by the tools."""
+
+    @pytest.mark.unit
+    def test_info_fetched_once(self, mock_yfinance):
+        get_info("NVDA")
+        get_info("NVDA")
+        get_fundamentals.invoke({"symbol": "NVDA"})
+        # Ticker yalnızca ilk çağrıda oluşturulur
+        assert mock_yfinance.call_count == 1
+        assert get_fundamentals_cache().stats()["hits"] == 2
+
+    @pytest.mark.unit
+    def test_refresh_skips_fresh(self, mock_yfinance):
+        assert refresh(["NVDA", "AAPL"]) == 2
+        assert refresh(["NVDA", "AAPL"]) == 0
+
+    @pytest.mark.unit
+    def test_compare_reads_cached_fundamentals(self, mock_yfinance):
+        refresh(["AAPL", "MSFT"])
+        before = mock_yfinance.return_value.history.call_count
+        result = compare.invoke({"symbols": ["AAPL", "MSFT"]})
+        assert result["stocks"][0]["pe"] == 25.5
+        # yalnızca history çağrıları yapılır, .info için yeni Ticker gerekmez
+        assert mock_yfinance.return_value.history.call_count - before == 2
@@ -0,0 +1,126 @@
+"""
+Unit Tests for FX Engine
+========================
+Tests for the batched USD cross set, triangulation and multi-pair get_forex.
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.fx import FX_BASES, FXEngine, get_fx_engine, parse_pair, split_pairs
+from tools.market_tools import get_forex
+
+
+# 1 USD kaç birim: pencere başı → son bar
+PER_USD = {"TRY": (40.0, 42.0), "EUR": (0.90, 0.875), "GBP": (0.80, 0.75), "JPY": (150.0, 150.0)}
+
+
+def fx_frame(periods: int = 5) -> pd.DataFrame:
+    """yf.download(group_by='ticker') biçiminde USD çaprazları; PER_USD dışı semboller boş."""
+    dates = pd.date_range("2025-12-01", periods=periods, freq="B")
+    frames = {}
+    for c in FX_BASES:
+        first, last = PER_USD.get(c, (np.nan, np.nan))
+        frames[f"USD{c}=X"] = pd.DataFrame({"Close": np.linspace(first, last, periods)}, index=dates)
+    return pd.concat(frames, axis=1)
+
+
+@pytest.fixture
+def fx_download():
+    with patch("yfinance.download", return_value=fx_frame()) as download:
+        yield download
+
+
+class TestPairs:
+    """Pair parsing."""
+
+    @pytest.mark.unit
+    def test_parse_pair(self):
+        assert parse_pair("usdtry") == ("USD", "TRY")
+        assert parse_pair("EUR/TRY") == ("EUR", "TRY")
+        assert parse_pair("GBPTRY=X") == ("GBP", "TRY")
+        assert parse_pair("P0TRY") is None
+
+    @pytest.mark.unit
+    def test_split_pairs(self):
+        assert split_pairs(["USDTRY, eurtry", "USDTRY", ""]) == ["USDTRY", "EURTRY"]
+        assert split_pairs("") == []
+
+
+class TestEngine:
+    """Rate matrix and triangulation."""
+
+    @pytest.mark.unit
+    def test_one_batch_for_many_pairs(self, fx_download):
+        engine = FXEngine()
+        for pair in ("USDTRY", "EURTRY", "GBPTRY", "EURUSD"):
+            assert engine.quote(pair) is not None
+        assert fx_download.call_count == 1
+        assert engine.refreshes == 1
+
+    @pytest.mark.unit
+    def test_triangulated_rates(self, fx_download):
+        engine = FXEngine()
+        assert engine.quote("USDTRY")["rate"] == 42.0
+        assert engine.quote("EURTRY")["rate"] == 48.0
+        assert engine.quote("EURUSD")["rate"] == pytest.approx(1.1429)
+        # GBP/TRY: 40/0.8=50 → 42/0.75=56
+        assert engine.quote("GBPTRY") == {"pair": "GBPTRY", "rate": 56.0, "chg": "+12.00%"}
+
+    @pytest.mark.unit
+    def test_cross_matrix_is_consistent(self, fx_download):
+        m = FXEngine().matrix()
+        cross = m.cross()
+        i, j, k = (m.currencies.index(c) for c in ("EUR", "TRY", "GBP"))
+        assert cross[i, j] == pytest.approx(cross[i, k] * cross[k, j])
+        assert cross[j, i] == pytest.approx(1 / cross[i, j])
+
+    @pytest.mark.unit
+    def test_unknown_or_missing_legs(self, fx_download):
+        engine = FXEngine()
+        assert engine.quote("XAUTRY") is None        # base sette yok
+        assert engine.quote("CHFTRY") is None        # veri gelmedi
+
+    @pytest.mark.unit
+    def test_refreshes_after_ttl(self, fx_download):
+        engine = FXEngine(ttl=0)
+        engine.quote("USDTRY")
+        assert not engine.is_fresh()
+        engine.quote("USDTRY")
+        assert engine.refreshes == 2
+
+
+class TestGetForex:
+    """get_forex tool."""
+
+    @pytest.mark.unit
+    def test_single_pair_shape(self, fx_download):
+        assert get_forex.invoke({"pair": "usdtry"}) == {"pair": "USDTRY", "rate": 42.0, "chg": "+5.00%"}
+
+    @pytest.mark.unit
+    def test_multiple_pairs_one_fetch(self, fx_download, mock_yfinance):
+        result = get_forex.invoke({"pair": "USDTRY,EURTRY", "pairs": ["GBPTRY", "EURUSD"]})
+        assert [r["pair"] for r in result["rates"]] == ["USDTRY", "EURTRY", "GBPTRY", "EURUSD"]
+        assert fx_download.call_count == 1
+        mock_yfinance.assert_not_called()
+
+    @pytest.mark.unit
+    def test_empty_pair_returns_main_rates(self, fx_download):
+        result = get_forex.invoke({"pair": ""})
+        assert len(result["rates"]) == 4
+        assert get_fx_engine().refreshes == 1
+
+    @pytest.mark.unit
+    def test_unsupported_pair_falls_back_to_direct(self, fx_download, mock_yfinance):
+        result = get_forex.invoke({"pair": "USDTRY", "pairs": ["XAUTRY"]})
+        rates = {r["pair"]: r for r in result["rates"]}
+        assert rates["USDTRY"]["rate"] == 42.0
+        assert rates["XAUTRY"]["rate"] == 105.0
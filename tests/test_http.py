@@ -0,0 +1,114 @@
+"""
+Unit Tests for HTTP Clients
+============================
+Tests for the pooled, byte-capped page fetcher used by web_search.
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import http, market_tools
+from tools.http import fetch_page, afetch_page, get_session
+from tools.market_tools import web_search
+
+
+PAGE = b"<html><body><article>Asil icerik</article></body></html>"
+HITS = [
+    {"title": "A", "snippet": "snippet a", "url": "https://a.example"},
+    {"title": "B", "snippet": "snippet b", "url": "https://b.example"},
+    {"title": "C", "snippet": "snippet c", "url": "https://c.example"},
+]
+
+
+def streaming_session(chunks, status=200):
+    response = MagicMock(status_code=status)
+    response.__enter__.return_value = response
+    response.iter_content.return_value = iter(chunks)
+    session = MagicMock()
+    session.get.return_value = response
+    return session, response
+
+
+class TestFetchPage:
+    """Tests for fetch_page / afetch_page."""
+
+    @pytest.mark.unit
+    def test_session_is_shared(self):
+        assert get_session() is get_session()
+
+    @pytest.mark.unit
+    def test_stops_reading_at_cap(self):
+        consumed = []
+
+        def chunks():
+            for i in range(100):
+                consumed.append(i)
+                yield b"x" * 1000
+
+        session, _ = streaming_session(chunks())
+        with patch.object(http, "get_session", return_value=session):
+            page = fetch_page("https://a.example", max_bytes=2500)
+        assert page == b"x" * 2500
+        assert len(consumed) == 3
+        assert session.get.call_args.kwargs["stream"] is True
+
+    @pytest.mark.unit
+    def test_non_200_returns_none(self):
+        session, _ = streaming_session([b"err"], status=404)
+        with patch.object(http, "get_session", return_value=session):
+            assert fetch_page("https://a.example") is None
+
+    @pytest.mark.unit
+    def test_async_cap(self):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=b"y" * 100_000)))
+        with patch.object(http, "get_async_client", return_value=client):
+            page = asyncio.run(afetch_page("https://a.example", max_bytes=4096))
+        assert page == b"y" * 4096
+
+
+class TestWebSearchFetch:
+    """web_search fetches the top results concurrently and uses the first readable one."""
+
+    @pytest.mark.unit
+    def test_fetches_concurrently(self):
+        def slow_fetch(url):
+            time.sleep(0.3)
+            return PAGE
+
+        with patch.object(market_tools, "_ddgs_search", return_value=HITS), \
+             patch.object(market_tools, "fetch_page", side_effect=slow_fetch) as fetch:
+            start = time.perf_counter()
+            result = web_search.invoke({"query": "q"})
+        assert time.perf_counter() - start < 0.8
+        assert fetch.call_count == 3
+        assert result["full_content"] == "Asil icerik"
+        assert result["source_url"] == "https://a.example"
+
+    @pytest.mark.unit
+    def test_falls_back_to_next_result(self):
+        pages = {"https://a.example": None, "https://b.example": PAGE, "https://c.example": PAGE}
+        with patch.object(market_tools, "_ddgs_search", return_value=HITS), \
+             patch.object(market_tools, "fetch_page", side_effect=pages.get):
+            result = web_search.invoke({"query": "q"})
+        assert result["source_url"] == "https://b.example"
+
+    @pytest.mark.unit
+    def test_snippet_when_nothing_readable(self):
+        def failing(url):
+            raise ConnectionError("down")
+
+        with patch.object(market_tools, "_ddgs_search", return_value=HITS), \
+             patch.object(market_tools, "fetch_page", side_effect=failing):
+            result = web_search.invoke({"query": "q"})
+        assert result["full_content"] == "snippet a"
+        assert result["source_url"] == "https://a.example"
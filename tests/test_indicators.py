@@ -0,0 +1,117 @@
+"""
+Unit Tests for Technical Indicators
+====================================
+Vectorized indicators checked against pandas reference implementations.
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import indicators
+from tools.market_tools import analyze_stock
+
+
+@pytest.fixture
+def closes():
+    """Three random-walk close series, shape (3, 120)."""
+    rng = np.random.default_rng(7)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (3, 120)), axis=1))
+
+
+def pandas_wilder_rsi(series: pd.Series, period: int = 14) -> float:
+    """Reference Wilder RSI (SMA seed, then 1/period smoothing)."""
+    d = series.diff()
+    gain, loss = d.clip(lower=0), -d.clip(upper=0)
+    avg_gain, avg_loss = gain.iloc[1:period + 1].mean(), loss.iloc[1:period + 1].mean()
+    for t in range(period + 1, len(series)):
+        avg_gain = (avg_gain * (period - 1) + gain.iloc[t]) / period
+        avg_loss = (avg_loss * (period - 1) + loss.iloc[t]) / period
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+class TestMovingAverages:
+    """Tests for SMA/EMA."""
+
+    @pytest.mark.unit
+    def test_ema_matches_pandas(self, closes):
+        ref = pd.DataFrame(closes.T).ewm(span=20, adjust=False).mean().to_numpy().T
+        np.testing.assert_allclose(indicators.ema(closes, 20), ref, rtol=1e-10)
+
+    @pytest.mark.unit
+    def test_ema_with_gaps_matches_pandas(self, closes):
+        closes[1, :5] = np.nan
+        closes[2, 50] = np.nan
+        ref = pd.DataFrame(closes.T).ewm(span=12, adjust=False, ignore_na=True).mean().to_numpy().T
+        np.testing.assert_allclose(indicators.ema(closes, 12), ref, rtol=1e-10)
+
+    @pytest.mark.unit
+    def test_sma_matches_pandas(self, closes):
+        ref = pd.DataFrame(closes.T).rolling(10).mean().to_numpy().T
+        np.testing.assert_allclose(indicators.sma(closes, 10), ref, rtol=1e-10)
+
+
+class TestOscillators:
+    """Tests for RSI, MACD, Bollinger, ATR and volatility."""
+
+    @pytest.mark.unit
+    def test_rsi_matches_wilder_reference(self, closes):
+        result = indicators.rsi(closes, 14)
+        for row in range(3):
+            assert result[row, -1] == pytest.approx(pandas_wilder_rsi(pd.Series(closes[row])))
+        assert np.isnan(result[:, :14]).all()
+
+    @pytest.mark.unit
+    def test_rsi_single_symbol_equals_matrix_row(self, closes):
+        np.testing.assert_allclose(indicators.rsi(closes[1]), indicators.rsi(closes)[1])
+
+    @pytest.mark.unit
+    def test_rsi_extremes(self):
+        up = np.arange(1, 30, dtype=float)
+        assert indicators.rsi(up)[-1] == 100.0
+        assert indicators.rsi(up[::-1])[-1] == pytest.approx(0.0)
+
+    @pytest.mark.unit
+    def test_macd_histogram(self, closes):
+        line, signal, hist = indicators.macd(closes)
+        np.testing.assert_allclose(hist, line - signal)
+
+    @pytest.mark.unit
+    def test_bollinger_bands_order(self, closes):
+        mid, upper, lower = indicators.bollinger(closes, 20)
+        assert (upper[:, 19:] >= mid[:, 19:]).all()
+        assert (lower[:, 19:] <= mid[:, 19:]).all()
+
+    @pytest.mark.unit
+    def test_atr_positive(self, closes):
+        result = indicators.atr(closes * 1.01, closes * 0.99, closes)
+        assert (result[:, 13:] > 0).all()
+
+    @pytest.mark.unit
+    def test_rolling_volatility_matches_pandas(self, closes):
+        ref = np.log(pd.DataFrame(closes.T)).diff().rolling(20).std().to_numpy().T * 100
+        np.testing.assert_allclose(indicators.rolling_volatility(closes, 20), ref, rtol=1e-10)
+
+
+class TestSnapshot:
+    """Tests for the last-value snapshot used by the tools."""
+
+    @pytest.mark.unit
+    def test_short_series(self):
+        snap = indicators.snapshot(np.array([100.0, 101.0, 102.0]))
+        assert snap["change_pct"] == pytest.approx(2.0)
+        assert snap["rsi"] == 100.0
+
+    @pytest.mark.unit
+    def test_analyze_stock_reads_indicators(self, mock_yfinance):
+        result = analyze_stock.invoke({"symbol": "NVDA"})
+        # Mock veri düz artan trend: RSI 100, değişim +5%
+        assert result["rsi"] == 100
+        assert result["degisim"] == "+5.0%"
+        assert result["sinyal"] == "SAT"
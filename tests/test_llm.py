@@ -0,0 +1,149 @@
+"""
+Unit Tests for LLM Client Registry
+==================================
+Tests for cached models, bound tools and provider failover.
+"""
+
+import pytest
+import sys
+import os
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.llm import (
+    LLM_COOLDOWN, LLM_FAILURE_THRESHOLD, LLM_LATENCY_THRESHOLD, LLMClient, LLMRegistry,
+    build_model, configured_providers,
+)
+from tools.http import get_client
+from tools.rate_limit import TokenBucket
+from tools.market_tools import ALL_TOOLS
+from tests.conftest import FakeClock
+
+
+class FakeModel:
+    """Sağlayıcı modeli: sırayla verilen davranışları uygular (str yanıt, Exception hata, float gecikme)."""
+
+    def __init__(self, provider, script, clock, bound=None):
+        self.provider = provider
+        self.script = script
+        self.clock = clock
+        self.binds = bound if bound is not None else []
+
+    def bind_tools(self, tools):
+        self.binds.append([t.name for t in tools])
+        return FakeModel(self.provider, self.script, self.clock, self.binds)
+
+    def invoke(self, messages):
+        step = self.script.pop(0) if self.script else "ok"
+        if isinstance(step, Exception):
+            raise step
+        if isinstance(step, float):
+            self.clock.now += step
+            step = "ok"
+        return AIMessage(content=f"{self.provider}:{step}")
+
+
+@pytest.fixture(autouse=True)
+def free_limiter(monkeypatch):
+    monkeypatch.setattr("tools.llm.get_limiter", lambda provider: TokenBucket(rate=100, burst=100))
+
+
+def make_registry(scripts):
+    clock = FakeClock()
+    models = {}
+
+    def factory(provider):
+        models[provider] = FakeModel(provider, scripts.setdefault(provider, []), clock)
+        return models[provider]
+
+    registry = LLMRegistry(["openrouter", "gemini"], factory=factory, clock=clock)
+    return registry, models, clock
+
+
+MESSAGES = [HumanMessage(content="Altın?")]
+
+
+class TestCaching:
+    """Models and bound tools are built once."""
+
+    @pytest.mark.unit
+    def test_models_and_bindings_are_reused(self):
+        registry, models, _ = make_registry({})
+        client = LLMClient(registry, ALL_TOOLS)
+        for _ in range(5):
+            client.invoke(MESSAGES)
+            LLMClient(registry).invoke(MESSAGES)
+        assert registry.builds == 2
+        assert models["openrouter"].binds == [[t.name for t in ALL_TOOLS]]
+
+    @pytest.mark.unit
+    def test_openrouter_uses_shared_http_client(self, monkeypatch):
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test")
+        model = build_model("openrouter")
+        assert model.http_client is get_client()
+
+    @pytest.mark.unit
+    def test_configured_providers(self, monkeypatch):
+        monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+        monkeypatch.setenv("GOOGLE_API_KEY", "test")
+        assert configured_providers("openrouter,gemini") == ["gemini"]
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test")
+        assert configured_providers("gemini, openrouter") == ["gemini", "openrouter"]
+
+
+class TestFailover:
+    """Provider health and ordering."""
+
+    @pytest.mark.unit
+    def test_error_fails_over_to_next_provider(self):
+        registry, _, _ = make_registry({"openrouter": [RuntimeError("429")]})
+        call = registry.call(MESSAGES)
+        assert call.provider == "gemini"
+        assert call.attempts == 2
+        assert call.response.content == "gemini:ok"
+
+    @pytest.mark.unit
+    def test_repeated_errors_bench_provider_until_cooldown(self):
+        registry, _, clock = make_registry({"openrouter": [RuntimeError("500")] * LLM_FAILURE_THRESHOLD})
+        for _ in range(LLM_FAILURE_THRESHOLD):
+            registry.call(MESSAGES)
+        assert registry.order() == ["gemini", "openrouter"]
+        assert registry.call(MESSAGES).attempts == 1
+
+        clock.now += LLM_COOLDOWN + 1
+        assert registry.order() == ["openrouter", "gemini"]
+        assert registry.call(MESSAGES).provider == "openrouter"
+
+    @pytest.mark.unit
+    def test_slow_provider_is_benched(self):
+        registry, _, _ = make_registry({"openrouter": [LLM_LATENCY_THRESHOLD + 5.0]})
+        call = registry.call(MESSAGES)
+        assert call.provider == "openrouter"
+        assert call.latency > LLM_LATENCY_THRESHOLD
+        assert registry.order()[0] == "gemini"
+        assert registry.stats()["openrouter"]["benched"]
+
+    @pytest.mark.unit
+    def test_benched_provider_is_last_resort(self):
+        scripts = {"openrouter": [RuntimeError("x")] * LLM_FAILURE_THRESHOLD, "gemini": []}
+        registry, _, _ = make_registry(scripts)
+        for _ in range(LLM_FAILURE_THRESHOLD):
+            registry.call(MESSAGES)
+        scripts["gemini"].append(RuntimeError("down"))
+        call = registry.call(MESSAGES)
+        assert call.provider == "openrouter"
+        assert call.attempts == 2
+
+    @pytest.mark.unit
+    def test_all_providers_failing_raises_last_error(self):
+        registry, _, _ = make_registry({"openrouter": [RuntimeError("a")], "gemini": [ValueError("b")]})
+        with pytest.raises(ValueError, match="b"):
+            registry.call(MESSAGES)
+
+    @pytest.mark.unit
+    def test_no_provider_configured(self):
+        with pytest.raises(ValueError, match="No API key"):
+            LLMRegistry([]).call(MESSAGES)
@@ -0,0 +1,148 @@
+"""
+Unit Tests for Market Data Providers
+====================================
+Tests for the provider interface, record/replay and tool wiring.
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.market_data import (
+    MarketDataProvider, RecordedProvider, YFinanceProvider, get_provider, make_provider, set_provider,
+)
+from tools.cache import get_history
+from tools.fundamentals import get_info
+from tools.price_matrix import load_matrix
+from tests.conftest import make_bars
+
+
+BIST_DAYS = {"freq": "B", "tz": "Europe/Istanbul"}     # iş günü barları, borsa saat dilimi
+
+
+class FakeUpstream(MarketDataProvider):
+    """Ağ yerine sabit barlar; çağrıları sayar."""
+
+    name = "fake"
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    def history(self, symbol, interval="1d", period=None, start=None):
+        self.calls.append(("history", symbol, period, start))
+        return self.frames.get(symbol, pd.DataFrame())
+
+    def info(self, symbol):
+        return {"shortName": f"{symbol} A.S.", "trailingPE": 7.5}
+
+
+@pytest.fixture
+def use_provider():
+    """Süreç sağlayıcısını test süresince değiştirir."""
+    previous = get_provider()
+    yield set_provider
+    set_provider(previous)
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """GARAN 300 bar, AKBNK 40 bar kaydı."""
+    upstream = FakeUpstream({"GARAN.IS": make_bars("2025-01-01", 300, **BIST_DAYS),
+                             "AKBNK.IS": make_bars("2025-01-01", 300, **BIST_DAYS, close_start=50.0).iloc[-40:]})
+    recorder = RecordedProvider(str(tmp_path), upstream=upstream)
+    for sym in ("GARAN.IS", "AKBNK.IS", "NOPE.IS"):
+        recorder.history(sym, period="1y")
+        recorder.info(sym)
+    return str(tmp_path)
+
+
+class TestRecordReplay:
+    """Recorded provider."""
+
+    @pytest.mark.unit
+    def test_replay_returns_recorded_bars(self, recording):
+        replay = RecordedProvider(recording)
+        out = replay.history("GARAN.IS", period="2y")
+        assert len(out) == 300
+        assert len(replay.history("GARAN.IS", period="1y")) < 300
+        assert str(out.index.tz) == "Europe/Istanbul"
+        assert replay.symbols() == ["AKBNK.IS", "GARAN.IS"]
+        assert replay.info("GARAN.IS")["trailingPE"] == 7.5
+
+    @pytest.mark.unit
+    def test_replay_slices_period_and_start(self, recording):
+        replay = RecordedProvider(recording)
+        assert len(replay.history("GARAN.IS", period="5d")) == 5
+        last = replay.history("GARAN.IS", period="1mo")
+        assert last.index[0] >= last.index[-1] - pd.DateOffset(months=1)
+        since = replay.history("GARAN.IS", start="2026-02-02")
+        assert since.index[0] == pd.Timestamp("2026-02-02", tz="Europe/Istanbul")
+
+    @pytest.mark.unit
+    def test_missing_symbol_is_empty(self, recording):
+        replay = RecordedProvider(recording)
+        assert replay.history("NOPE.IS", period="1mo").empty
+        assert replay.info("NOPE.IS") == {"shortName": "NOPE.IS A.S.", "trailingPE": 7.5}
+        assert replay.info("XYZ.IS") == {}
+        assert replay.misses == 2
+
+    @pytest.mark.unit
+    def test_records_merge_and_newer_bar_wins(self, tmp_path):
+        upstream = FakeUpstream({"GARAN.IS": make_bars("2026-01-05", 5, **BIST_DAYS)})
+        recorder = RecordedProvider(str(tmp_path), upstream=upstream)
+        recorder.history("GARAN.IS", period="5d")
+        upstream.frames["GARAN.IS"] = make_bars("2026-01-09", 3, **BIST_DAYS, close_start=500.0)
+        recorder.history("GARAN.IS", start="2026-01-09")
+
+        out = RecordedProvider(str(tmp_path)).history("GARAN.IS", period="1y")
+        assert len(out) == 7
+        assert out["Close"].iloc[4] == 500.0
+
+    @pytest.mark.unit
+    def test_download_is_wide_frame(self, recording):
+        wide = RecordedProvider(recording).download(["GARAN.IS", "AKBNK.IS", "NOPE.IS"], period="5d")
+        assert isinstance(wide.columns, pd.MultiIndex)
+        assert set(wide.columns.get_level_values(0)) == {"GARAN.IS", "AKBNK.IS"}
+
+
+class TestWiring:
+    """Tools and stores read through the process provider."""
+
+    @pytest.mark.unit
+    def test_provider_interface_requires_history(self):
+        with pytest.raises(TypeError):
+            MarketDataProvider()
+
+    @pytest.mark.unit
+    def test_store_and_matrix_replay_offline(self, recording, use_provider):
+        use_provider(RecordedProvider(recording))
+        with patch("yfinance.Ticker", side_effect=AssertionError("network")), \
+                patch("yfinance.download", side_effect=AssertionError("network")):
+            h = get_history("GARAN.IS", period="1mo")
+            m = load_matrix(["GARAN.IS", "AKBNK.IS", "ISCTR.IS", "YKBNK.IS"], period="5d")
+            info = get_info("AKBNK.IS")
+        assert not h.empty
+        assert m.values.shape == (4, 5)
+        assert np.isnan(m.values[2:]).all()
+        assert info["shortName"] == "AKBNK.IS A.S."
+
+    @pytest.mark.unit
+    def test_yfinance_provider_keeps_history_call_shape(self, mock_yfinance):
+        YFinanceProvider().history("AAPL", interval="1d", start="2026-01-02")
+        mock_yfinance.return_value.history.assert_called_once_with(start="2026-01-02", interval="1d")
+
+    @pytest.mark.unit
+    def test_make_provider(self, tmp_path):
+        assert isinstance(make_provider("yfinance"), YFinanceProvider)
+        assert not make_provider("replay", str(tmp_path)).recording
+        assert make_provider("record", str(tmp_path)).recording
+        with pytest.raises(ValueError):
+            make_provider("bloomberg")
@@ -7,6 +7,7 @@ Tests for individual tool functions.
 import pytest
 import sys
 import os
+from unittest.mock import MagicMock, patch
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,6 +23,7 @@ from tools.market_tools import (
     resolve_symbol,
     SYMBOL_MAP
 )
+from tools.price_store import STORE_BACKFILL
 
 
 class TestSymbolResolver:
@@ -110,6 +112,50 @@ class TestAnalyzeStock:
         # Should automatically try EREGL.IS
         assert "fiyat" in result or "err" in result
 
+    @pytest.mark.unit
+    def test_probe_tries_bist_suffix_in_same_round(self, mock_yfinance):
+        """Bare ticker and .IS candidate are fetched once each, in the same round."""
+        import pandas as pd
+        found = mock_yfinance.return_value.history.return_value
+        empty = MagicMock()
+        empty.history.return_value = pd.DataFrame()
+        bist = MagicMock()
+        bist.history.return_value = found
+        bist.info = {"shortName": "EREGLI"}
+        mock_yfinance.side_effect = lambda sym: bist if sym == "EREGL.IS" else empty
+
+        result = analyze_stock.invoke({"symbol": "EREGL"})
+
+        assert result["sembol"] == "EREGL"
+        assert result["isim"] == "EREGLI"
+        assert result["periyot"] == "1mo"
+        # Tek indirme: fiyat deposunun geri doldurma penceresi, 1mo buradan kesilir
+        backfill = STORE_BACKFILL["1d"]
+        empty.history.assert_called_once_with(period=backfill, interval="1d")
+        bist.history.assert_called_once_with(period=backfill, interval="1d")
+
+    @pytest.mark.unit
+    def test_probe_requests_info_for_every_candidate_up_front(self, mock_yfinance):
+        """.info for the bare ticker and the .IS candidate is submitted alongside the history probe."""
+        import pandas as pd
+        found = mock_yfinance.return_value.history.return_value
+        empty = MagicMock()
+        empty.history.return_value = pd.DataFrame()
+        bist = MagicMock()
+        bist.history.return_value = found
+        mock_yfinance.side_effect = lambda sym: bist if sym == "EREGL.IS" else empty
+        requested = []
+
+        def info(sym):
+            requested.append(sym)
+            return {"shortName": f"name-{sym}"}
+
+        with patch("tools.market_tools.get_info", side_effect=info):
+            result = analyze_stock.invoke({"symbol": "EREGL"})
+
+        assert sorted(requested) == ["EREGL", "EREGL.IS"]
+        assert result["isim"] == "name-EREGL.IS"
+
     @pytest.mark.unit
     def test_analyze_invalid_symbol(self):
         """Test analysis with invalid symbol."""
@@ -0,0 +1,120 @@
+"""
+Unit Tests for Parallel Fetching
+=================================
+Tests for bounded concurrent fetches with partial results and the long-lived event loop.
+"""
+
+import pytest
+import sys
+import os
+import time
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import parallel
+from tools.parallel import BackgroundLoop, run_parallel
+from tools import http, tavily_search
+from tools.market_tools import build_portfolio, compare
+
+
+def slow(value, delay):
+    def _fn():
+        time.sleep(delay)
+        return value
+    return _fn
+
+
+def failing():
+    raise RuntimeError("boom")
+
+
+class TestRunParallel:
+    """Tests for run_parallel."""
+
+    @pytest.mark.unit
+    def test_wall_time_is_slowest_job(self):
+        start = time.perf_counter()
+        result = run_parallel({i: slow(i, 0.2) for i in range(5)})
+        assert time.perf_counter() - start < 0.6
+        assert result.results == {i: i for i in range(5)}
+
+    @pytest.mark.unit
+    def test_partial_results(self):
+        result = run_parallel({"fast": slow(1, 0), "slow": slow(2, 1.0), "bad": failing}, timeout=0.2)
+        assert result.results == {"fast": 1}
+        assert result.timed_out == ["slow"]
+        assert "boom" in result.errors["bad"]
+
+
+class TestToolsUseParallelFetch:
+    """compare / build_portfolio partial-result semantics."""
+
+    @pytest.mark.unit
+    def test_build_portfolio_reports_timeouts(self, mock_yfinance):
+        frame = mock_yfinance.return_value.history.return_value
+
+        def history(symbol, period="1mo", interval="1d"):
+            if symbol == "SLOW.IS":
+                time.sleep(1.0)
+            return frame
+
+        with patch.object(parallel, "FETCH_TIMEOUT", 0.3), \
+             patch("tools.market_tools.get_history", side_effect=history):
+            result = build_portfolio.invoke({"amount": 10000, "symbols": ["AAA.IS", "SLOW.IS"]})
+
+        assert [p["s"] for p in result["positions"]] == ["AAA"]
+        assert result["timeout"] == ["SLOW.IS"]
+        assert result["invested"] + result["cash"] == 10000
+
+    @pytest.mark.unit
+    def test_compare_keeps_symbol_when_info_fails(self, mock_yfinance):
+        with patch("tools.market_tools.get_info", side_effect=RuntimeError("info down")):
+            result = compare.invoke({"symbols": ["AAPL", "MSFT"]})
+        assert [s["s"] for s in result["stocks"]] == ["AAPL", "MSFT"]
+        assert result["stocks"][0]["pe"] == "-"
+
+
+class TestBackgroundLoop:
+    """Loop-bound clients survive across requests and are closed when the loop stops."""
+
+    @pytest.mark.unit
+    def test_clients_reused_across_runs_and_closed_on_stop(self):
+        loop = BackgroundLoop(closers=[http.aclose_async_client, tavily_search.aclose_async_clients])
+
+        async def clients():
+            return http.get_async_client(), tavily_search.get_async_tavily_client("tvly-test")
+
+        first = loop.run(clients())
+        second = loop.run(clients())
+        assert first[0] is second[0] and first[1] is second[1]
+        assert not first[0].is_closed
+
+        loop.stop()
+        assert first[0].is_closed
+        assert first[1]._client.is_closed
+        assert not http._async_clients and not tavily_search._async_clients
+
+    @pytest.mark.unit
+    def test_restarts_after_stop(self):
+        loop = BackgroundLoop()
+
+        async def answer():
+            return 42
+
+        assert loop.run(answer()) == 42
+        loop.stop()
+        assert loop.run(answer()) == 42
+        loop.stop()
+        loop.stop()          # ikinci stop etkisiz
+
+    @pytest.mark.unit
+    def test_bot_webhook_uses_shared_loop(self, monkeypatch):
+        monkeypatch.setenv("FUNDAMENTALS_WARMUP", "0")
+        monkeypatch.setenv("SCREENER_WARMUP", "0")
+        import importlib
+        bot = importlib.import_module("bot.bot")
+        assert isinstance(bot.event_loop, BackgroundLoop)
+        assert http.aclose_async_client in bot.event_loop._closers
+        assert tavily_search.aclose_async_clients in bot.event_loop._closers
@@ -0,0 +1,162 @@
+"""
+Unit Tests for Portfolio Optimizer
+==================================
+Tests for weighting modes, integer-lot allocation and build_portfolio.
+"""
+
+import pytest
+import sys
+import os
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.portfolio import MODES, allocate_lots, estimate, optimize, resolve_mode
+from tools.price_matrix import AlignedMatrix
+from tools.market_tools import build_portfolio
+
+
+def synthetic_closes(n: int, periods: int = 253, seed: int = 0, drift: float = 0.0005) -> np.ndarray:
+    """Ortak bir piyasa faktörü + sembole özgü gürültü; volatilite sembol sırasıyla artar."""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, periods)
+    scale = np.linspace(0.005, 0.03, n)[:, None]
+    returns = 0.5 * market + drift + scale * rng.standard_normal((n, periods))
+    return 100 * np.cumprod(1 + returns, axis=1)
+
+
+class TestModes:
+    """Tests for weight computation."""
+
+    @pytest.mark.unit
+    def test_resolve_mode(self):
+        assert resolve_mode("min-var") == "min_variance"
+        assert resolve_mode("Risk Parity") == "risk_parity"
+        assert resolve_mode("") == "equal"
+        assert resolve_mode("yolo") is None
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("mode", MODES)
+    def test_weights_are_long_only_and_sum_to_one(self, mode):
+        w, info = optimize(synthetic_closes(12), mode)
+        assert w.sum() == pytest.approx(1.0)
+        assert (w >= 0).all()
+        assert info["mode"] == mode
+
+    @pytest.mark.unit
+    def test_min_variance_has_lowest_volatility(self):
+        closes = synthetic_closes(12)
+        vols = {mode: optimize(closes, mode)[1]["vol"] for mode in MODES if mode != "equal"}
+        assert vols["min_variance"] == min(vols.values())
+
+    @pytest.mark.unit
+    def test_inverse_vol_prefers_calm_symbols(self):
+        w, _ = optimize(synthetic_closes(5), "inverse_vol")
+        assert list(np.argsort(-w)) == [0, 1, 2, 3, 4]
+
+    @pytest.mark.unit
+    def test_risk_parity_equalizes_contributions(self):
+        closes = synthetic_closes(8)
+        w, _ = optimize(closes, "risk_parity")
+        cov = estimate(closes).cov
+        contrib = w * (cov @ w)
+        assert contrib.max() / contrib.min() == pytest.approx(1.0, rel=1e-3)
+
+    @pytest.mark.unit
+    def test_max_sharpe_falls_back_without_positive_returns(self):
+        w, info = optimize(synthetic_closes(6, drift=-0.01), "max_sharpe")
+        assert info["mode"] == "min_variance"
+        assert w.sum() == pytest.approx(1.0)
+
+    @pytest.mark.unit
+    def test_short_history_uses_equal_weights(self):
+        w, info = optimize(synthetic_closes(4, periods=10), "min_variance")
+        assert info["mode"] == "equal"
+        assert "note" in info
+        np.testing.assert_allclose(w, 0.25)
+
+    @pytest.mark.unit
+    def test_large_universe_is_fast(self):
+        closes = synthetic_closes(100)
+        start = time.perf_counter()
+        for mode in MODES:
+            optimize(closes, mode)
+        assert time.perf_counter() - start < 0.5
+
+
+class TestAllocateLots:
+    """Tests for integer-lot allocation."""
+
+    @pytest.mark.unit
+    def test_leftover_below_cheapest_lot(self):
+        prices = np.array([37.3, 112.9, 8.45, 251.0])
+        shares = allocate_lots(10000, np.full(4, 0.25), prices)
+        cash = 10000 - shares @ prices
+        assert 0 <= cash < prices.min()
+
+    @pytest.mark.unit
+    def test_unaffordable_symbol_budget_goes_to_others(self):
+        prices = np.array([50.0, 20000.0])
+        shares = allocate_lots(1000, np.array([0.5, 0.5]), prices)
+        assert list(shares) == [20, 0]
+
+    @pytest.mark.unit
+    def test_zero_weight_and_missing_price_are_skipped(self):
+        prices = np.array([10.0, np.nan, 10.0])
+        shares = allocate_lots(100, np.array([1.0, 1.0, 0.0]), prices)
+        assert list(shares) == [10, 0, 0]
+
+    @pytest.mark.unit
+    def test_lot_size(self):
+        shares = allocate_lots(1000, np.array([1.0]), np.array([9.0]), lot=10)
+        assert list(shares) == [110]
+
+
+class TestBuildPortfolio:
+    """build_portfolio tool with optimization modes."""
+
+    @pytest.mark.unit
+    def test_unknown_mode(self):
+        result = build_portfolio.invoke({"amount": 1000, "symbols": ["AAA.IS"], "mode": "yolo"})
+        assert result["err"].startswith("Unknown mode")
+
+    @pytest.mark.unit
+    def test_min_variance_from_store_matrix(self, mock_yfinance):
+        symbols = ["AAA.IS", "BBB.IS", "CCC.IS"]
+        matrix = AlignedMatrix(symbols, pd.date_range("2025-01-01", periods=253), synthetic_closes(3))
+        with patch("tools.market_tools.load_matrix", return_value=matrix) as load:
+            result = build_portfolio.invoke({"amount": 100000, "symbols": symbols, "mode": "min_variance"})
+
+        assert load.call_args.args[0] == symbols
+        assert result["mode"] == "min_variance"
+        assert "vol" in result
+        weights = [float(p["w"].rstrip("%")) for p in result["positions"]]
+        assert weights[0] > weights[2]
+        assert result["invested"] + result["cash"] == 100000
+        # Fiyat mock'u ~105 TL; artan nakit bir lottan az
+        assert result["cash"] < 106
+
+    @pytest.mark.unit
+    def test_duplicate_symbols_are_merged(self, mock_yfinance):
+        symbols = ["AAA.IS", "BBB.IS"]
+        matrix = AlignedMatrix(symbols, pd.date_range("2025-01-01", periods=253), synthetic_closes(2))
+        with patch("tools.market_tools.load_matrix", return_value=matrix) as load:
+            result = build_portfolio.invoke({"amount": 100000, "symbols": ["AAA.IS", "AAA.IS", "BBB.IS"],
+                                             "mode": "min_variance"})
+
+        assert load.call_args.args[0] == symbols
+        assert [p["s"] for p in result["positions"]] == ["AAA", "BBB"]
+        assert result["invested"] + result["cash"] == 100000
+
+    @pytest.mark.unit
+    def test_equal_mode_does_not_load_matrix(self, mock_yfinance):
+        with patch("tools.market_tools.load_matrix") as load:
+            result = build_portfolio.invoke({"amount": 10000, "symbols": ["AAA.IS", "BBB.IS"]})
+        load.assert_not_called()
+        assert result["mode"] == "equal"
+        assert [p["w"] for p in result["positions"]] == ["50.0%", "50.0%"]
@@ -0,0 +1,133 @@
+"""
+Price Matrix Tests
+==================
+Tests for aligned memory-mapped matrices and batched store updates.
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.price_matrix import MATRIX_DIR, load_matrix
+from tools.price_store import PriceStore, STORE_BACKFILL, fcntl
+from tests.conftest import make_bars, wide_frame
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(str(tmp_path / "prices"))
+
+
+class TestLoadMatrix:
+    """Tests for alignment and the on-disk matrix cache."""
+
+    @pytest.mark.unit
+    def test_daily_bars_align_on_local_date(self, store):
+        # Aynı takvim günü: İstanbul gece yarısı ile New York gece yarısı farklı UTC anlarıdır
+        store.write("THYAO.IS", "1d", make_bars(dates=["2026-01-05", "2026-01-06", "2026-01-07"],
+                                                closes=[1, 2, 3], tz="Europe/Istanbul"))
+        store.write("AAPL", "1d", make_bars(dates=["2026-01-05", "2026-01-07"], closes=[10, 30],
+                                            tz="America/New_York"))
+
+        m = load_matrix(["THYAO.IS", "AAPL"], refresh=False, store=store)
+        assert list(m.index) == list(pd.to_datetime(["2026-01-05", "2026-01-06", "2026-01-07"]))
+        assert m.values.shape == (2, 3)
+        np.testing.assert_array_equal(m.row("THYAO.IS"), [1, 2, 3])
+        np.testing.assert_array_equal(m.row("AAPL"), [10, np.nan, 30])
+
+    @pytest.mark.unit
+    def test_ffill_and_missing_symbol(self, store):
+        store.write("AAPL", "1d", make_bars(dates=["2026-01-05", "2026-01-07"], closes=[10, 30]))
+        store.write("MSFT", "1d", make_bars(dates=["2026-01-05", "2026-01-06", "2026-01-07"], closes=[1, 2, 3]))
+
+        m = load_matrix(["AAPL", "NOPE", "MSFT"], ffill=True, refresh=False, store=store)
+        np.testing.assert_array_equal(m.row("AAPL"), [10, 10, 30])
+        assert np.isnan(m.row("NOPE")).all()
+
+    @pytest.mark.unit
+    def test_values_are_memory_mapped_and_frame_is_a_view(self, store):
+        store.write("AAPL", "1d", make_bars(dates=["2026-01-05", "2026-01-06"], closes=[1, 2]))
+        m = load_matrix(["AAPL"], refresh=False, store=store)
+        assert isinstance(m.values, np.memmap)
+        assert not m.values.flags.writeable
+        assert np.shares_memory(m.frame().to_numpy(), m.values)
+
+    @pytest.mark.unit
+    def test_matrix_file_reused_until_store_changes(self, store):
+        store.write("AAPL", "1d", make_bars(dates=["2026-01-05", "2026-01-06"], closes=[1, 2]))
+        first = load_matrix(["AAPL"], refresh=False, store=store)
+        second = load_matrix(["AAPL"], refresh=False, store=store)
+        assert first.values.filename == second.values.filename
+        mtime = os.path.getmtime(second.values.filename)
+
+        # Son bar yerinde güncellenir (satır sayısı aynı) → matris yeniden kurulur
+        store.write("AAPL", "1d", make_bars(dates=["2026-01-06"], closes=[5]))
+        third = load_matrix(["AAPL"], refresh=False, store=store)
+        assert third.values[0, -1] == 5
+        assert os.path.getmtime(third.values.filename) >= mtime
+
+    @pytest.mark.unit
+    def test_period_window_per_symbol(self, store):
+        dates = pd.date_range("2026-01-01", periods=60, freq="D")
+        store.write("AAPL", "1d", make_bars(dates=dates, closes=np.arange(60)))
+        m = load_matrix(["AAPL"], period="5d", refresh=False, store=store)
+        np.testing.assert_array_equal(m.row("AAPL"), [55, 56, 57, 58, 59])
+
+
+    @pytest.mark.unit
+    def test_build_leaves_no_temporary_files(self, store):
+        store.write("AAPL", "1d", make_bars(dates=["2026-01-05", "2026-01-06"], closes=[1, 2]))
+        load_matrix(["AAPL"], refresh=False, store=store)
+        names = os.listdir(os.path.join(store.root, MATRIX_DIR))
+        assert names and not [n for n in names if n.endswith(".tmp")]
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(fcntl is None, reason="fcntl yok")
+    def test_build_waits_for_store_lock_held_elsewhere(self, store):
+        store.write("AAPL", "1d", make_bars(dates=["2026-01-05", "2026-01-06"], closes=[1, 2]))
+        built = []
+        with open(os.path.join(store.root, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)        # başka bir worker'ın kurulumu/yazımı
+            builder = threading.Thread(
+                target=lambda: built.append(load_matrix(["AAPL"], refresh=False, store=store)))
+            builder.start()
+            time.sleep(0.2)
+            assert built == []
+            fcntl.flock(f, fcntl.LOCK_UN)
+        builder.join(timeout=5)
+        assert built[0].values[0, -1] == 2
+
+
+class TestUpdateMany:
+    """Tests for batched store refreshes."""
+
+    @pytest.mark.unit
+    def test_empty_and_known_symbols_use_two_batch_requests(self, store):
+        symbols = ["A.IS", "B.IS", "C.IS", "D.IS"]
+        for sym in symbols[:2]:
+            store.write(sym, "1d", make_bars(dates=["2026-01-05"], closes=[1]))
+        frame = wide_frame({s: make_bars(dates=["2026-01-05", "2026-01-06"], closes=[1, 2]) for s in symbols})
+
+        with patch("yfinance.download", return_value=frame) as download:
+            assert store.update_many(symbols) == 4
+            assert store.update_many(symbols) == 0     # hepsi taze
+
+        assert download.call_count == 2
+        kwargs = [c.kwargs for c in download.call_args_list]
+        assert kwargs[0]["period"] == STORE_BACKFILL["1d"]
+        assert kwargs[1]["start"] == "2026-01-05"
+        assert all(store.meta(s, "1d")["rows"] == 2 for s in symbols)
+
+    @pytest.mark.unit
+    def test_few_symbols_use_ticker_history(self, store, mock_yfinance):
+        assert store.update_many(["AAPL", "MSFT"]) == 2
+        assert mock_yfinance.return_value.history.call_count == 2
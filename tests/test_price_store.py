@@ -0,0 +1,270 @@
+"""
+Price Store Tests
+=================
+Tests for the columnar on-disk OHLCV store and its incremental updates.
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.price_store import PriceStore, STORE_BACKFILL, fcntl, period_supported
+from tests.conftest import FakeClock, make_bars, wide_frame
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(str(tmp_path / "prices"), clock=FakeClock(1_000_000.0))
+
+
+class TestWrite:
+    """Tests for appending bars to the column files."""
+
+    @pytest.mark.unit
+    def test_roundtrip_preserves_values_and_timezone(self, store):
+        df = make_bars("2026-01-05", 10, tz="Europe/Istanbul")
+        assert store.write("THYAO.IS", "1d", df) == 10
+
+        out = store.frame("THYAO.IS", "1d", "1y")
+        assert str(out.index.tz) == "Europe/Istanbul"
+        assert out.index.name == "Date"
+        pd.testing.assert_frame_equal(out, df, check_freq=False, check_names=False, check_index_type=False)
+
+    @pytest.mark.unit
+    def test_columns_are_memory_mapped(self, store):
+        store.write("AAPL", "1d", make_bars("2026-01-05", 5))
+        cols = store.columns("AAPL", "1d")
+        assert isinstance(cols["Close"], np.memmap)
+        assert cols["ts"].dtype == np.int64
+        assert len(cols["Close"]) == 5
+
+    @pytest.mark.unit
+    def test_append_only_adds_newer_bars(self, store):
+        store.write("AAPL", "1d", make_bars("2026-01-05", 5))
+        # 3 bar çakışıyor, 2 yeni
+        added = store.write("AAPL", "1d", make_bars("2026-01-07", 5, close_start=200.0))
+        assert added == 2
+        assert store.meta("AAPL", "1d")["rows"] == 7
+
+    @pytest.mark.unit
+    def test_last_bar_is_updated_in_place(self, store):
+        store.write("AAPL", "1d", make_bars("2026-01-05", 5))
+        live = make_bars("2026-01-09", 1, close_start=999.0)
+        assert store.write("AAPL", "1d", live) == 0
+        closes = store.columns("AAPL", "1d")["Close"]
+        assert closes[-1] == 999.0
+        assert closes[-2] == 103.0
+
+    @pytest.mark.unit
+    def test_partial_append_is_truncated(self, store):
+        store.write("AAPL", "1d", make_bars("2026-01-05", 5))
+        # Meta'ya yansımamış yarım ekleme (çökme) simülasyonu
+        with open(os.path.join(store._dir("AAPL", "1d"), "Close.f8"), "ab") as f:
+            f.write(b"\x00" * 12)
+        store.write("AAPL", "1d", make_bars("2026-01-10", 2, close_start=500.0))
+        closes = np.array(store.columns("AAPL", "1d")["Close"])
+        assert closes.tolist() == [100.0, 101.0, 102.0, 103.0, 104.0, 500.0, 501.0]
+
+
+class TestWindows:
+    """Tests for period windows relative to the last stored bar."""
+
+    @pytest.mark.unit
+    def test_daily_day_window_counts_bars(self, store):
+        store.write("AAPL", "1d", make_bars("2026-01-01", 60))
+        assert len(store.frame("AAPL", "1d", "5d")) == 5
+
+    @pytest.mark.unit
+    def test_month_window_is_calendar_offset(self, store):
+        store.write("AAPL", "1d", make_bars("2026-01-01", 60))   # son bar 1 Mart
+        out = store.frame("AAPL", "1d", "1mo")
+        assert out.index[0] == pd.Timestamp("2026-02-01")
+        assert out.index[-1] == pd.Timestamp("2026-03-01")
+
+    @pytest.mark.unit
+    def test_intraday_day_window_counts_sessions(self, store):
+        store.write("GC=F", "1h", make_bars("2026-01-05 10:00", 24 * 8, freq="h", tz="UTC"))
+        out = store.frame("GC=F", "1h", "5d")
+        assert out.index.name == "Datetime"
+        assert len(out.index.normalize().unique()) == 5
+
+    @pytest.mark.unit
+    def test_period_supported(self):
+        assert period_supported("3mo", "1d")
+        assert period_supported("5d", "1h")
+        assert not period_supported("5y", "1d")
+        assert not period_supported("1mo", "1wk")
+
+
+class TestUpdate:
+    """Tests for incremental downloads."""
+
+    @pytest.mark.unit
+    def test_first_update_backfills_then_fetches_from_settled_bar(self, store):
+        provider = MagicMock()
+        provider.history.return_value = make_bars("2026-01-05", 10)
+        with patch("tools.price_store.get_provider", return_value=provider):
+            store.update("AAPL", "1d", max_age=60)
+            provider.history.assert_called_once_with("AAPL", interval="1d", period=STORE_BACKFILL["1d"])
+
+            store._clock.now += 61
+            # Sondan ikinci (kapanmış) bar değişmeden yeniden gelir; yalnızca yeni barlar eklenir
+            provider.history.return_value = make_bars("2026-01-13", 4, close_start=108.0)
+            store.update("AAPL", "1d", max_age=60)
+
+        provider.history.assert_called_with("AAPL", interval="1d", start="2026-01-13")
+        assert store.meta("AAPL", "1d")["rows"] == 12
+        assert store.stats() == {"fetches": 2, "appended": 12}
+
+    @pytest.mark.unit
+    def test_fresh_store_skips_network(self, store):
+        provider = MagicMock()
+        provider.history.return_value = make_bars("2026-01-05", 10)
+        with patch("tools.price_store.get_provider", return_value=provider):
+            store.history("AAPL", "1mo")
+            store.history("AAPL", "5d")
+        assert provider.history.call_count == 1
+
+    @pytest.mark.unit
+    def test_unknown_symbol_leaves_no_files(self, store):
+        provider = MagicMock()
+        provider.history.return_value = pd.DataFrame()
+        with patch("tools.price_store.get_provider", return_value=provider):
+            assert store.history("NOPE", "1mo").empty
+        assert not os.path.exists(store._dir("NOPE", "1d"))
+
+
+BIST = ["THYAO.IS", "GARAN.IS", "AKBNK.IS", "ASELS.IS"]
+
+
+class TestTimezones:
+    """Per-symbol history (exchange-local) and batched downloads (tz-naive) land on the same day."""
+
+    @staticmethod
+    def _assert_unique_local_days(store, symbol):
+        out = store.frame(symbol, "1d")
+        assert str(out.index.tz) == "Europe/Istanbul"
+        assert out.index.normalize().is_unique
+        assert (out.index == out.index.normalize()).all()
+
+    @pytest.mark.unit
+    def test_download_after_history_does_not_duplicate_days(self, store):
+        provider = MagicMock()
+        provider.history.return_value = make_bars("2026-10-07", 10, tz="Europe/Istanbul")   # son bar 16 Ekim
+        provider.download.return_value = wide_frame({s: make_bars("2026-10-16", 3, close_start=300.0) for s in BIST})
+        with patch("tools.price_store.get_provider", return_value=provider):
+            store.update("THYAO.IS", "1d", max_age=60)
+            store._clock.now += 61
+            store.update_many(BIST, "1d", max_age=60)
+
+        assert store.meta("THYAO.IS", "1d")["rows"] == 12
+        self._assert_unique_local_days(store, "THYAO.IS")
+        assert store.frame("THYAO.IS", "1d")["Close"].loc["2026-10-16"].item() == 300.0
+        self._assert_unique_local_days(store, "GARAN.IS")
+
+    @pytest.mark.unit
+    def test_history_after_download_does_not_duplicate_days(self, store):
+        provider = MagicMock()
+        provider.download.return_value = wide_frame({s: make_bars("2026-10-07", 10) for s in BIST})
+        provider.history.return_value = make_bars("2026-10-16", 2, tz="Europe/Istanbul", close_start=500.0)
+        with patch("tools.price_store.get_provider", return_value=provider):
+            store.update_many(BIST, "1d", max_age=60)
+            store._clock.now += 61
+            store.update("THYAO.IS", "1d", max_age=60)
+
+        assert store.meta("THYAO.IS", "1d")["rows"] == 11
+        self._assert_unique_local_days(store, "THYAO.IS")
+
+    @pytest.mark.unit
+    def test_deepening_with_naive_download_keeps_local_days(self, store):
+        store.write("THYAO.IS", "1d", make_bars("2026-10-07", 10, tz="Europe/Istanbul"))
+        provider = MagicMock()
+        provider.download.return_value = make_bars("2026-01-01", 289)     # 1 Ocak – 16 Ekim, saat dilimsiz
+        with patch("tools.price_store.get_provider", return_value=provider):
+            assert store.ensure_depth(["THYAO.IS"], "2y") == 1
+
+        assert store.meta("THYAO.IS", "1d")["rows"] == 289
+        self._assert_unique_local_days(store, "THYAO.IS")
+
+
+def _split_history(ratio: float):
+    """Ticker.history taklidi: bölünmeden sonra geriye dönük düzeltilmiş barlar (5–16 Ocak)."""
+    def history(symbol, interval="1d", period=None, start=None):
+        df = make_bars("2026-01-05", 12, tz="Europe/Istanbul")
+        df.loc[:, ["Open", "High", "Low", "Close"]] /= ratio
+        return df if start is None else df.loc[start:]
+    return history
+
+
+class TestAdjustments:
+    """Back-adjusted history (splits, bonus issues, dividends) replaces the stored bars."""
+
+    @pytest.mark.unit
+    def test_changed_settled_bar_triggers_rebackfill(self, store):
+        provider = MagicMock()
+        provider.history.return_value = make_bars("2026-01-05", 10, tz="Europe/Istanbul")
+        with patch("tools.price_store.get_provider", return_value=provider):
+            store.update("THYAO.IS", "1d", max_age=60)
+            store._clock.now += 61
+            provider.history.side_effect = _split_history(ratio=2.0)
+            store.update("THYAO.IS", "1d", max_age=60)
+
+        provider.history.assert_called_with("THYAO.IS", interval="1d", period=STORE_BACKFILL["1d"])
+        closes = np.array(store.columns("THYAO.IS", "1d")["Close"])
+        np.testing.assert_allclose(closes, (100.0 + np.arange(12)) / 2)
+        assert store.meta("THYAO.IS", "1d")["checked_at"] == store._clock.now
+        assert store.stats()["fetches"] == 3
+
+    @pytest.mark.unit
+    def test_small_float_noise_is_not_an_adjustment(self, store):
+        store.write("THYAO.IS", "1d", make_bars("2026-01-05", 10, tz="Europe/Istanbul"))
+        overlap = make_bars("2026-01-13", 3, tz="Europe/Istanbul", close_start=108.0 * (1 + 1e-6))
+        assert not store._adjusted("THYAO.IS", "1d", overlap)
+        assert store._adjusted("THYAO.IS", "1d", overlap.assign(Close=overlap["Close"] * 0.97))
+
+    @pytest.mark.unit
+    def test_batch_update_rebackfills_adjusted_symbol(self, store):
+        for s in BIST:
+            store.write(s, "1d", make_bars("2026-01-05", 10, tz="Europe/Istanbul"))
+        fresh = make_bars("2026-01-13", 4, close_start=108.0)
+        provider = MagicMock()
+        provider.download.return_value = wide_frame({
+            s: fresh.assign(Close=fresh["Close"] / 2) if s == "GARAN.IS" else fresh for s in BIST
+        })
+        provider.history.side_effect = _split_history(ratio=2.0)
+        with patch("tools.price_store.get_provider", return_value=provider):
+            assert store.update_many(BIST, "1d", max_age=60) == len(BIST)
+
+        provider.history.assert_called_once()
+        assert store.columns("GARAN.IS", "1d")["Close"][0] == 50.0
+        assert store.columns("THYAO.IS", "1d")["Close"][0] == 100.0
+        assert store.meta("THYAO.IS", "1d")["rows"] == 12
+
+
+@pytest.mark.skipif(fcntl is None, reason="fcntl yok")
+class TestProcessLock:
+    """Writes are serialized across processes through a file lock under the store root."""
+
+    @pytest.mark.unit
+    def test_write_waits_for_lock_held_elsewhere(self, store):
+        store.write("AAPL", "1d", make_bars("2026-01-05", 5))
+        finished = []
+        with open(os.path.join(store.root, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)        # başka bir worker'ın yazımı
+            writer = threading.Thread(
+                target=lambda: finished.append(store.write("AAPL", "1d", make_bars("2026-01-10", 2))))
+            writer.start()
+            time.sleep(0.2)
+            assert finished == []
+            fcntl.flock(f, fcntl.LOCK_UN)
+        writer.join(timeout=5)
+        assert finished == [2]
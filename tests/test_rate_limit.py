@@ -0,0 +1,150 @@
+"""
+Unit Tests for LLM Rate Limiting
+================================
+Tests for the token bucket, the shared (cross-worker) bucket and agent wiring.
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.rate_limit import SharedTokenBucket, TokenBucket, fcntl, make_limiter
+from tools.llm import LLMRegistry
+from tests.conftest import FakeClock
+
+
+class TestTokenBucket:
+    """Tests for the in-process bucket."""
+
+    @pytest.mark.unit
+    def test_burst_is_free_then_waits_for_next_token(self):
+        bucket = TokenBucket(rate=2, burst=3, clock=FakeClock())
+        assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+        assert bucket.reserve() == pytest.approx(0.5)
+        # Sıradaki rezervasyon bir öncekinin arkasına eklenir
+        assert bucket.reserve() == pytest.approx(1.0)
+        assert bucket.stats()["delayed"] == 2
+        assert bucket.stats()["total_delay"] == pytest.approx(1.5)
+
+    @pytest.mark.unit
+    def test_refills_over_time_up_to_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, burst=2, clock=clock)
+        bucket.reserve()
+        bucket.reserve()
+        clock.now += 100
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    @pytest.mark.unit
+    def test_acquire_sleeps_only_when_exhausted(self):
+        bucket = TokenBucket(rate=1, burst=1, clock=FakeClock())
+        with patch("tools.rate_limit.time.sleep") as sleep:
+            assert bucket.acquire() == 0
+            sleep.assert_not_called()
+            assert bucket.acquire() == pytest.approx(1.0)
+            sleep.assert_called_once_with(pytest.approx(1.0))
+
+    @pytest.mark.unit
+    def test_concurrent_acquires_are_spaced(self):
+        bucket = TokenBucket(rate=20, burst=2)
+        done = []
+
+        def worker():
+            bucket.acquire()
+            done.append(time.monotonic())
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 2 jeton hazır, kalan 4 istek 1/20 s aralıklarla: en az ~0.2 s
+        assert max(done) - start >= 0.19
+        assert bucket.stats()["delayed"] == 4
+
+    @pytest.mark.unit
+    def test_async_acquire(self):
+        bucket = TokenBucket(rate=50, burst=1)
+
+        async def run():
+            return await asyncio.gather(*[bucket.aacquire() for _ in range(3)])
+
+        delays = asyncio.run(run())
+        assert sorted(delays) == pytest.approx([0, 0.02, 0.04], abs=0.005)
+
+
+@pytest.mark.skipif(fcntl is None, reason="fcntl yok")
+class TestSharedBucket:
+    """Tests for the file-backed bucket shared by workers."""
+
+    @pytest.mark.unit
+    def test_instances_share_one_budget(self, tmp_path):
+        clock = FakeClock()
+        path = str(tmp_path / "llm.bucket")
+        a = SharedTokenBucket(path, rate=1, burst=2, clock=clock)
+        b = SharedTokenBucket(path, rate=1, burst=2, clock=clock)
+        assert a.reserve() == 0
+        assert b.reserve() == 0
+        assert a.reserve() == pytest.approx(1.0)
+        assert b.reserve() == pytest.approx(2.0)
+
+    @pytest.mark.unit
+    def test_make_limiter_uses_shared_dir(self, tmp_path):
+        limiter = make_limiter("openrouter", shared_dir=str(tmp_path))
+        assert isinstance(limiter, SharedTokenBucket)
+        assert limiter.path.endswith("llm-openrouter.bucket")
+        assert type(make_limiter("openrouter", shared_dir="")) is TokenBucket
+
+
+class TestAgentWiring:
+    """agent_node / reflection_node no longer sleep unconditionally."""
+
+    class FakeModel:
+        def __init__(self, content):
+            self.content = content
+
+        def bind_tools(self, tools):
+            return TestAgentWiring.FakeModel("Rapor")
+
+        def invoke(self, messages):
+            return AIMessage(content=self.content)
+
+    @pytest.fixture
+    def agent(self, monkeypatch):
+        import react_agent
+        registry = LLMRegistry(["openrouter"], factory=lambda provider: self.FakeModel("TAMAM"))
+        monkeypatch.setattr(react_agent, "get_llm_registry", lambda: registry)
+        return react_agent
+
+    @pytest.mark.unit
+    def test_nodes_do_not_sleep_with_budget(self, agent, monkeypatch):
+        monkeypatch.setattr("tools.llm.get_limiter", lambda provider: TokenBucket(rate=1, burst=5))
+        state = {"messages": [HumanMessage(content="Altın?")], "user_query": "Altın?", "iteration": 0,
+                 "draft_answer": "", "final_report": "", "needs_more_work": False, "rate_limit_delay": 0.0}
+        start = time.perf_counter()
+        out = agent.agent_node(state)
+        reflected = agent.reflection_node({**state, "draft_answer": out["draft_answer"]})
+        assert time.perf_counter() - start < 0.5
+        assert out["rate_limit_delay"] == 0
+        assert reflected["final_report"] == "Rapor"
+
+    @pytest.mark.unit
+    def test_reports_queueing_delay(self, agent, monkeypatch):
+        bucket = TokenBucket(rate=1, burst=1, clock=FakeClock())
+        bucket.reserve()
+        monkeypatch.setattr("tools.llm.get_limiter", lambda provider: bucket)
+        with patch("tools.rate_limit.time.sleep"):
+            out = agent.agent_node({"messages": [HumanMessage(content="Altın?")], "iteration": 0})
+        assert out["rate_limit_delay"] == pytest.approx(1.0)
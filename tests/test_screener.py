@@ -0,0 +1,190 @@
+"""
+Unit Tests for BIST Screener
+=============================
+Tests for the universe file, columnar snapshot and vectorized queries.
+"""
+
+import pytest
+import sys
+import os
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import screener
+from tools.cache import HISTORY_CACHE
+from tools.price_store import get_price_store
+from tools.screener import IndicatorSnapshot, Screener, build_snapshot, load_universe, top_k
+from tools.market_tools import scan_sector, screen_stocks
+
+
+UNIVERSE = {
+    "GARAN.IS": "banka", "AKBNK.IS": "banka", "YKBNK.IS": "banka",
+    "THYAO.IS": "havacılık", "PGSUS.IS": "havacılık",
+    "EKGYO.IS": "gyo",
+}
+
+
+def make_frames(symbols, periods=40):
+    """Deterministic OHLCV frames: GARAN rises, AKBNK falls, others drift; EKGYO missing."""
+    dates = pd.date_range(start="2025-10-01", periods=periods, freq="B")
+    slopes = {"GARAN.IS": 1.0, "AKBNK.IS": -1.0, "YKBNK.IS": 0.2, "THYAO.IS": 0.5, "PGSUS.IS": -0.3}
+    frames = {}
+    for sym in symbols:
+        if sym not in slopes:
+            continue
+        close = 100 + slopes[sym] * np.arange(periods) + np.sin(np.arange(periods))
+        volume = np.full(periods, 1000.0)
+        volume[::2] = 1200.0
+        if sym == "THYAO.IS":
+            volume[-1] = 5000.0
+        frames[sym] = pd.DataFrame({"Close": close, "Volume": volume}, index=dates)
+    return frames
+
+
+@pytest.fixture
+def fake_store():
+    """Fiyat deposu güncellemesi ağ yerine make_frames ile doldurulur."""
+    calls = []
+    store = get_price_store()
+
+    def _update(symbols, interval="1d", max_age=None):
+        calls.append(list(symbols))
+        for sym, frame in make_frames(symbols).items():
+            store.write(sym, interval, frame)
+        return len(calls[-1])
+
+    with patch.object(store, "update_many", side_effect=_update):
+        yield calls
+
+
+@pytest.fixture
+def small_screener(fake_store):
+    s = Screener(UNIVERSE)
+    with patch.object(screener, "get_screener", return_value=s), \
+         patch("tools.market_tools.get_screener", return_value=s):
+        yield s
+
+
+class TestUniverse:
+    """Tests for the universe data file."""
+
+    @pytest.mark.unit
+    def test_load_universe(self):
+        universe = load_universe()
+        assert len(universe) > 250
+        assert all(s.endswith(".IS") for s in universe)
+        assert universe["GARAN.IS"] == "banka"
+        assert {"banka", "holding", "gyo", "enerji"} <= set(universe.values())
+
+
+class TestSnapshot:
+    """Tests for build_snapshot."""
+
+    @pytest.mark.unit
+    def test_chunked_and_aligned(self, fake_store):
+        snap = build_snapshot(UNIVERSE, chunk_size=4)
+        # Evren tek seferde güncellenir; göstergeler 4'lük bloklarla hesaplanır
+        assert fake_store == [list(UNIVERSE)]
+        assert len(HISTORY_CACHE) == 0
+        assert list(snap.symbols) == list(UNIVERSE)
+
+        i = list(UNIVERSE).index
+        assert snap.ret[i("GARAN.IS")] > 0 > snap.ret[i("AKBNK.IS")]
+        assert snap.volume_z[i("THYAO.IS")] > 3
+        assert np.isnan(snap.price[i("EKGYO.IS")])
+        assert snap.sector_names[snap.sector_codes[i("PGSUS.IS")]] == "havacılık"
+
+
+class TestQuery:
+    """Tests for top_k / Screener.query."""
+
+    @pytest.mark.unit
+    def test_top_k_matches_full_sort(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=1000)
+        values[::7] = np.nan
+        expected = np.argsort(-np.nan_to_num(values, nan=-np.inf))[:10]
+        assert list(top_k(values, 10)) == list(expected)
+        assert list(top_k(values, 3, descending=False)) == list(np.argsort(np.nan_to_num(values, nan=np.inf))[:3])
+        assert len(top_k(np.array([np.nan, 1.0]), 5)) == 1
+
+    @pytest.mark.unit
+    def test_top_momentum(self, small_screener):
+        result = small_screener.query(top=2)
+        assert [r["s"] for r in result["rows"]] == ["GARAN", "THYAO"]
+        assert result["matches"] == 5
+
+    @pytest.mark.unit
+    def test_sector_and_rsi_mask(self, small_screener):
+        result = small_screener.query(sector="bankalar", rsi_below=50, sort_by="rsi", ascending=True)
+        assert [r["s"] for r in result["rows"]] == ["AKBNK"]
+        assert small_screener.query(sector="uzay")["err"].startswith("Unknown sector")
+
+    @pytest.mark.unit
+    def test_snapshot_reused_until_stale(self, small_screener, fake_store):
+        small_screener.query()
+        small_screener.query(sector="gyo")
+        assert len(fake_store) == 1
+
+    @pytest.mark.unit
+    def test_query_is_fast_on_large_universe(self):
+        n = 5000
+        rng = np.random.default_rng(1)
+        s = Screener({f"S{i}.IS": f"sec{i % 30}" for i in range(n)})
+        s._snapshot = IndicatorSnapshot(
+            symbols=np.array(list(s.universe)), sector_codes=np.arange(n) % 30,
+            sector_names=sorted({f"sec{i}" for i in range(30)}, key=lambda x: int(x[3:])),
+            price=rng.uniform(1, 100, n), ret=rng.normal(0, 10, n), rsi=rng.uniform(0, 100, n),
+            volatility=rng.uniform(0, 5, n), volume_z=rng.normal(size=n), updated_at=time.time(),
+        )
+        start = time.perf_counter()
+        result = s.query(rsi_below=30, top=5)
+        assert time.perf_counter() - start < 0.05
+        assert len(result["rows"]) == 5
+
+
+class TestTools:
+    """screen_stocks tool and scan_sector fallback."""
+
+    @pytest.mark.unit
+    def test_screen_stocks_tool(self, small_screener):
+        small_screener.refresh()
+        result = screen_stocks.invoke({"sector": "havacılık", "top": 1})
+        assert [r["s"] for r in result["rows"]] == ["THYAO"]
+
+    @pytest.mark.unit
+    def test_cold_screen_returns_warming_up(self, small_screener, fake_store):
+        with patch.object(small_screener, "refresh_in_background") as background:
+            result = screen_stocks.invoke({"top": 1})
+        assert result["warming_up"] and "err" in result
+        background.assert_called_once()
+        assert fake_store == []              # istek yolunda kurulum yok
+
+    @pytest.mark.unit
+    def test_background_warmup_then_query(self, small_screener, fake_store):
+        screen_stocks.invoke({"top": 1})
+        small_screener._background.join(5)
+        assert small_screener.ready
+        assert screen_stocks.invoke({"sector": "havacılık", "top": 1})["rows"][0]["s"] == "THYAO"
+
+    @pytest.mark.unit
+    def test_stale_snapshot_served_while_refreshing(self, small_screener, fake_store):
+        small_screener.refresh()
+        small_screener._snapshot = small_screener._snapshot._replace(updated_at=time.time() - 10 * small_screener.ttl)
+        with patch.object(small_screener, "refresh_in_background") as background:
+            result = screen_stocks.invoke({"top": 1})
+        assert result["rows"]
+        background.assert_called_once()
+        assert len(fake_store) == 1
+
+    @pytest.mark.unit
+    def test_scan_sector_uses_universe(self, small_screener, fake_store):
+        result = scan_sector.invoke({"sector": "gyo"})
+        assert fake_store[-1] == ["EKGYO.IS"]
+        assert "err" not in result
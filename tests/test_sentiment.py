@@ -0,0 +1,82 @@
+"""
+Unit Tests for Lexicon Sentiment
+=================================
+Tests for per-headline and batch sentiment scoring.
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.sentiment import Lexicon, SentimentScore, aggregate, label, score_headline, score_headlines
+
+
+class TestLexicon:
+    """Tests for Lexicon.score / score_batch."""
+
+    @pytest.mark.unit
+    def test_counts_frequency_not_presence(self):
+        assert score_headline("Rekor üstüne rekor") == SentimentScore(2, 0)
+
+    @pytest.mark.unit
+    def test_matches_inflected_forms_case_insensitive(self):
+        assert score_headline("YÜKSELİŞLE açıldı, düşüşe geçti") == SentimentScore(1, 1)
+
+    @pytest.mark.unit
+    def test_circumflex_spelling_matches_plain(self):
+        # Sözlükteki "kâr", şapkasız "kar" yazımıyla da eşleşir
+        assert score_headline("Şirketin net karı rekor kırdı") == SentimentScore(2, 0)
+        assert score_headline("KÂR PAYI") == score_headline("kar payı") == SentimentScore(1, 0)
+
+    @pytest.mark.unit
+    def test_short_stems_do_not_match_longer_words(self):
+        # "kâr" → "kar" indirgemesi "kararı", "karşı" gibi kelimelerle eşleşmemeli
+        for text in ("Faiz kararı açıklandı", "Dolara karşı değer kaybetmedi", "Piyasalar karışık",
+                     "Yatırımcı kararsız", "Kara liste", "Boğaziçi köprüsü", "Boğaz geçişi"):
+            assert score_headline(text) == SentimentScore(0, 0), text
+
+    @pytest.mark.unit
+    def test_listed_forms_of_short_stems_match(self):
+        assert score_headline("Kârlılık arttı, boğalar geri döndü") == SentimentScore(2, 0)
+        assert score_headline("Net kârını ikiye katladı") == SentimentScore(1, 0)
+        assert score_headlines(["Faiz kararı", "kar payı"]) == [SentimentScore(0, 0), SentimentScore(1, 0)]
+
+    @pytest.mark.unit
+    def test_stems_match_at_word_start_only(self):
+        # "riski" eşleşir, "bariskin" eşleşmez
+        assert score_headline("bariskin riski") == SentimentScore(0, 1)
+
+    @pytest.mark.unit
+    def test_whole_word_terms(self):
+        assert score_headline("Ocak ayında ayı piyasası") == SentimentScore(0, 1)
+
+    @pytest.mark.unit
+    def test_batch_matches_single(self):
+        texts = ["Kâr artışı rekor", "", "Zarar ve kriz", "nötr başlık", "Ralli sürdü, satışlar geriledi"]
+        assert score_headlines(texts) == [score_headline(t) for t in texts]
+        assert score_headlines([]) == []
+        assert score_headlines(["satır\nkırılan kriz", "rekor"]) == [SentimentScore(0, 1), SentimentScore(1, 0)]
+
+    @pytest.mark.unit
+    def test_custom_lexicon(self):
+        lex = Lexicon(positive=["uçuş"], negative=["çöküş"], whole_word=[], forms={})
+        assert lex.score("Uçuşa geçti, sonra çöküş") == SentimentScore(1, 1)
+
+
+class TestAggregate:
+    """Tests for aggregate / label."""
+
+    @pytest.mark.unit
+    def test_aggregate(self):
+        result = aggregate(score_headlines(["Rekor kâr", "Kriz derinleşti"]))
+        assert result["headlines"] == [2, -1]
+        assert result["score"] == 1
+        assert result["sentiment"] == "OLUMLU"
+
+    @pytest.mark.unit
+    def test_labels(self):
+        assert (label(3), label(0), label(-1)) == ("OLUMLU", "NÖTR", "OLUMSUZ")
+        assert aggregate([])["sentiment"] == "NÖTR"
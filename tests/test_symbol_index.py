@@ -0,0 +1,85 @@
+"""
+Unit Tests for Symbol Index
+============================
+Tests for Turkish normalization and deterministic longest-match lookup.
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.symbol_index import SymbolIndex, normalize_tr
+
+
+@pytest.fixture
+def index():
+    return SymbolIndex({
+        "altın": "GC=F",
+        "petrol": "CL=F",
+        "türk hava yolları": "THYAO.IS",
+        "thy": "THYAO.IS",
+        "türk": "XU100.IS",
+        "yapı kredi": "YKBNK.IS",
+        "ford otosan": "FROTO.IS",
+    })
+
+
+class TestNormalize:
+    """Tests for normalize_tr."""
+
+    @pytest.mark.unit
+    def test_turkish_characters(self):
+        assert normalize_tr("ALTIN") == "altin"
+        assert normalize_tr("Altın") == "altin"
+        assert normalize_tr("İŞ BANKASI") == "is bankasi"
+        assert normalize_tr("Tüpraş") == "tupras"
+        assert normalize_tr("doğalgaz") == "dogalgaz"
+
+    @pytest.mark.unit
+    def test_whitespace_collapsed(self):
+        assert normalize_tr("  yapı   kredi ") == "yapi kredi"
+
+
+class TestLookup:
+    """Tests for SymbolIndex.lookup tiers."""
+
+    @pytest.mark.unit
+    def test_exact(self, index):
+        assert index.lookup("ALTIN") == ("GC=F", "altin", "exact")
+
+    @pytest.mark.unit
+    def test_longest_contained_alias_wins(self, index):
+        # "türk" ve "thy" yerine en uzun eşleşme seçilmeli
+        symbol, alias, kind = index.lookup("Türk Hava Yolları hissesi")
+        assert (symbol, alias, kind) == ("THYAO.IS", "turk hava yollari", "contains")
+
+    @pytest.mark.unit
+    def test_contains_is_order_independent(self):
+        a = SymbolIndex({"türk": "XU100.IS", "türk hava yolları": "THYAO.IS"})
+        b = SymbolIndex({"türk hava yolları": "THYAO.IS", "türk": "XU100.IS"})
+        assert a.lookup("türk hava yolları bileti") == b.lookup("türk hava yolları bileti")
+
+    @pytest.mark.unit
+    def test_partial_prefers_shortest_alias(self, index):
+        assert index.lookup("ford") == ("FROTO.IS", "ford otosan", "partial")
+        assert index.lookup("yapı") == ("YKBNK.IS", "yapi kredi", "partial")
+
+    @pytest.mark.unit
+    def test_short_or_empty_queries_do_not_partial_match(self, index):
+        assert index.lookup("") is None
+        assert index.lookup("   ") is None
+        assert index.lookup("a") is None
+
+    @pytest.mark.unit
+    def test_unknown(self, index):
+        assert index.lookup("asdfghjkl") is None
+
+    @pytest.mark.unit
+    def test_add_rebuilds_automaton(self, index):
+        assert index.lookup("ereğli demir") is None
+        index.add("ereğli", "EREGL.IS")
+        assert index.lookup("ereğli demir") == ("EREGL.IS", "eregli", "contains")
+        assert "EREĞLİ" in index
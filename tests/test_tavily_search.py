@@ -0,0 +1,110 @@
+"""
+Unit Tests for Tavily Search Cache
+===================================
+Tests for normalized-query caching and single-flight deduplication.
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import tavily_search
+from tools.market_tools import get_news
+
+
+RESPONSE = {"results": [{
+    "title": "Altın rekor kırdı", "url": "https://x/1",
+    "content": "Ons altın yükseliş sürüyor", "score": 0.9, "published_date": "2024-01-01"
+}]}
+
+
+def slow_client(delay=0.2, response=RESPONSE):
+    client = MagicMock()
+
+    def _search(**kwargs):
+        time.sleep(delay)
+        return response
+
+    client.search.side_effect = _search
+    return client
+
+
+class AsyncClient:
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+
+    async def search(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return RESPONSE
+
+
+class TestTavilyCache:
+    """Tests for search / asearch."""
+
+    @pytest.mark.unit
+    def test_normalized_queries_share_entry(self):
+        client = slow_client(0)
+        with patch.object(tavily_search, "get_tavily_client", return_value=client):
+            tavily_search.search("Altın  Haberleri", "k")
+            tavily_search.search("altin haberleri", "k")
+        assert client.search.call_count == 1
+
+    @pytest.mark.unit
+    def test_concurrent_identical_lookups_single_flight(self):
+        client = slow_client(0.2)
+        with patch.object(tavily_search, "get_tavily_client", return_value=client):
+            with ThreadPoolExecutor(max_workers=5) as pool:
+                results = list(pool.map(lambda _: tavily_search.search("altın", "k"), range(5)))
+        assert client.search.call_count == 1
+        assert all(r is RESPONSE for r in results)
+
+    @pytest.mark.unit
+    def test_async_single_flight(self):
+        client = AsyncClient()
+
+        async def run():
+            return await asyncio.gather(*[tavily_search.asearch("bitcoin", "k") for _ in range(5)])
+
+        with patch.object(tavily_search, "get_async_tavily_client", return_value=client):
+            results = asyncio.run(run())
+        assert client.calls == 1
+        assert all(r is RESPONSE for r in results)
+
+    @pytest.mark.unit
+    def test_errors_not_cached(self):
+        client = MagicMock()
+        client.search.side_effect = [RuntimeError("quota"), RESPONSE]
+        with patch.object(tavily_search, "get_tavily_client", return_value=client):
+            with pytest.raises(RuntimeError):
+                tavily_search.search("altın", "k")
+            assert tavily_search.search("altın", "k") is RESPONSE
+
+    @pytest.mark.unit
+    def test_client_reused(self):
+        assert tavily_search.get_tavily_client("k1") is tavily_search.get_tavily_client("k1")
+        assert tavily_search.get_tavily_client("k1") is not tavily_search.get_tavily_client("k2")
+
+
+class TestGetNewsUsesCache:
+    """get_news goes through the Tavily cache."""
+
+    @pytest.mark.unit
+    def test_repeated_news_one_request(self, monkeypatch):
+        monkeypatch.setenv("TAVILY_API_KEY", "test-key")
+        client = slow_client(0)
+        with patch.object(tavily_search, "get_tavily_client", return_value=client):
+            first = get_news.invoke({"company": "Altın"})
+            second = get_news.invoke({"company": "altın"})
+        assert client.search.call_count == 1
+        assert first["news"] == second["news"]
+        assert first["source"] == "Tavily API (High Quality)"
+        assert first["headline_scores"] == [2]
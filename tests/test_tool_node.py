@@ -0,0 +1,262 @@
+"""
+Unit Tests for the Agent Tool Node
+==================================
+Tests for concurrent tool calls, per-call timeouts, ordering, timing and memoization.
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import json
+import threading
+import time
+from typing import Annotated, TypedDict
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, StateGraph
+from langgraph.graph.message import add_messages
+from langgraph.prebuilt import ToolNode
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.cache import CACHE_TTL_OPEN
+from tools.tool_node import (
+    TOOL_CALL_TIMEOUT, TOOL_FRESHNESS, TOOL_TIMEOUTS, ParallelToolNode, ToolMemo, canonical_args,
+)
+from tests.conftest import FakeClock
+
+
+@tool
+def slow_tool(label: str, delay: float) -> dict:
+    """Waits `delay` seconds and echoes the label."""
+    time.sleep(delay)
+    return {"label": label}
+
+
+async def _aslow_tool(label: str, delay: float) -> dict:
+    await asyncio.sleep(delay)
+    return {"label": label}
+
+
+slow_tool.coroutine = _aslow_tool
+
+
+RUNS = []
+_runs_lock = threading.Lock()
+
+
+@tool
+def counted_tool(symbol: str, period: str = "1mo") -> dict:
+    """Counts executions; symbol 'yok' returns an error payload."""
+    with _runs_lock:
+        RUNS.append(symbol)
+    time.sleep(0.1)
+    if symbol.strip().lower() == "yok":
+        return {"err": "No data"}
+    return {"symbol": symbol.strip().upper(), "period": period, "run": len(RUNS)}
+
+
+async def _acounted_tool(symbol: str, period: str = "1mo") -> dict:
+    return await asyncio.to_thread(counted_tool.func, symbol, period)
+
+
+counted_tool.coroutine = _acounted_tool
+
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def make_graph(**kwargs):
+    graph = StateGraph(State)
+    graph.add_node("tools", ParallelToolNode([slow_tool], **kwargs))
+    graph.set_entry_point("tools")
+    graph.add_edge("tools", END)
+    return graph.compile()
+
+
+def turn(*delays):
+    calls = [{"name": "slow_tool", "args": {"label": f"t{i}", "delay": d}, "id": f"call-{i}"}
+             for i, d in enumerate(delays)]
+    return {"messages": [AIMessage(content="", tool_calls=calls)]}
+
+
+def tool_messages(result):
+    return [m for m in result["messages"] if isinstance(m, ToolMessage)]
+
+
+class TestConcurrency:
+    """A turn costs the slowest call, not the sum."""
+
+    @pytest.mark.unit
+    def test_sync_turn_costs_slowest_call(self):
+        graph = make_graph()
+        start = time.perf_counter()
+        result = graph.invoke(turn(0.3, 0.3, 0.3))
+        assert time.perf_counter() - start < 0.6
+        assert len(tool_messages(result)) == 3
+
+    @pytest.mark.unit
+    def test_async_turn_costs_slowest_call(self):
+        graph = make_graph()
+        start = time.perf_counter()
+        result = asyncio.run(graph.ainvoke(turn(0.3, 0.3, 0.3)))
+        assert time.perf_counter() - start < 0.6
+        assert len(tool_messages(result)) == 3
+
+
+class TestOrderingAndTiming:
+    """Messages follow the model's call order and carry their own timing."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("mode", ["sync", "async"])
+    def test_order_follows_calls_not_completion(self, mode):
+        graph = make_graph()
+        state = turn(0.3, 0.0, 0.15)
+        result = graph.invoke(state) if mode == "sync" else asyncio.run(graph.ainvoke(state))
+        messages = tool_messages(result)
+        assert [m.tool_call_id for m in messages] == ["call-0", "call-1", "call-2"]
+        assert [json.loads(m.content)["label"] for m in messages] == ["t0", "t1", "t2"]
+
+    @pytest.mark.unit
+    def test_elapsed_is_per_call(self):
+        messages = tool_messages(make_graph().invoke(turn(0.25, 0.0)))
+        slow, fast = (m.response_metadata["elapsed_ms"] for m in messages)
+        assert slow >= 250
+        assert fast < 100
+
+
+class TestTimeouts:
+    """Each call has its own deadline."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("mode", ["sync", "async"])
+    def test_slow_call_times_out_others_complete(self, mode):
+        graph = make_graph(default_timeout=0.2)
+        state = turn(1.0, 0.0)
+        start = time.perf_counter()
+        result = graph.invoke(state) if mode == "sync" else asyncio.run(graph.ainvoke(state))
+        assert time.perf_counter() - start < 0.8
+        late, ok = tool_messages(result)
+        assert late.status == "error"
+        assert "err" in json.loads(late.content)
+        assert late.tool_call_id == "call-0"
+        assert json.loads(ok.content) == {"label": "t1"}
+
+    @pytest.mark.unit
+    def test_per_tool_timeouts(self):
+        node = ParallelToolNode([slow_tool], timeouts={"slow_tool": 5.0})
+        assert node.timeout_for("slow_tool") == 5.0
+        assert node.timeout_for("other") == TOOL_CALL_TIMEOUT
+        assert ParallelToolNode([slow_tool]).timeout_for("screen_stocks") == TOOL_TIMEOUTS["screen_stocks"]
+
+    @pytest.mark.unit
+    def test_tool_node_hooks_match_installed_langgraph(self):
+        from tools.tool_node import _check_tool_node_hooks
+        _check_tool_node_hooks()
+        with patch.object(ToolNode, "_run_one", lambda self, call: None):
+            with pytest.raises(ImportError, match="_run_one"):
+                _check_tool_node_hooks()
+
+    @pytest.mark.unit
+    def test_agent_uses_parallel_node(self):
+        import react_agent
+        assert isinstance(react_agent.tool_node, ParallelToolNode)
+        assert set(react_agent.tool_node.tools_by_name) == {t.name for t in react_agent.ALL_TOOLS}
+
+
+def make_memo_graph(memo):
+    graph = StateGraph(State)
+    graph.add_node("tools", ParallelToolNode([counted_tool, slow_tool], memo=memo))
+    graph.set_entry_point("tools")
+    graph.add_edge("tools", END)
+    return graph.compile()
+
+
+def counted_turn(*args_list, prefix="c"):
+    calls = [{"name": "counted_tool", "args": args, "id": f"{prefix}-{i}"} for i, args in enumerate(args_list)]
+    return {"messages": [AIMessage(content="", tool_calls=calls)]}
+
+
+@pytest.fixture
+def memo():
+    RUNS.clear()
+    return ToolMemo(freshness={"counted_tool": 60}, clock=FakeClock())
+
+
+class TestMemoization:
+    """Identical calls (name + canonical args) are answered from the memo."""
+
+    @pytest.mark.unit
+    def test_repeat_call_across_runs_is_instant(self, memo):
+        graph = make_memo_graph(memo)
+        first = tool_messages(graph.invoke(counted_turn({"symbol": "altın"}, prefix="a")))[0]
+        start = time.perf_counter()
+        again = tool_messages(graph.invoke(counted_turn({"symbol": "altın"}, prefix="b")))[0]
+        assert time.perf_counter() - start < 0.1
+        assert RUNS == ["altın"]
+        assert again.content == first.content
+        assert again.tool_call_id == "b-0"
+        assert again.response_metadata["cached"]
+        assert memo.stats()["hits"] == 1
+
+    @pytest.mark.unit
+    def test_equivalent_args_share_key(self, memo):
+        graph = make_memo_graph(memo)
+        graph.invoke(counted_turn({"symbol": "GARAN"}, prefix="a"))
+        graph.invoke(counted_turn({"symbol": " garan ", "period": "1mo"}, prefix="b"))
+        graph.invoke(counted_turn({"symbol": "garan", "period": "1y"}, prefix="c"))
+        assert RUNS == ["GARAN", "garan"]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("mode", ["sync", "async"])
+    def test_duplicate_calls_in_one_turn_run_once(self, memo, mode):
+        graph = make_memo_graph(memo)
+        state = counted_turn({"symbol": "altın"}, {"symbol": "Altın"}, {"symbol": "bakır"})
+        result = graph.invoke(state) if mode == "sync" else asyncio.run(graph.ainvoke(state))
+        messages = tool_messages(result)
+        assert len(RUNS) == 2 and "bakır" in RUNS
+        assert [m.tool_call_id for m in messages] == ["c-0", "c-1", "c-2"]
+        assert messages[0].content == messages[1].content
+        assert memo.stats()["shared"] == 1
+
+    @pytest.mark.unit
+    def test_errors_are_not_memoized(self, memo):
+        graph = make_memo_graph(memo)
+        graph.invoke(counted_turn({"symbol": "yok"}, prefix="a"))
+        graph.invoke(counted_turn({"symbol": "yok"}, prefix="b"))
+        assert RUNS == ["yok", "yok"]
+
+    @pytest.mark.unit
+    def test_entries_expire_after_freshness_window(self, memo):
+        graph = make_memo_graph(memo)
+        graph.invoke(counted_turn({"symbol": "altın"}, prefix="a"))
+        memo.cache._clock.now += 61
+        graph.invoke(counted_turn({"symbol": "altın"}, prefix="b"))
+        assert RUNS == ["altın", "altın"]
+
+    @pytest.mark.unit
+    def test_tools_without_policy_are_not_memoized(self, memo):
+        assert memo.key({"name": "slow_tool", "args": {"label": "x", "delay": 0}, "id": "1"}, slow_tool) is None
+
+    @pytest.mark.unit
+    def test_canonical_args_fill_defaults_and_types(self):
+        assert canonical_args(counted_tool, {"symbol": "  THYAO  "}) == {"symbol": "thyao", "period": "1mo"}
+        assert canonical_args(slow_tool, {"label": "A", "delay": 1}) == {"label": "a", "delay": 1.0}
+
+    @pytest.mark.unit
+    def test_default_policies(self):
+        memo = ToolMemo()
+        assert memo.ttl({"name": "analyze_stock", "args": {"symbol": "altın"}}) == CACHE_TTL_OPEN
+        assert memo.ttl({"name": "get_news", "args": {"company": "THY"}}) == TOOL_FRESHNESS["get_news"]
+        assert "quick_answer" not in TOOL_FRESHNESS
+
+    @pytest.mark.unit
+    def test_agent_node_uses_shared_memo(self):
+        import react_agent
+        from tools.tool_node import get_tool_memo
+        assert react_agent.tool_node.memo is get_tool_memo()
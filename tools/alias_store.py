@@ -0,0 +1,149 @@
+"""
+Alias Store
+===========
+SQLite-backed, thread-safe store for symbols learned by resolve_symbol.
+
+- Pozitif kayıtlar: web aramasıyla bulunan takma ad → sembol eşleşmeleri.
+  Süresizdir ve açılışta SYMBOL_MAP / SYMBOL_INDEX'e yüklenir.
+- Tahmini kayıtlar: web metnindeki kelimeden tahmin edilip veriyle doğrulanan
+  tickerlar. GUESS_TTL sonra düşer; indekse girmez, yalnızca aynı sorgu için
+  guessed() ile döner (kısmi eşleşmede başka sorguları yakalamasın).
+- Negatif kayıtlar: hiçbir sembol bulunamayan sorgular ("asdfghjkl").
+  NEGATIVE_TTL boyunca tekrar web araması yapılmaz.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from tools.cache import CACHE_DIR
+
+
+ALIAS_DB_FILE = "aliases.db"
+NEGATIVE_TTL = 24 * 3600     # saniye
+GUESS_TTL = 7 * 24 * 3600    # saniye
+
+
+class AliasStore:
+    """Persistent alias → symbol map with expiring guessed and negative entries."""
+
+    def __init__(self, path: str, clock=time.time):
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS aliases (
+                alias      TEXT PRIMARY KEY,
+                symbol     TEXT,
+                expires_at REAL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        # Negatif kontrol her istekte yapılır; diske gitmemek için bellekte tutulur
+        self._negative: Dict[str, float] = dict(self._conn.execute(
+            "SELECT alias, expires_at FROM aliases WHERE symbol IS NULL AND expires_at > ?",
+            (self._clock(),)
+        ).fetchall())
+        self._guessed: Dict[str, Tuple[str, float]] = {
+            alias: (symbol, expires_at) for alias, symbol, expires_at in self._conn.execute(
+                "SELECT alias, symbol, expires_at FROM aliases WHERE symbol IS NOT NULL AND expires_at > ?",
+                (self._clock(),)
+            ).fetchall()
+        }
+
+    def positives(self) -> Dict[str, str]:
+        """Öğrenilmiş süresiz takma ad → sembol eşleşmeleri (tahminler hariç)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT alias, symbol FROM aliases WHERE symbol IS NOT NULL AND expires_at IS NULL"
+            ).fetchall()
+        return dict(rows)
+
+    def put(self, alias: str, symbol: str, ttl: Optional[float] = None) -> None:
+        """
+        Pozitif eşleşme kaydeder (varsa negatif kaydın üzerine yazar).
+        ttl verilirse kayıt tahminidir ve ttl saniye sonra düşer.
+        """
+        expires_at = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._negative.pop(alias, None)
+            if expires_at is None:
+                self._guessed.pop(alias, None)
+            else:
+                self._guessed[alias] = (symbol, expires_at)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO aliases (alias, symbol, expires_at, updated_at) VALUES (?, ?, ?, ?)",
+                (alias, symbol, expires_at, self._clock())
+            )
+            self._conn.commit()
+
+    def guessed(self, alias: str) -> Optional[str]:
+        """Süresi dolmamış tahmini eşleşmenin sembolü; yoksa None."""
+        entry = self._guessed.get(alias)
+        if entry is None:
+            return None
+        symbol, expires_at = entry
+        if expires_at <= self._clock():
+            with self._lock:
+                self._guessed.pop(alias, None)
+            return None
+        return symbol
+
+    def put_negative(self, alias: str, ttl: float = NEGATIVE_TTL) -> None:
+        """Sonuçsuz sorguyu ttl saniye boyunca negatif olarak işaretler."""
+        expires_at = self._clock() + ttl
+        with self._lock:
+            self._negative[alias] = expires_at
+            self._conn.execute(
+                "INSERT OR REPLACE INTO aliases (alias, symbol, expires_at, updated_at) VALUES (?, NULL, ?, ?)",
+                (alias, expires_at, self._clock())
+            )
+            self._conn.commit()
+
+    def is_negative(self, alias: str) -> bool:
+        """Sorgu yakın zamanda sonuçsuz kaldıysa True."""
+        expires_at = self._negative.get(alias)
+        if expires_at is None:
+            return False
+        if expires_at <= self._clock():
+            with self._lock:
+                self._negative.pop(alias, None)
+            return False
+        return True
+
+    def purge_expired(self) -> int:
+        """Süresi dolmuş negatif ve tahmini kayıtları siler."""
+        now = self._clock()
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM aliases WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            )
+            self._conn.commit()
+            self._negative = {a: e for a, e in self._negative.items() if e > now}
+            self._guessed = {a: g for a, g in self._guessed.items() if g[1] > now}
+        return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[AliasStore] = None
+_store_lock = threading.Lock()
+
+
+def get_alias_store() -> AliasStore:
+    """Süreç genelinde tek AliasStore (ilk kullanımda açılır)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AliasStore(os.path.join(CACHE_DIR, ALIAS_DB_FILE))
+                _store.purge_expired()
+    return _store
@@ -0,0 +1,194 @@
+"""
+Signal Backtest
+===============
+Vectorized backtest of analyze_stock's AL/SAT/TUT rule and its variants.
+
+Kural her bar için (semboller × zaman) matrisinde tek geçişte uygulanır:
+    AL  : RSI < rsi_buy  veya `lookback` barlık getiri > chg_buy
+    SAT : RSI > rsi_sell veya getiri < chg_sell
+    TUT : diğer durumlar
+Pozisyon yalnızca uzun/nakit: AL ile girilir, SAT ile çıkılır, TUT önceki
+durumu korur. Sinyal bar kapanışında oluşur, getiriye bir sonraki bardan
+itibaren katılır (ileriye bakma yok). Parametre varyantları aynı RSI ve
+getiri matrislerini paylaşır.
+"""
+
+import itertools
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from tools.indicators import rsi as rsi_indicator
+
+
+TRADING_DAYS = 252
+HIT_HORIZON = 21             # isabet oranı: sinyalden sonraki bu kadar barlık getiri
+COST_BPS = 10                # pozisyon değişimi başına işlem maliyeti (baz puan)
+BACKTEST_PERIOD = "5y"
+SIGNAL_LABELS = {1: "AL", -1: "SAT", 0: "TUT"}
+
+
+class SignalRule(NamedTuple):
+    """analyze_stock sinyal eşikleri; varsayılanlar aracın kullandığı kuraldır."""
+    rsi_buy: float = 30
+    rsi_sell: float = 70
+    chg_buy: float = 5
+    chg_sell: float = -5
+    lookback: int = 21       # analyze_stock'un 1 aylık penceresi ≈ 21 bar
+    rsi_period: int = 14
+
+    def describe(self) -> str:
+        return (f"RSI<{self.rsi_buy:g}|chg>{self.chg_buy:g}% AL, "
+                f"RSI>{self.rsi_sell:g}|chg<{self.chg_sell:g}% SAT, {self.lookback}b")
+
+
+DEFAULT_RULE = SignalRule()
+
+
+def classify(rsi, chg, rule: SignalRule = DEFAULT_RULE) -> np.ndarray:
+    """+1 (AL), -1 (SAT), 0 (TUT). Skaler veya dizi; NaN girdiler TUT'tur."""
+    rsi = np.asarray(rsi, dtype=float)
+    chg = np.asarray(chg, dtype=float)
+    buy = (rsi < rule.rsi_buy) | (chg > rule.chg_buy)
+    sell = (rsi > rule.rsi_sell) | (chg < rule.chg_sell)
+    return np.where(buy, 1, np.where(sell, -1, 0))
+
+
+def signal_label(rsi: float, chg: float, rule: SignalRule = DEFAULT_RULE) -> str:
+    return SIGNAL_LABELS[int(classify(rsi, chg, rule))]
+
+
+def rule_grid(rsi_buy: Iterable[float] = (25, 30, 35), rsi_sell: Iterable[float] = (65, 70, 75),
+              chg: Iterable[float] = (3, 5, 8), lookback: Iterable[int] = (21,)) -> List[SignalRule]:
+    """Simetrik getiri eşikli parametre varyantları (varsayılan 27 kural)."""
+    return [SignalRule(b, s, c, -c, lb) for b, s, c, lb in itertools.product(rsi_buy, rsi_sell, chg, lookback)]
+
+
+def _ffill_index(valid: np.ndarray) -> np.ndarray:
+    """Her hücre için son geçerli hücrenin zaman dizini (yoksa -1)."""
+    idx = np.where(valid, np.arange(valid.shape[-1]), -1)
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    return idx
+
+
+def positions(signals: np.ndarray) -> np.ndarray:
+    """Sinyallerden uzun/nakit pozisyon: son AL/SAT sinyali taşınır (TUT korur)."""
+    idx = _ffill_index(signals != 0)
+    last = np.take_along_axis(signals, np.maximum(idx, 0), axis=-1)
+    return np.where((idx >= 0) & (last > 0), 1.0, 0.0)
+
+
+def max_drawdown(returns: np.ndarray) -> np.ndarray:
+    """Getiri serilerinin (son eksen) en büyük düşüşü, negatif oran."""
+    equity = np.cumprod(1 + returns, axis=-1)
+    peak = np.maximum.accumulate(np.maximum(equity, 1.0), axis=-1)
+    return (equity / peak - 1).min(axis=-1) if returns.shape[-1] else np.zeros(returns.shape[:-1])
+
+
+class _Inputs(NamedTuple):
+    returns: np.ndarray      # (N, T) bar getirisi, ilk bar 0
+    forward: np.ndarray      # (N, T) HIT_HORIZON barlık ileri getiri, yoksa NaN
+    active: np.ndarray       # (N, T) fiyatı olan barlar
+
+
+def _prepare(closes: np.ndarray, horizon: int) -> _Inputs:
+    active = ~np.isnan(closes)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.zeros(closes.shape)
+        returns[:, 1:] = closes[:, 1:] / closes[:, :-1] - 1
+        forward = np.full(closes.shape, np.nan)
+        if closes.shape[1] > horizon:
+            forward[:, :-horizon] = closes[:, horizon:] / closes[:, :-horizon] - 1
+    returns[~np.isfinite(returns)] = 0.0
+    return _Inputs(returns, forward, active)
+
+
+def evaluate(rule: SignalRule, inputs: _Inputs, rsi_values: np.ndarray, chg_values: np.ndarray,
+             cost_bps: float = COST_BPS) -> Dict[str, Any]:
+    """Tek kuralın (N, T) üzerindeki metrikleri; hazır RSI/getiri matrisleriyle."""
+    ready = ~np.isnan(rsi_values) & ~np.isnan(chg_values)
+    signals = np.where(ready, classify(rsi_values, chg_values, rule), 0)
+    pos = positions(signals)
+
+    # t kapanışındaki pozisyon t+1 getirisini kazanır; değişimde maliyet ödenir
+    held = np.zeros(pos.shape)
+    held[:, 1:] = pos[:, :-1]
+    turnover = np.abs(np.diff(held, axis=1, prepend=0.0))
+    strat = held * inputs.returns - turnover * cost_bps / 10_000
+
+    fwd = inputs.forward
+    buys = (signals > 0) & ~np.isnan(fwd)
+    sells = (signals < 0) & ~np.isnan(fwd)
+    hits = int((buys & (fwd > 0)).sum() + (sells & (fwd < 0)).sum())
+    calls = int(buys.sum() + sells.sum())
+
+    total = np.prod(1 + strat, axis=1) - 1
+    hold = np.prod(1 + inputs.returns, axis=1) - 1
+    bars = max(1, int(inputs.active.sum(axis=1).max()))
+    portfolio = strat.mean(axis=0)          # eşit ağırlıklı sepet (günlük)
+    portfolio_total = float(np.prod(1 + portfolio) - 1)
+    return {
+        "rule": rule,
+        "hit_rate": hits / calls if calls else float("nan"),
+        "signals": calls,
+        "trades": int((np.diff(held, axis=1) > 0).sum()),
+        "exposure": float(held.sum() / max(1, inputs.active.sum())),
+        "mean_return": float(total.mean()),
+        "median_return": float(np.median(total)),
+        "buy_hold_return": float(hold.mean()),
+        "mean_drawdown": float(max_drawdown(strat).mean()),
+        "portfolio_return": portfolio_total,
+        "portfolio_cagr": float((1 + portfolio_total) ** (TRADING_DAYS / bars) - 1),
+        "portfolio_drawdown": float(max_drawdown(portfolio)),
+        "per_symbol_return": total,
+    }
+
+
+def backtest(closes: np.ndarray, rules: Optional[Sequence[SignalRule]] = None,
+             horizon: int = HIT_HORIZON, cost_bps: float = COST_BPS) -> List[Dict[str, Any]]:
+    """
+    (N, T) ileri doldurulmuş kapanışlar üzerinde kuralları değerlendirir.
+    RSI ve getiri matrisleri (rsi_period, lookback) başına bir kez hesaplanır.
+    Sonuçlar portföy getirisine göre azalan sıradadır.
+    """
+    closes = np.atleast_2d(np.asarray(closes, dtype=float))
+    rules = list(rules or [DEFAULT_RULE])
+    inputs = _prepare(closes, horizon)
+    rsi_cache: Dict[int, np.ndarray] = {}
+    chg_cache: Dict[int, np.ndarray] = {}
+    results = []
+    for rule in rules:
+        if rule.rsi_period not in rsi_cache:
+            rsi_cache[rule.rsi_period] = rsi_indicator(closes, rule.rsi_period)
+        if rule.lookback not in chg_cache:
+            chg = np.full(closes.shape, np.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                chg[:, rule.lookback:] = (closes[:, rule.lookback:] / closes[:, :-rule.lookback] - 1) * 100
+            chg_cache[rule.lookback] = chg
+        results.append(evaluate(rule, inputs, rsi_cache[rule.rsi_period], chg_cache[rule.lookback], cost_bps))
+    results.sort(key=lambda r: r["portfolio_return"], reverse=True)
+    return results
+
+
+def run_backtest(symbols: Sequence[str], period: str = BACKTEST_PERIOD,
+                 rules: Optional[Sequence[SignalRule]] = None, **kwargs) -> Dict[str, Any]:
+    """
+    Sembollerin günlük kapanışlarını fiyat deposundan (gerekirse derinleştirerek)
+    hizalı matris olarak okur ve kuralları değerlendirir.
+    """
+    from tools.price_matrix import load_matrix
+    from tools.price_store import get_price_store
+
+    started = time.perf_counter()
+    get_price_store().ensure_depth(symbols, period)
+    matrix = load_matrix(symbols, "Close", period=period, ffill=True)
+    has_data = ~np.isnan(matrix.values).all(axis=1) if matrix.values.size else np.zeros(len(symbols), bool)
+    closes = np.asarray(matrix.values[has_data])
+    results = backtest(closes, rules, **kwargs) if closes.size else []
+    return {
+        "symbols": [s for s, ok in zip(matrix.symbols, has_data) if ok],
+        "bars": closes.shape[1] if closes.size else 0,
+        "results": results,
+        "elapsed": time.perf_counter() - started,
+    }
@@ -0,0 +1,68 @@
+"""
+Batch Market Data
+=================
+Helpers for batched downloads (yf.download) and vectorized return ranking.
+
+Fiyat deposu (tools.price_store) toplu güncellemelerde geniş tabloyu
+_split_frame ile sembollere böler; sektör taraması ve screener depodaki
+hizalı matrisleri (tools.price_matrix) okur ve rank_by_return ile sıralar.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+# Tek istekte indirilecek en fazla sembol (BIST evreni için parçalama)
+BATCH_CHUNK_SIZE = 100
+
+
+def _split_frame(df: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """group_by='ticker' ile gelen geniş tabloyu sembol bazında ayırır."""
+    if df is None or df.empty:
+        return {}
+    if not isinstance(df.columns, pd.MultiIndex):
+        # Tek sembol bazı sürümlerde düz sütunlarla döner
+        return {symbols[0]: df} if len(symbols) == 1 else {}
+
+    present = set(df.columns.get_level_values(0))
+    return {
+        sym: df[sym].dropna(subset=["Close"])
+        for sym in symbols if sym in present
+    }
+
+
+def period_returns(closes: pd.DataFrame) -> pd.Series:
+    """Her sütun için ilk ve son geçerli kapanış arası yüzde değişim (vektörel)."""
+    if closes.empty:
+        return pd.Series(dtype=float, index=closes.columns)
+    values = closes.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    has_data = valid.any(axis=0)
+    first_idx = valid.argmax(axis=0)
+    last_idx = len(values) - 1 - valid[::-1].argmax(axis=0)
+    cols = np.arange(values.shape[1])
+    first = values[first_idx, cols]
+    last = values[last_idx, cols]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chg = (last - first) / first * 100
+    return pd.Series(np.where(has_data, chg, np.nan), index=closes.columns)
+
+
+def last_prices(closes: pd.DataFrame) -> pd.Series:
+    """Her sütunun son geçerli kapanışı."""
+    return closes.ffill().iloc[-1]
+
+
+def rank_by_return(closes: pd.DataFrame) -> pd.DataFrame:
+    """Sembolleri dönem getirisine göre azalan sırada döndürür (p, chg sütunları)."""
+    if closes.empty:
+        return pd.DataFrame(columns=["p", "chg"])
+    chg = period_returns(closes).to_numpy()
+    order = np.argsort(-np.nan_to_num(chg, nan=-np.inf), kind="stable")
+    order = order[~np.isnan(chg[order])]
+    return pd.DataFrame({
+        "p": last_prices(closes).to_numpy()[order],
+        "chg": chg[order],
+    }, index=closes.columns[order])
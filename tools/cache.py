@@ -0,0 +1,192 @@
+"""
+Market Data Cache
+=================
+Process-wide TTL + LRU cache for yfinance price history.
+
+Aynı ajan çalışmasında aynı sembol birden fazla tool tarafından istenir
+(analyze_stock, compare, build_portfolio...). Bu katman (symbol, period,
+interval) anahtarıyla geçmiş veriyi bellekte tutar; piyasa açıkken kısa,
+kapanıştan sonra uzun TTL kullanır.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, time as dtime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+
+# Kalıcı önbellek dosyaları (alias, fundamentals, fiyat deposu) bu dizine yazılır
+CACHE_DIR = os.getenv(
+    "YATIRIM_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+)
+
+# Piyasa açıkken veri dakikalar içinde değişir, kapalıyken değişmez
+CACHE_TTL_OPEN = 60          # saniye
+CACHE_TTL_CLOSED = 3600      # saniye
+CACHE_TTL_EMPTY = 30         # boş sonuçlar (geçersiz sembol) kısa süre tutulur
+HISTORY_CACHE_SIZE = 512     # LRU kapasitesi (anahtar sayısı)
+# Günlük barlarda kısa pencereler, önbellekteki daha geniş pencerenin son N barıdır
+SLICEABLE_PERIODS = {"1d": 1, "5d": 5}
+WIDER_PERIODS = ("1mo", "3mo", "6mo", "1y")
+TICKER_CACHE_SIZE = 256
+TICKER_TTL = 24 * 3600       # yf.Ticker nesneleri (oturum + meta veri) yeniden kullanılır
+
+# Piyasa saatleri: (timezone, açılış, kapanış)
+MARKET_HOURS = {
+    "BIST": (ZoneInfo("Europe/Istanbul"), dtime(10, 0), dtime(18, 10)),
+    "US": (ZoneInfo("America/New_York"), dtime(9, 30), dtime(16, 0)),
+}
+
+
+# =============================================================================
+# GENERIC TTL + LRU CACHE
+# =============================================================================
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and hit/miss counters."""
+
+    def __init__(self, maxsize: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value). Expired entries count as a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._data[key]
+            self.misses += 1
+            return False, None
+
+    def peek(self, key: Hashable) -> Tuple[bool, Any]:
+        """get() gibi, ama sayaçları ve LRU sırasını değiştirmez."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > self._clock():
+                return True, entry[1]
+            return False, None
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+# =============================================================================
+# MARKET HOURS
+# =============================================================================
+def market_for_symbol(symbol: str) -> str:
+    """Sembolün işlem gördüğü piyasayı tahmin eder."""
+    s = symbol.upper()
+    if s.endswith(".IS"):
+        return "BIST"
+    if s.endswith("-USD"):
+        return "CRYPTO"
+    if s.endswith("=F") or s.endswith("=X"):
+        return "GLOBAL"
+    if s.startswith("^") and s not in ("^GSPC", "^IXIC", "^DJI"):
+        return "GLOBAL"
+    return "US"
+
+
+def is_market_open(market: str, now: Optional[datetime] = None) -> bool:
+    """Piyasa şu an açık mı? Kripto 7/24, vadeli/döviz hafta içi 24 saat."""
+    if market == "CRYPTO":
+        return True
+    now = now or datetime.now(tz=ZoneInfo("UTC"))
+    if market == "GLOBAL":
+        return now.weekday() < 5
+    tz, open_t, close_t = MARKET_HOURS[market]
+    local = now.astimezone(tz)
+    return local.weekday() < 5 and open_t <= local.time() <= close_t
+
+
+def history_ttl(symbol: str, now: Optional[datetime] = None) -> int:
+    """Sembolün piyasası açıksa kısa, kapalıysa uzun TTL döndürür."""
+    return CACHE_TTL_OPEN if is_market_open(market_for_symbol(symbol), now) else CACHE_TTL_CLOSED
+
+
+# =============================================================================
+# HISTORY CACHE
+# =============================================================================
+HISTORY_CACHE = TTLCache(maxsize=HISTORY_CACHE_SIZE)
+TICKER_CACHE = TTLCache(maxsize=TICKER_CACHE_SIZE)
+
+
+def get_ticker(symbol: str):
+    """Sembol başına tek yf.Ticker nesnesi (history ve .info aynı nesneyi kullanır)."""
+    found, t = TICKER_CACHE.get(symbol)
+    if not found:
+        import yfinance as yf
+        t = yf.Ticker(symbol)
+        TICKER_CACHE.set(symbol, t, TICKER_TTL)
+    return t
+
+
+def get_history(symbol: str, period: str = "1mo", interval: str = "1d"):
+    """
+    yf.Ticker(symbol).history(...) için önbellekli erişim.
+    Bellek önbelleği → yerel fiyat deposu → veri sağlayıcı (tools.market_data) sırasıyla denenir.
+    Dönen DataFrame paylaşımlıdır, çağıran taraf değiştirmemelidir.
+    """
+    key = (symbol, period, interval)
+    found, h = HISTORY_CACHE.get(key)
+    if found:
+        return h
+
+    # "5d" / "1d" günlük istekleri önbellekteki geniş pencereden kesilir
+    if interval == "1d" and period in SLICEABLE_PERIODS:
+        for wider in WIDER_PERIODS:
+            found, wide = HISTORY_CACHE.peek((symbol, wider, interval))
+            if found and not wide.empty:
+                return wide.tail(SLICEABLE_PERIODS[period])
+
+    from tools.price_store import get_price_store, period_supported
+    if period_supported(period, interval):
+        # Yerel depo: yalnızca son bardan sonrası indirilir, pencere diskten kesilir
+        h = get_price_store().history(symbol, period, interval)
+    else:
+        from tools.market_data import get_provider
+        h = get_provider().history(symbol, interval=interval, period=period)
+    HISTORY_CACHE.set(key, h, CACHE_TTL_EMPTY if h.empty else history_ttl(symbol))
+    return h
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Önbellek istatistikleri (hit/miss, boyut)."""
+    return {"history": HISTORY_CACHE.stats(), "tickers": TICKER_CACHE.stats()}
@@ -0,0 +1,131 @@
+"""
+Message History Compaction
+==========================
+Caps the prompt sent to the agent LLM on each iteration.
+
+agent_node her turda tüm mesaj geçmişini gönderir; ham tool JSON'ları her
+döngüde birikir. Bu katman LLM çağrısından önce geçmişin kısaltılmış bir
+kopyasını üretir (state'teki mesajlar değişmez):
+1. Modelin rapor için kullanmadığı alanlar (TOOL_UNUSED_FIELDS) tüm tool
+   çıktılarından atılır.
+2. Son tur dışındaki tool çıktılarında uzun metinler MAX_FIELD_CHARS,
+   listeler MAX_LIST_ITEMS ile kırpılır.
+3. Tahmini boyut hâlâ COMPACT_TOKEN_BUDGET'ı aşıyorsa en eski tool
+   çıktılarından başlayarak tek satırlık özetlere indirilir.
+Mesajlar silinmez; her tool_call'ın ToolMessage eşi korunur.
+
+Sistem istemi olduğu gibi gönderilir: sabit önek, sağlayıcı tarafı prompt
+önbelleğinden yararlanır. Token sayısı karakter/CHARS_PER_TOKEN ile tahmin edilir.
+"""
+
+import json
+import os
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Sequence
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+
+COMPACT_TOKEN_BUDGET = int(os.getenv("COMPACT_TOKEN_BUDGET", "6000"))
+CHARS_PER_TOKEN = 4          # kaba tahmin; tokenizer indirmeden çalışır
+MAX_FIELD_CHARS = 300        # eski tool çıktılarında metin alanı sınırı
+MAX_LIST_ITEMS = 5
+SUMMARY_CHARS = 240          # bütçe aşılınca tool çıktısının tek satır özeti
+# Raporda kullanılmayan alanlar (bağlantılar, ham skorlar, kurulum notları)
+TOOL_UNUSED_FIELDS: Dict[str, FrozenSet[str]] = {
+    "get_news": frozenset({"headline_scores", "urls", "note", "source"}),
+    "web_search": frozenset({"source_url"}),
+}
+
+
+def estimate_tokens(messages: Sequence[Any]) -> int:
+    """Mesaj listesinin tahmini token sayısı (içerik + tool çağrısı argümanları)."""
+    chars = 0
+    for m in messages:
+        content = getattr(m, "content", m)
+        chars += len(content) if isinstance(content, str) else len(json.dumps(content, ensure_ascii=False, default=str))
+        tool_calls = getattr(m, "tool_calls", None)
+        if tool_calls:
+            chars += len(json.dumps([(tc["name"], tc["args"]) for tc in tool_calls], ensure_ascii=False, default=str))
+    return chars // CHARS_PER_TOKEN
+
+
+def _trim(value: Any) -> Any:
+    if isinstance(value, str):
+        return value if len(value) <= MAX_FIELD_CHARS else value[:MAX_FIELD_CHARS] + "…"
+    if isinstance(value, dict):
+        return {k: _trim(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_trim(v) for v in value[:MAX_LIST_ITEMS]]
+    return value
+
+
+def _summary(name: str, payload: Any) -> str:
+    """Yalnızca sayı/metin alanlarından tek satırlık özet."""
+    if isinstance(payload, dict):
+        fields = ", ".join(f"{k}={v}" for k, v in payload.items()
+                           if isinstance(v, (str, int, float)) and not isinstance(v, bool))
+    else:
+        fields = " ".join(str(payload).split())
+    text = f"[özet] {name}: {fields}"
+    return text if len(text) <= SUMMARY_CHARS else text[:SUMMARY_CHARS] + "…"
+
+
+def _load(message: ToolMessage) -> Any:
+    try:
+        return json.loads(message.content)
+    except (TypeError, ValueError):
+        return message.content
+
+
+def _dump(payload: Any) -> str:
+    return payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+
+
+class Compaction(NamedTuple):
+    """compact_messages çıktısı: gönderilecek mesajlar ve tahmini token sayıları."""
+    messages: List[Any]
+    before: int
+    after: int
+
+    @property
+    def saved(self) -> int:
+        return self.before - self.after
+
+
+def compact_messages(messages: Sequence[Any], budget: int = COMPACT_TOKEN_BUDGET) -> Compaction:
+    """LLM'e gönderilecek mesajların kısaltılmış kopyası; girdi listesi değiştirilmez."""
+    messages = list(messages)
+    before = estimate_tokens(messages)
+
+    # Son tool turu: son tool_calls'lı AIMessage'dan sonraki ToolMessage'lar tam kalır
+    latest = 0
+    for i, m in enumerate(messages):
+        if isinstance(m, AIMessage) and m.tool_calls:
+            latest = i
+
+    older: List[int] = []
+    for i, m in enumerate(messages):
+        if not isinstance(m, ToolMessage):
+            continue
+        payload = _load(m)
+        unused = TOOL_UNUSED_FIELDS.get(m.name or "", frozenset())
+        if isinstance(payload, dict) and unused:
+            payload = {k: v for k, v in payload.items() if k not in unused}
+        if i < latest:
+            payload = _trim(payload)
+            older.append(i)
+        content = _dump(payload)
+        if content != m.content:
+            messages[i] = m.model_copy(update={"content": content})
+
+    # Bütçe hâlâ aşılıyorsa en eski tool çıktılarını özetle
+    after = estimate_tokens(messages)
+    for i in older:
+        if after <= budget:
+            break
+        m = messages[i]
+        summary = _summary(m.name or "tool", _load(m))
+        after -= (len(m.content) - len(summary)) // CHARS_PER_TOKEN
+        messages[i] = m.model_copy(update={"content": summary})
+
+    return Compaction(messages, before, estimate_tokens(messages))
@@ -0,0 +1,126 @@
+"""
+Feed Cache
+==========
+Conditional-GET cache for RSS feeds (Google News).
+
+Aynı varlık için ("altın", "bitcoin") feed dakikada onlarca kez istenir.
+Ayrıştırılmış feed ETag/Last-Modified ile birlikte saklanır:
+- FEED_FRESH_TTL içinde ağa hiç çıkılmadan bellekten döner,
+- sonrasında If-None-Match / If-Modified-Since ile yeniden doğrulanır;
+  304 gelirse eldeki kopya tazelenir, feed yeniden indirilmez/ayrıştırılmaz.
+"""
+
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+import feedparser
+
+from tools.cache import TTLCache
+from tools.http import HTTP_TIMEOUT, get_async_client, get_session
+
+
+FEED_FRESH_TTL = 300         # saniye; bu süre içinde yeniden doğrulama yapılmaz
+FEED_STALE_TTL = 24 * 3600   # doğrulayıcılar (ETag) bu süre boyunca tutulur
+FEED_CACHE_SIZE = 256
+
+
+class FeedEntry(NamedTuple):
+    feed: Any                # feedparser.FeedParserDict
+    etag: Optional[str]
+    modified: Optional[str]
+    fetched_at: float
+
+
+class FeedCache:
+    """In-memory feed cache with freshness window and conditional revalidation."""
+
+    def __init__(self, fresh_ttl: float = FEED_FRESH_TTL, maxsize: int = FEED_CACHE_SIZE,
+                 clock: Callable[[], float] = time.monotonic):
+        self.fresh_ttl = fresh_ttl
+        self._clock = clock
+        self._entries = TTLCache(maxsize=maxsize, clock=clock)
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+
+    def _lookup(self, url: str):
+        found, entry = self._entries.get(url)
+        if found and self._clock() - entry.fetched_at < self.fresh_ttl:
+            self.fresh_hits += 1
+            return entry, True
+        return (entry if found else None), False
+
+    @staticmethod
+    def _conditional_headers(entry: Optional[FeedEntry]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.modified:
+                headers["If-Modified-Since"] = entry.modified
+        return headers
+
+    def _store(self, url: str, entry: Optional[FeedEntry], status: int,
+               headers: Any, content: bytes):
+        """Yanıtı işler ve kullanılacak feed'i döndürür."""
+        if status == 304 and entry is not None:
+            self.revalidated += 1
+            entry = entry._replace(fetched_at=self._clock())
+            self._entries.set(url, entry, FEED_STALE_TTL)
+            return entry.feed
+        self.downloads += 1
+        feed = feedparser.parse(content)
+        if status == 200 and feed.entries:
+            self._entries.set(url, FeedEntry(
+                feed, headers.get("ETag"), headers.get("Last-Modified"), self._clock()
+            ), FEED_STALE_TTL)
+        elif entry is not None:
+            return entry.feed        # hata/boş yanıt: eski kopya yenisinden iyidir
+        return feed
+
+    @staticmethod
+    def _on_error(url: str, entry: Optional[FeedEntry], error: Exception):
+        """Ağ hatası: varsa eski kopya, yoksa feedparser gibi boş (bozo) feed."""
+        print(f"[FeedCache] {url[:60]} alınamadı: {error}")
+        if entry is not None:
+            return entry.feed
+        feed = feedparser.parse(b"")
+        feed["bozo_exception"] = error
+        return feed
+
+    def get(self, url: str):
+        """Feed'i döndürür (taze kopya, 304 ile doğrulanmış kopya veya yeni indirme)."""
+        entry, fresh = self._lookup(url)
+        if fresh:
+            return entry.feed
+        try:
+            response = get_session().get(url, headers=self._conditional_headers(entry), timeout=HTTP_TIMEOUT)
+        except Exception as e:
+            return self._on_error(url, entry, e)
+        return self._store(url, entry, response.status_code, response.headers, response.content)
+
+    async def aget(self, url: str):
+        """get() ile aynı, paylaşılan httpx istemcisiyle."""
+        entry, fresh = self._lookup(url)
+        if fresh:
+            return entry.feed
+        try:
+            response = await get_async_client().get(url, headers=self._conditional_headers(entry))
+        except Exception as e:
+            return self._on_error(url, entry, e)
+        return self._store(url, entry, response.status_code, response.headers, response.content)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.fresh_hits = self.revalidated = self.downloads = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "fresh_hits": self.fresh_hits,
+            "revalidated": self.revalidated,
+            "downloads": self.downloads,
+        }
+
+
+FEED_CACHE = FeedCache()
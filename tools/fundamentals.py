@@ -0,0 +1,171 @@
+"""
+Fundamentals Cache
+==================
+Day-granularity cache for yf.Ticker(symbol).info.
+
+.info en yavaş yfinance çağrısıdır ama içerdiği veriler (P/E, P/B,
+piyasa değeri, isim, para birimi) en fazla günde bir değişir. Kayıtlar
+İstanbul takvim günü boyunca geçerlidir, SQLite'a yazılır ve açılışta
+belleğe yüklenir; tool'lar yalnızca bellekten okur.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from tools.cache import CACHE_DIR
+from tools.market_data import get_provider
+
+
+FUNDAMENTALS_DB_FILE = "fundamentals.db"
+WARMUP_WORKERS = 4
+WARMUP_INTERVAL = 3600       # saniye; yalnızca bayatlamış semboller yeniden çekilir
+
+# .info içinden saklanan alanlar (tamamı ~150 alan, tool'lar bunları kullanır)
+FUNDAMENTAL_FIELDS = (
+    "shortName", "longName", "currency", "sector", "industry",
+    "marketCap", "trailingPE", "forwardPE", "priceToBook",
+    "returnOnEquity", "dividendYield",
+)
+
+
+def _istanbul_today() -> str:
+    return datetime.now(tz=ZoneInfo("Europe/Istanbul")).strftime("%Y-%m-%d")
+
+
+class FundamentalsCache:
+    """In-memory fundamentals keyed by symbol, persisted to SQLite, valid for one day."""
+
+    def __init__(self, path: str, today: Callable[[], str] = _istanbul_today):
+        self.path = path
+        self._today = today
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fundamentals (
+                symbol     TEXT PRIMARY KEY,
+                data       TEXT NOT NULL,
+                day        TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self._mem: Dict[str, Tuple[str, Dict[str, Any]]] = {
+            symbol: (day, json.loads(data))
+            for symbol, data, day in self._conn.execute("SELECT symbol, data, day FROM fundamentals")
+        }
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Bugün çekilmiş kayıt varsa döndürür, yoksa None."""
+        entry = self._mem.get(symbol)
+        if entry is not None and entry[0] == self._today():
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def is_fresh(self, symbol: str) -> bool:
+        entry = self._mem.get(symbol)
+        return entry is not None and entry[0] == self._today()
+
+    def put(self, symbol: str, info: Dict[str, Any]) -> Dict[str, Any]:
+        """Ham .info sözlüğünden FUNDAMENTAL_FIELDS alanlarını saklar."""
+        data = {k: info[k] for k in FUNDAMENTAL_FIELDS if info.get(k) is not None}
+        day = self._today()
+        with self._lock:
+            self._mem[symbol] = (day, data)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fundamentals (symbol, data, day, fetched_at) VALUES (?, ?, ?, ?)",
+                (symbol, json.dumps(data, ensure_ascii=False), day, time.time())
+            )
+            self._conn.commit()
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._conn.execute("DELETE FROM fundamentals")
+            self._conn.commit()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._mem), "hits": self.hits, "misses": self.misses}
+
+
+_cache: Optional[FundamentalsCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_fundamentals_cache() -> FundamentalsCache:
+    """Süreç genelinde tek FundamentalsCache (ilk kullanımda açılır)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FundamentalsCache(os.path.join(CACHE_DIR, FUNDAMENTALS_DB_FILE))
+    return _cache
+
+
+def _fetch_info(symbol: str) -> Dict[str, Any]:
+    return get_provider().info(symbol)
+
+
+def get_info(symbol: str) -> Dict[str, Any]:
+    """
+    Sembolün temel verileri. Bugün çekildiyse bellekten döner,
+    değilse .info çağrılıp önbelleğe yazılır. Hatalar çağırana iletilir.
+    """
+    cache = get_fundamentals_cache()
+    data = cache.get(symbol)
+    if data is not None:
+        return data
+    return cache.put(symbol, _fetch_info(symbol))
+
+
+def refresh(symbols: Iterable[str], workers: int = WARMUP_WORKERS) -> int:
+    """Bayatlamış sembollerin .info verisini paralel yeniler. Yenilenen sayısını döndürür."""
+    cache = get_fundamentals_cache()
+    stale = [s for s in dict.fromkeys(symbols) if not cache.is_fresh(s)]
+    if not stale:
+        return 0
+
+    def _one(symbol: str) -> bool:
+        try:
+            cache.put(symbol, _fetch_info(symbol))
+            return True
+        except Exception as e:
+            print(f"[Fundamentals] {symbol} yenilenemedi: {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        done = sum(pool.map(_one, stale))
+    print(f"[Fundamentals] {done}/{len(stale)} sembol yenilendi")
+    return done
+
+
+def start_warmup(symbols: List[str], interval: float = WARMUP_INTERVAL) -> threading.Thread:
+    """
+    İzleme listesini arka planda ısıtır ve her `interval` saniyede bir
+    gün dönümünü kontrol ederek bayatlayanları yeniler (istek yolunun dışında).
+    """
+    def _loop():
+        while True:
+            try:
+                refresh(symbols)
+            except Exception as e:
+                print(f"[Fundamentals] Warm-up hatası: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=_loop, name="fundamentals-warmup", daemon=True)
+    thread.start()
+    return thread
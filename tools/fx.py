@@ -0,0 +1,157 @@
+"""
+FX Engine
+=========
+Cross-rate matrix for currency pairs from a single batched base-set fetch.
+
+Her parite için ayrı `{pair}=X` isteği yerine küçük bir USD çapraz seti
+(USDTRY, USDEUR, USDGBP...) fiyat deposundan tek toplu indirmeyle
+güncellenir ve hizalı bir matrise okunur. Herhangi bir A/B paritesi bu
+vektörden üçgenleme ile türetilir:
+    A/B = (B/USD) / (A/USD)
+Matris, piyasa TTL'i (history_ttl) boyunca bellekte tutulur; "döviz kurları"
+yanıtı tek indirme ile karşılanır.
+"""
+
+import re
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from tools.cache import history_ttl
+from tools.price_matrix import load_matrix
+
+
+FX_QUOTE = "USD"
+FX_BASES = ("TRY", "EUR", "GBP", "JPY", "CHF", "CAD", "AUD", "CNY", "RUB", "SAR", "AED")
+FX_PERIOD = "5d"             # değişim yüzdesi bu pencerenin ilk barına göre
+FX_DEFAULT_PAIRS = ("USDTRY", "EURTRY", "GBPTRY", "EURUSD")
+
+_PAIR_RE = re.compile(r"^([A-Z]{3})/?([A-Z]{3})(=X)?$")
+
+
+def parse_pair(pair: str) -> Optional[Tuple[str, str]]:
+    """"usdtry", "USD/TRY", "USDTRY=X" → ("USD", "TRY"); tanınmazsa None."""
+    m = _PAIR_RE.match((pair or "").strip().upper())
+    return (m.group(1), m.group(2)) if m else None
+
+
+def split_pairs(pairs) -> List[str]:
+    """Virgül/boşluk ayrılmış metin veya liste → sıralı, tekrarsız parite adları."""
+    if isinstance(pairs, str):
+        pairs = [pairs]
+    names = [p.strip().upper() for item in pairs or [] for p in re.split(r"[,;\s]+", item or "")]
+    return list(dict.fromkeys(p for p in names if p))
+
+
+class RateMatrix(NamedTuple):
+    """Birim / USD kurları; son ve pencere başı değerleri."""
+    currencies: List[str]        # USD ilk sırada
+    last: np.ndarray             # (N,) 1 USD kaç birim (son bar), yoksa NaN
+    first: np.ndarray            # (N,) FX_PERIOD penceresinin ilk barı
+    asof: Optional[str]          # son barın tarihi
+    updated_at: float
+
+    def cross(self) -> np.ndarray:
+        """(N, N) kur matrisi: [i, j] = 1 birim i kaç birim j."""
+        return self.last[None, :] / self.last[:, None]
+
+    def quote(self, base: str, quote: str) -> Optional[Tuple[float, float]]:
+        """(kur, FX_PERIOD değişimi %); bacaklardan biri yoksa None."""
+        try:
+            i, j = self.currencies.index(base), self.currencies.index(quote)
+        except ValueError:
+            return None
+        rate = self.last[j] / self.last[i]
+        start = self.first[j] / self.first[i]
+        if not np.isfinite(rate) or not np.isfinite(start) or start <= 0:
+            return None
+        return float(rate), float((rate / start - 1) * 100)
+
+
+def build_matrix(bases=FX_BASES) -> RateMatrix:
+    """USD çaprazlarını depodan (bayatsa tek toplu indirmeyle) hizalı matrise okur."""
+    symbols = [f"{FX_QUOTE}{c}=X" for c in bases]
+    matrix = load_matrix(symbols, "Close", period=FX_PERIOD, ffill=True)
+    values = np.asarray(matrix.values)
+    n = len(symbols)
+    last, first = np.full(n + 1, np.nan), np.full(n + 1, np.nan)
+    last[0] = first[0] = 1.0
+    if values.size:
+        # ffill sonrası NaN'lar yalnızca baştadır: ilk geçerli bar = baştaki NaN sayısı
+        lead = np.minimum(np.isnan(values).sum(axis=1), values.shape[1] - 1)
+        last[1:] = values[:, -1]
+        first[1:] = values[np.arange(n), lead]
+    asof = str(matrix.index[-1].date()) if len(matrix.index) else None
+    return RateMatrix([FX_QUOTE, *bases], last, first, asof, time.time())
+
+
+class FXEngine:
+    """Holds the cached rate matrix and refreshes it once per market TTL."""
+
+    def __init__(self, bases=FX_BASES, ttl: Optional[float] = None):
+        self.bases = tuple(bases)
+        self._ttl = ttl
+        self._matrix: Optional[RateMatrix] = None
+        self._lock = threading.Lock()
+        self.refreshes = 0
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else history_ttl(f"{FX_QUOTE}{self.bases[0]}=X")
+
+    def supports(self, pair: str) -> bool:
+        legs = parse_pair(pair)
+        return legs is not None and all(c == FX_QUOTE or c in self.bases for c in legs)
+
+    def refresh(self) -> RateMatrix:
+        """Matrisi yeniden kurar; eşzamanlı çağrılar tek yenilemeyi bekler."""
+        started = time.time()
+        with self._lock:
+            if self._matrix is not None and self._matrix.updated_at >= started:
+                return self._matrix
+            self._matrix = build_matrix(self.bases)
+            self.refreshes += 1
+            return self._matrix
+
+    def matrix(self) -> RateMatrix:
+        m = self._matrix
+        if m is None or time.time() - m.updated_at > self.ttl:
+            m = self.refresh()
+        return m
+
+    def is_fresh(self) -> bool:
+        m = self._matrix
+        return m is not None and time.time() - m.updated_at <= self.ttl
+
+    def quote(self, pair: str) -> Optional[Dict]:
+        """Tek parite; matristen türetilemiyorsa None (çağıran doğrudan sorgular)."""
+        if not self.supports(pair):
+            return None
+        base, quote = parse_pair(pair)
+        m = self.matrix()
+        found = m.quote(base, quote)
+        if found is None:
+            return None
+        rate, chg = found
+        return {"pair": base + quote, "rate": round(rate, 2 if rate >= 10 else 4), "chg": f"{chg:+.2f}%"}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._matrix = None
+            self.refreshes = 0
+
+
+_engine: Optional[FXEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_fx_engine() -> FXEngine:
+    """Süreç genelinde tek FXEngine."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = FXEngine()
+    return _engine
@@ -0,0 +1,131 @@
+"""
+HTTP Clients
+============
+Pooled HTTP clients shared by the tools: a keep-alive requests.Session
+for the sync paths, an httpx.Client for sync SDKs (LLM clients) and an
+httpx.AsyncClient for the async variants.
+
+httpx.AsyncClient bir event loop'a bağlıdır; istemciler loop başına bir
+kez kurulur ve o loop içindeki tüm tool çağrıları bağlantıları yeniden
+kullanır. Bot tüm webhook'ları tek, uzun ömürlü loop'ta işler
+(tools.parallel.BackgroundLoop) ve kapanışta aclose_async_client çağrılır.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+
+HTTP_TIMEOUT = 10.0
+HTTP_MAX_CONNECTIONS = 50
+HTTP_KEEPALIVE_CONNECTIONS = 20
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+# Sayfa gövdesi bu kadar bayttan sonra okunmaz; metnin ilk 1500 karakteri başta yer alır
+PAGE_BYTE_CAP = 256 * 1024
+CHUNK_SIZE = 16 * 1024
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Süreç genelinde paylaşılan keep-alive requests.Session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers["User-Agent"] = USER_AGENT
+                adapter = HTTPAdapter(pool_connections=HTTP_KEEPALIVE_CONNECTIONS,
+                                      pool_maxsize=HTTP_KEEPALIVE_CONNECTIONS)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def fetch_page(url: str, max_bytes: int = PAGE_BYTE_CAP, timeout: float = HTTP_TIMEOUT) -> Optional[bytes]:
+    """
+    Sayfayı akış halinde indirir, max_bytes'a ulaşınca bağlantıyı bırakır.
+    200 dışı yanıtlarda None döner; ağ hataları çağırana iletilir.
+    """
+    with get_session().get(url, timeout=timeout, stream=True) as response:
+        if response.status_code != 200:
+            return None
+        buf = bytearray()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            buf += chunk
+            if len(buf) >= max_bytes:
+                break
+        return bytes(buf[:max_bytes])
+
+
+def get_client(timeout: float = HTTP_TIMEOUT) -> httpx.Client:
+    """
+    Süreç genelinde paylaşılan keep-alive httpx.Client (senkron SDK'lar için,
+    ör. LLM istemcileri). İlk çağrının timeout'u kullanılır.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        with _client_lock:
+            if _client is None or _client.is_closed:
+                _client = httpx.Client(
+                    timeout=timeout,
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS,
+                    ),
+                )
+    return _client
+
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_async_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Çalışan event loop için paylaşılan keep-alive httpx.AsyncClient."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        with _async_lock:
+            client = _async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    timeout=HTTP_TIMEOUT,
+                    follow_redirects=True,
+                    headers={"User-Agent": USER_AGENT},
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS,
+                    ),
+                )
+                _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_client() -> None:
+    """Mevcut loop'un istemcisini kapatır (loop kapanmadan önce çağrılmalı)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def afetch_page(url: str, max_bytes: int = PAGE_BYTE_CAP) -> Optional[bytes]:
+    """fetch_page'in async karşılığı (paylaşılan httpx istemcisiyle)."""
+    async with get_async_client().stream("GET", url) as response:
+        if response.status_code != 200:
+            return None
+        buf = bytearray()
+        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+            buf += chunk
+            if len(buf) >= max_bytes:
+                break
+        return bytes(buf[:max_bytes])
@@ -0,0 +1,212 @@
+"""
+Technical Indicators
+====================
+NumPy-vectorized indicators for one symbol or many at once.
+
+Tüm fonksiyonlar zaman eksenini SON eksen kabul eder:
+- Tek sembol: shape (T,)
+- Çok sembol: shape (N, T)  → tek geçişte N sembol hesaplanır
+Başlangıçtaki yetersiz pencereler NaN döner. Eksik veriler (NaN) önceki
+değer taşınarak atlanır.
+"""
+
+import warnings
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _as_float(x) -> np.ndarray:
+    return np.asarray(x, dtype=float)
+
+
+def _smooth_blocks(x: np.ndarray, alpha: float, prev: np.ndarray) -> np.ndarray:
+    """
+    NaN içermeyen seri için kapalı form:
+    y[k] = (1-a)^(k+1) * prev + a * sum_j (1-a)^(k-j) * x[j]
+    (1-a)^-L taşmasın diye seri bloklara bölünür, her blok tek cumsum.
+    """
+    decay = 1.0 - alpha
+    block = max(1, int(np.log(1e6) / -np.log(decay))) if 0 < decay < 1 else x.shape[-1]
+    out = np.empty(x.shape)
+    for b in range(0, x.shape[-1], block):
+        chunk = x[..., b:b + block]
+        k = np.arange(chunk.shape[-1])
+        acc = np.cumsum(chunk * decay ** -k, axis=-1) * decay ** k
+        out[..., b:b + block] = decay ** (k + 1) * prev[..., None] + alpha * acc
+        prev = out[..., b + chunk.shape[-1] - 1]
+    return out
+
+
+def _recursive_smooth(x: np.ndarray, alpha: float, start: int = 0,
+                      seed: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    y[t] = y[t-1] + alpha * (x[t] - y[t-1])
+    start'tan önceki değerler NaN; seed verilmezse ilk geçerli değerle başlar.
+    NaN yoksa blok kapalı formu, varsa zaman ekseninde döngü kullanılır
+    (döngü semboller üzerinde yine vektöreldir).
+    """
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] <= start:
+        return out
+    tail = x[..., start:]
+    if seed is None and not np.isnan(tail).any():
+        out[..., start] = tail[..., 0]
+        out[..., start + 1:] = _smooth_blocks(tail[..., 1:], alpha, tail[..., 0])
+        return out
+    if seed is not None and not np.isnan(tail).any() and not np.isnan(seed).any():
+        out[..., start:] = _smooth_blocks(tail, alpha, np.asarray(seed, dtype=float))
+        return out
+
+    prev = np.full(x.shape[:-1], np.nan) if seed is None else np.array(seed, dtype=float)
+    for t in range(start, x.shape[-1]):
+        xt = x[..., t]
+        smoothed = prev + alpha * (xt - prev)
+        prev = np.where(np.isnan(prev), xt, np.where(np.isnan(xt), prev, smoothed))
+        out[..., t] = prev
+    return out
+
+
+# =============================================================================
+# MOVING AVERAGES
+# =============================================================================
+def sma(x, window: int) -> np.ndarray:
+    """Basit hareketli ortalama."""
+    x = _as_float(x)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        out[..., window - 1:] = sliding_window_view(x, window, axis=-1).mean(axis=-1)
+    return out
+
+
+def ema(x, span: int) -> np.ndarray:
+    """Üssel hareketli ortalama (alpha = 2 / (span + 1))."""
+    return _recursive_smooth(_as_float(x), 2.0 / (span + 1))
+
+
+def wilder(x, period: int) -> np.ndarray:
+    """Wilder yumuşatması: ilk değer ilk `period` elemanın ortalaması, sonra alpha = 1/period."""
+    x = _as_float(x)
+    if x.shape[-1] < period:
+        return np.full(x.shape, np.nan)
+    with warnings.catch_warnings():
+        # Tamamen NaN olan satırlar için "Mean of empty slice" uyarısı
+        warnings.simplefilter("ignore", RuntimeWarning)
+        seed = np.nanmean(x[..., :period], axis=-1)
+    out = _recursive_smooth(x, 1.0 / period, start=period, seed=seed)
+    out[..., period - 1] = seed
+    return out
+
+
+# =============================================================================
+# OSCILLATORS
+# =============================================================================
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Wilder RSI. İlk `period` bar NaN."""
+    close = _as_float(close)
+    out = np.full(close.shape, np.nan)
+    if close.shape[-1] <= period:
+        return out
+    delta = np.diff(close, axis=-1)
+    gains = np.where(np.isnan(delta), np.nan, np.clip(delta, 0, None))
+    losses = np.where(np.isnan(delta), np.nan, np.clip(-delta, 0, None))
+    avg_gain = wilder(gains, period)
+    avg_loss = wilder(losses, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        values = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), 100 - 100 / (1 + rs))
+    out[..., 1:] = values
+    return out
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD çizgisi, sinyal çizgisi ve histogram."""
+    close = _as_float(close)
+    line = ema(close, fast) - ema(close, slow)
+    sig = ema(line, signal)
+    return line, sig, line - sig
+
+
+def bollinger(close, window: int = 20, k: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger bantları: (orta, üst, alt)."""
+    close = _as_float(close)
+    mid = sma(close, window)
+    std = np.full(close.shape, np.nan)
+    if close.shape[-1] >= window:
+        std[..., window - 1:] = sliding_window_view(close, window, axis=-1).std(axis=-1)
+    return mid, mid + k * std, mid - k * std
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range (Wilder)."""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return wilder(tr, period)
+
+
+def rolling_volatility(close, window: int = 20, annualize: bool = False) -> np.ndarray:
+    """Günlük log-getirilerin kayan standart sapması (yüzde)."""
+    close = _as_float(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rets = np.diff(np.log(close), axis=-1)
+    out = np.full(close.shape, np.nan)
+    if rets.shape[-1] >= window:
+        with warnings.catch_warnings():
+            # Çoğu NaN olan pencereler NaN döner, uyarıya gerek yok
+            warnings.simplefilter("ignore", RuntimeWarning)
+            out[..., window:] = np.nanstd(sliding_window_view(rets, window, axis=-1), axis=-1, ddof=1)
+    out *= 100 * (np.sqrt(252) if annualize else 1)
+    return out
+
+
+# =============================================================================
+# SNAPSHOT
+# =============================================================================
+def _last_valid(x: np.ndarray) -> np.ndarray:
+    """Zaman ekseni boyunca son geçerli (NaN olmayan) değer."""
+    valid = ~np.isnan(x)
+    idx = x.shape[-1] - 1 - valid[..., ::-1].argmax(axis=-1)
+    last = np.take_along_axis(x, idx[..., None], axis=-1)[..., 0]
+    return np.where(valid.any(axis=-1), last, np.nan)
+
+
+def _first_valid(x: np.ndarray) -> np.ndarray:
+    """Zaman ekseni boyunca ilk geçerli değer."""
+    valid = ~np.isnan(x)
+    idx = valid.argmax(axis=-1)
+    first = np.take_along_axis(x, idx[..., None], axis=-1)[..., 0]
+    return np.where(valid.any(axis=-1), first, np.nan)
+
+
+def snapshot(close, high=None, low=None, rsi_period: int = 14, vol_window: int = 20) -> Dict[str, np.ndarray]:
+    """
+    Tool'ların kullandığı son değerleri tek geçişte hesaplar.
+    Kısa serilerde (ör. 5 günlük veri) pencereler seri uzunluğuna kısaltılır.
+    """
+    close = _as_float(close)
+    n = close.shape[-1]
+    rsi_p = max(1, min(rsi_period, n - 1))
+    vol_w = max(2, min(vol_window, n - 1))
+
+    if n == 0:
+        raise ValueError("snapshot needs at least one bar")
+
+    first = _first_valid(close)
+    last = _last_valid(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (last - first) / first * 100
+
+    neutral = np.full(close.shape[:-1], 50.0)
+    snap = {
+        "price": last,
+        "change_pct": change,
+        "rsi": _last_valid(rsi(close, rsi_p)) if n > 1 else neutral,
+        "volatility": _last_valid(rolling_volatility(close, vol_w)) if n > 2 else neutral * np.nan,
+    }
+    if n >= 26:
+        snap["macd_hist"] = _last_valid(macd(close)[2])
+    if high is not None and low is not None and n > 1:
+        snap["atr"] = _last_valid(atr(high, low, close, min(14, n - 1)))
+    return snap
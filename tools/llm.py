@@ -0,0 +1,224 @@
+"""
+LLM Client Registry
+===================
+Process-wide cache of chat models with provider failover.
+
+Her ajan/reflection adımında yeni ChatOpenAI / ChatGoogleGenerativeAI kurmak
+ve bind_tools(ALL_TOOLS) ile tool şemalarını yeniden serileştirmek yerine
+modeller ve tool bağlı sürümleri sağlayıcı başına bir kez kurulur.
+OpenRouter istemcisi paylaşılan keep-alive httpx.Client'ı kullanır.
+
+Çağrılar sağlayıcı sırasıyla (varsayılan OpenRouter → Gemini) denenir:
+- Üst üste LLM_FAILURE_THRESHOLD hata veren sağlayıcı LLM_COOLDOWN saniye
+  geri plana alınır,
+- gecikme ortalaması (EWMA) LLM_LATENCY_THRESHOLD'u aşan sağlayıcı da öyle.
+Geri plandaki sağlayıcılar yalnızca diğerleri başarısız olursa denenir.
+Her deneme sağlayıcının hız sınırı kovasından (tools.rate_limit) jeton alır.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from tools.http import get_client
+from tools.rate_limit import get_limiter
+
+
+LLM_PROVIDERS = ("openrouter", "gemini")
+LLM_PROVIDER_ORDER = os.getenv("LLM_PROVIDER_ORDER", ",".join(LLM_PROVIDERS))
+LLM_KEYS = {"openrouter": "OPENROUTER_API_KEY", "gemini": "GOOGLE_API_KEY"}
+LLM_MODELS = {"openrouter": "xiaomi/mimo-v2-flash:free", "gemini": "gemini-2.5-flash"}
+LLM_TEMPERATURE = 0.3
+LLM_TIMEOUT = 60.0           # saniye; aşılırsa hata sayılır ve sıradaki sağlayıcıya geçilir
+LLM_MAX_RETRIES = 1          # SDK içi yeniden deneme; asıl yedek failover'dır
+LLM_FAILURE_THRESHOLD = 2    # ardışık hata → sağlayıcı geri plana
+LLM_LATENCY_THRESHOLD = 30.0 # saniye; EWMA gecikme bunu aşarsa sağlayıcı geri plana
+LLM_COOLDOWN = 120.0         # geri planda kalma süresi (saniye)
+LATENCY_ALPHA = 0.3          # EWMA ağırlığı
+
+
+def configured_providers(order: str = LLM_PROVIDER_ORDER) -> List[str]:
+    """API anahtarı tanımlı sağlayıcılar, tercih sırasıyla."""
+    names = [p.strip().lower() for p in order.split(",") if p.strip()]
+    return [p for p in dict.fromkeys(names) if p in LLM_KEYS and os.getenv(LLM_KEYS[p])]
+
+
+def build_model(provider: str):
+    """Sağlayıcının sohbet modelini kurar (registry dışında çağrılmamalı)."""
+    if provider == "openrouter":
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(
+            model=LLM_MODELS[provider],
+            openai_api_key=os.getenv(LLM_KEYS[provider]),
+            openai_api_base="https://openrouter.ai/api/v1",
+            temperature=LLM_TEMPERATURE,
+            timeout=LLM_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=get_client(LLM_TIMEOUT),
+            default_headers={
+                "HTTP-Referer": "http://localhost",
+                "X-Title": "FinAgent"
+            }
+        )
+    if provider == "gemini":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(
+            model=LLM_MODELS[provider],
+            google_api_key=os.getenv(LLM_KEYS[provider]),
+            temperature=LLM_TEMPERATURE,
+            timeout=LLM_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES,
+        )
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+class LLMCall(NamedTuple):
+    """Tek LLM çağrısının sonucu ve maliyeti."""
+    response: Any
+    provider: str
+    waited: float            # hız sınırı kuyruğunda beklenen toplam süre (s)
+    latency: float           # başarılı denemenin süresi (s)
+    attempts: int
+
+
+class _Health:
+    __slots__ = ("failures", "latency", "benched_until", "calls", "errors")
+
+    def __init__(self):
+        self.failures = 0
+        self.latency: Optional[float] = None
+        self.benched_until = 0.0
+        self.calls = 0
+        self.errors = 0
+
+
+class LLMRegistry:
+    """Caches models and tool-bound models per provider and routes calls with failover."""
+
+    def __init__(self, providers: Optional[Sequence[str]] = None,
+                 factory: Callable[[str], Any] = build_model,
+                 clock: Callable[[], float] = time.monotonic):
+        self._providers = list(providers) if providers is not None else None
+        self._factory = factory
+        self._clock = clock
+        self._models: Dict[Any, Any] = {}
+        self._health: Dict[str, _Health] = {}
+        self._lock = threading.RLock()       # model() tool bağlarken temel modeli aynı kilitle kurar
+        self.builds = 0
+
+    @property
+    def providers(self) -> List[str]:
+        return self._providers if self._providers is not None else configured_providers()
+
+    def model(self, provider: str, tools: Optional[Sequence] = None):
+        """Sağlayıcının modeli; tools verilirse bind_tools sonucu (her ikisi de bir kez kurulur)."""
+        key = (provider, tuple(t.name for t in tools) if tools else ())
+        runnable = self._models.get(key)
+        if runnable is None:
+            with self._lock:
+                runnable = self._models.get(key)
+                if runnable is None:
+                    if tools:
+                        runnable = self.model(provider).bind_tools(list(tools))
+                    else:
+                        runnable = self._factory(provider)
+                    self.builds += 1
+                    self._models[key] = runnable
+        return runnable
+
+    def _state(self, provider: str) -> _Health:
+        return self._health.setdefault(provider, _Health())
+
+    def order(self) -> List[str]:
+        """Sağlıklı sağlayıcılar önce; geri plandakiler son çare olarak sonda."""
+        now = self._clock()
+        with self._lock:
+            benched = {p for p in self.providers if self._state(p).benched_until > now}
+        return [p for p in self.providers if p not in benched] + [p for p in self.providers if p in benched]
+
+    def _success(self, provider: str, latency: float) -> None:
+        with self._lock:
+            h = self._state(provider)
+            h.calls += 1
+            h.failures = 0
+            h.latency = latency if h.latency is None else LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * h.latency
+            if h.latency > LLM_LATENCY_THRESHOLD:
+                h.benched_until = self._clock() + LLM_COOLDOWN
+                print(f"[LLM] {provider} yavaş ({h.latency:.1f}s), {LLM_COOLDOWN:.0f}s geri planda")
+                h.latency = None        # geri dönüşte ortalama sıfırdan başlar
+            else:
+                h.benched_until = 0.0
+
+    def _failure(self, provider: str, error: Exception) -> None:
+        with self._lock:
+            h = self._state(provider)
+            h.calls += 1
+            h.errors += 1
+            h.failures += 1
+            if h.failures >= LLM_FAILURE_THRESHOLD:
+                h.benched_until = self._clock() + LLM_COOLDOWN
+                h.failures = 0
+        print(f"[LLM] {provider} hatası: {type(error).__name__}: {str(error)[:120]}")
+
+    def call(self, messages, tools: Optional[Sequence] = None) -> LLMCall:
+        """Mesajları sırayla sağlayıcılara dener; hepsi başarısızsa son hatayı iletir."""
+        providers = self.order()
+        if not providers:
+            raise ValueError("No API key found. Set OPENROUTER_API_KEY or GOOGLE_API_KEY.")
+        waited = 0.0
+        last_error: Optional[Exception] = None
+        for attempt, provider in enumerate(providers, 1):
+            try:
+                runnable = self.model(provider, tools)
+                waited += get_limiter(provider).acquire()
+                started = self._clock()
+                response = runnable.invoke(messages)
+            except Exception as e:
+                self._failure(provider, e)
+                last_error = e
+                continue
+            latency = self._clock() - started
+            self._success(provider, latency)
+            if attempt > 1:
+                print(f"[LLM] {provider} ile yanıtlandı ({attempt}. deneme)")
+            return LLMCall(response, provider, waited, latency, attempt)
+        raise last_error
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        now = self._clock()
+        with self._lock:
+            return {
+                p: {"calls": h.calls, "errors": h.errors,
+                    "latency": None if h.latency is None else round(h.latency, 2),
+                    "benched": h.benched_until > now}
+                for p, h in self._health.items()
+            }
+
+
+class LLMClient:
+    """Registry üzerinden çağrı yapan hafif sarmalayıcı (tools: bind_tools edilecek tool'lar)."""
+
+    def __init__(self, registry: LLMRegistry, tools: Optional[Sequence] = None):
+        self.registry = registry
+        self.tools = list(tools) if tools else None
+
+    def call(self, messages) -> LLMCall:
+        return self.registry.call(messages, self.tools)
+
+    def invoke(self, messages):
+        return self.call(messages).response
+
+
+_registry: Optional[LLMRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_registry() -> LLMRegistry:
+    """Süreç genelinde tek LLMRegistry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = LLMRegistry()
+    return _registry
@@ -0,0 +1,244 @@
+"""
+Market Data Providers
+=====================
+Pluggable source for OHLCV history, batched downloads and .info fields.
+
+Tool'lar, fiyat deposu ve scout yfinance'ı doğrudan çağırmaz; tüm ağ
+erişimi get_provider() üzerinden geçer:
+- YFinanceProvider: canlı yfinance (yf.Ticker nesneleri yeniden kullanılır)
+- RecordedProvider: dosya tabanlı kayıt/oynatma. `upstream` verilirse her
+  yanıtı kaydeder, verilmezse yalnızca diskteki kayıtlardan yanıtlar
+  (ağ yok, deterministik). Kayıtlar sembol başına birleştirilir; oynatmada
+  period/start pencereleri kayıttan kesilir.
+
+Seçim ortam değişkeniyle yapılır:
+    MARKET_DATA=yfinance | record | replay
+    MARKET_DATA_DIR=<kayıt dizini>     (varsayılan: <CACHE_DIR>/recordings)
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from tools.cache import CACHE_DIR, get_ticker
+
+
+MARKET_DATA_MODES = ("yfinance", "record", "replay")
+MARKET_DATA_MODE = os.getenv("MARKET_DATA", "yfinance").strip().lower()
+MARKET_DATA_DIR = os.getenv("MARKET_DATA_DIR", os.path.join(CACHE_DIR, "recordings"))
+
+_PERIOD_RE = re.compile(r"^\d+(d|mo|y)$")
+
+
+class MarketDataProvider(ABC):
+    """
+    Piyasa verisi kaynağı arayüzü. Dönen DataFrame'ler yfinance biçimindedir
+    (OHLCV sütunları, Date/Datetime dizini); veri yoksa boş DataFrame.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def history(self, symbol: str, interval: str = "1d", period: Optional[str] = None,
+                start: Optional[str] = None) -> pd.DataFrame:
+        """Tek sembolün OHLCV geçmişi: `start`'tan bugüne ya da son `period`."""
+
+    def download(self, symbols: Sequence[str], interval: str = "1d", period: Optional[str] = None,
+                 start: Optional[str] = None) -> pd.DataFrame:
+        """yf.download(group_by='ticker') biçiminde geniş tablo; varsayılan sembol başına history."""
+        frames = {s: self.history(s, interval=interval, period=period, start=start) for s in symbols}
+        frames = {s: h for s, h in frames.items() if h is not None and not h.empty}
+        return pd.concat(frames, axis=1, sort=True) if frames else pd.DataFrame()
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        return {}
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Canlı yfinance; sembol başına tek yf.Ticker nesnesi (TICKER_CACHE)."""
+
+    name = "yfinance"
+
+    def history(self, symbol: str, interval: str = "1d", period: Optional[str] = None,
+                start: Optional[str] = None) -> pd.DataFrame:
+        ticker = get_ticker(symbol)
+        if start is not None:
+            return ticker.history(start=start, interval=interval)
+        return ticker.history(period=period or "1mo", interval=interval)
+
+    def download(self, symbols: Sequence[str], interval: str = "1d", period: Optional[str] = None,
+                 start: Optional[str] = None) -> pd.DataFrame:
+        import yfinance as yf
+        window = {"start": start} if start is not None else {"period": period or "1mo"}
+        return yf.download(list(symbols), interval=interval, group_by="ticker",
+                           threads=True, progress=False, **window)
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        return get_ticker(symbol).info or {}
+
+
+class RecordedProvider(MarketDataProvider):
+    """
+    Kayıt/oynatma sağlayıcısı:
+        <root>/<interval>/<SYMBOL>.pkl   birleştirilmiş barlar
+        <root>/info/<SYMBOL>.json        .info alanları
+    upstream varsa yanıtlar ondan alınıp kaydedilir; yoksa kayıttan okunur.
+    latency: oynatmada çağrı başına eklenen gecikme (gerçekçi verim ölçümleri için).
+    """
+
+    name = "recorded"
+
+    def __init__(self, root: str = MARKET_DATA_DIR, upstream: Optional[MarketDataProvider] = None,
+                 latency: float = 0.0):
+        self.root = root
+        self.upstream = upstream
+        self.latency = latency
+        self._frames: Dict[tuple, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        self.calls = self.misses = 0
+
+    @property
+    def recording(self) -> bool:
+        return self.upstream is not None
+
+    def _path(self, kind: str, symbol: str, ext: str) -> str:
+        return os.path.join(self.root, kind, symbol.replace("/", "_").replace(os.sep, "_") + ext)
+
+    # -------------------------------------------------------------------------
+    # RECORD
+    # -------------------------------------------------------------------------
+    def record(self, symbol: str, interval: str, df: pd.DataFrame) -> None:
+        """Barları sembolün kaydına ekler; aynı zaman damgasında yeni değer kazanır."""
+        if df is None or df.empty:
+            return
+        with self._lock:
+            old = self._load(symbol, interval)
+            merged = pd.concat([old, df]) if not old.empty else df
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            path = self._path(interval, symbol, ".pkl")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            merged.to_pickle(path + ".tmp")
+            os.replace(path + ".tmp", path)
+            self._frames[(symbol, interval)] = merged
+
+    def record_info(self, symbol: str, info: Dict[str, Any]) -> None:
+        path = self._path("info", symbol, ".json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False, default=str)
+        os.replace(path + ".tmp", path)
+
+    # -------------------------------------------------------------------------
+    # REPLAY
+    # -------------------------------------------------------------------------
+    def _load(self, symbol: str, interval: str) -> pd.DataFrame:
+        key = (symbol, interval)
+        df = self._frames.get(key)
+        if df is None:
+            try:
+                df = pd.read_pickle(self._path(interval, symbol, ".pkl"))
+            except FileNotFoundError:
+                df = pd.DataFrame()
+            self._frames[key] = df
+        return df
+
+    def _replay(self, symbol: str, interval: str, period: Optional[str], start: Optional[str]) -> pd.DataFrame:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        df = self._load(symbol, interval)
+        if df.empty:
+            self.misses += 1
+            return df
+        if start is not None:
+            cutoff = pd.Timestamp(start)
+            if df.index.tz is not None:
+                cutoff = cutoff.tz_localize(df.index.tz)
+            return df[df.index >= cutoff]
+        if period and _PERIOD_RE.match(period):
+            from tools.price_store import _window_start
+            index = df.index.as_unit("ns")
+            ts = (index.tz_convert("UTC") if index.tz is not None else index).tz_localize(None).asi8
+            tz = str(index.tz) if index.tz is not None else None
+            return df.iloc[_window_start(ts, period, interval, tz):]
+        return df
+
+    # -------------------------------------------------------------------------
+    # PROVIDER API
+    # -------------------------------------------------------------------------
+    def history(self, symbol: str, interval: str = "1d", period: Optional[str] = None,
+                start: Optional[str] = None) -> pd.DataFrame:
+        if not self.recording:
+            return self._replay(symbol, interval, period, start)
+        df = self.upstream.history(symbol, interval=interval, period=period, start=start)
+        self.record(symbol, interval, df)
+        return df
+
+    def download(self, symbols: Sequence[str], interval: str = "1d", period: Optional[str] = None,
+                 start: Optional[str] = None) -> pd.DataFrame:
+        if not self.recording:
+            return super().download(symbols, interval=interval, period=period, start=start)
+        from tools.batch import _split_frame
+        df = self.upstream.download(symbols, interval=interval, period=period, start=start)
+        for s, h in _split_frame(df, list(symbols)).items():
+            self.record(s, interval, h)
+        return df
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        if self.recording:
+            info = self.upstream.info(symbol)
+            self.record_info(symbol, info)
+            return info
+        self.calls += 1
+        try:
+            with open(self._path("info", symbol, ".json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return {}
+
+    def symbols(self, interval: str = "1d") -> List[str]:
+        """Kayıtlı semboller."""
+        try:
+            names = os.listdir(os.path.join(self.root, interval))
+        except FileNotFoundError:
+            return []
+        return sorted(n[:-len(".pkl")] for n in names if n.endswith(".pkl"))
+
+
+def make_provider(mode: str = MARKET_DATA_MODE, root: str = MARKET_DATA_DIR) -> MarketDataProvider:
+    if mode not in MARKET_DATA_MODES:
+        raise ValueError(f"Unknown MARKET_DATA mode: {mode} (expected one of {MARKET_DATA_MODES})")
+    if mode == "replay":
+        return RecordedProvider(root)
+    if mode == "record":
+        return RecordedProvider(root, upstream=YFinanceProvider())
+    return YFinanceProvider()
+
+
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> MarketDataProvider:
+    """Süreç genelinde tek sağlayıcı (MARKET_DATA ortam değişkenine göre)."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = make_provider()
+    return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]) -> Optional[MarketDataProvider]:
+    """Sağlayıcıyı değiştirir (benchmark/test); öncekini döndürür. None: ortamdan yeniden kurulur."""
+    global _provider
+    with _provider_lock:
+        previous, _provider = _provider, provider
+    return previous
@@ -4,9 +4,33 @@ Optimized Market Tools (v2)
 8 powerful, compact tools for financial analysis.
 """
 
-from typing import List, Dict, Any
+import asyncio
+import re
+import threading
+from functools import partial
+from typing import List, Dict, Any, Optional
+import numpy as np
 from langchain_core.tools import tool
 
+from tools.cache import HISTORY_CACHE, get_history
+from tools.batch import rank_by_return
+from tools.indicators import snapshot
+from tools.symbol_index import SymbolIndex
+from tools.alias_store import GUESS_TTL, get_alias_store
+from tools.fundamentals import get_info, get_fundamentals_cache
+from tools.market_data import get_provider
+from tools.feeds import FEED_CACHE
+from tools.sentiment import aggregate, score_headlines
+from tools import tavily_search
+from tools.screener import get_screener
+from tools.price_store import get_price_store
+from tools.price_matrix import load_matrix
+from tools.portfolio import MODES as PORTFOLIO_MODES, allocate_lots, optimize, resolve_mode
+from tools.fx import FX_DEFAULT_PAIRS, get_fx_engine, parse_pair, split_pairs
+from tools.backtest import BACKTEST_PERIOD, DEFAULT_RULE, rule_grid, run_backtest, signal_label
+from tools.parallel import get_executor, run_parallel, run_blocking
+from tools.http import HTTP_TIMEOUT, fetch_page, afetch_page
+
 
 # =============================================================================
 # SYMBOL MAPPING - Türkçe/İngilizce isimlerden yfinance sembollerine
@@ -57,29 +81,116 @@ SYMBOL_MAP = {
     "dax": "^GDAXI", "ftse": "^FTSE",
 }
 
+# =============================================================================
+# SECTORS - scan_sector için sektör → BIST sembolleri
+# =============================================================================
+SECTORS = {
+    "banka": ["GARAN.IS", "AKBNK.IS", "YKBNK.IS", "ISCTR.IS"],
+    "holding": ["SAHOL.IS", "KCHOL.IS", "SISE.IS"],
+    "havacılık": ["THYAO.IS", "PGSUS.IS", "TAVHL.IS"],
+    "enerji": ["TUPRS.IS", "PETKM.IS", "AKSEN.IS"],
+    "perakende": ["BIMAS.IS", "MGROS.IS", "SOKM.IS"],
+    "teknoloji": ["ASELS.IS", "LOGO.IS"],
+    "otomotiv": ["TOASO.IS", "FROTO.IS", "DOAS.IS"]
+}
+
+
+def watchlist() -> List[str]:
+    """Tabloda ve sektörlerde geçen tüm semboller (fundamentals warm-up için)."""
+    symbols = list(SYMBOL_MAP.values()) + [s for syms in SECTORS.values() for s in syms]
+    return sorted(set(symbols))
+
+
+# Türkçe normalize edilmiş, önceden kurulmuş arama indeksi
+SYMBOL_INDEX = SymbolIndex(SYMBOL_MAP)
+
+# SYMBOL_MAP / SYMBOL_INDEX / alias store güncellemeleri birlikte yapılır
+_LEARN_LOCK = threading.Lock()
+
+
+def _learn_symbol(alias: str, symbol: str) -> None:
+    """Web'den bulunan eşleşmeyi tabloya, indekse ve kalıcı depoya yazar."""
+    with _LEARN_LOCK:
+        SYMBOL_MAP[alias] = symbol
+        SYMBOL_INDEX.add(alias, symbol)
+        get_alias_store().put(alias, symbol)
+
+
+def load_learned_aliases() -> int:
+    """Önceki çalışmalarda öğrenilen takma adları tabloya yükler."""
+    try:
+        learned = get_alias_store().positives()
+    except Exception as e:
+        print(f"[Symbol Resolver] Alias deposu açılamadı: {e}")
+        return 0
+    with _LEARN_LOCK:
+        for alias, symbol in learned.items():
+            if alias not in SYMBOL_MAP:
+                SYMBOL_MAP[alias] = symbol
+                SYMBOL_INDEX.add(alias, symbol)
+    return len(learned)
+
+
+load_learned_aliases()
+
+
+# Web metninden çıkan ve ticker sanılabilecek yaygın kelimeler
+TICKER_STOPWORDS = frozenset({"THE", "AND", "FOR", "USD", "TRY", "EUR", "BIST", "HISSE", "ICIN", "VEYA"})
+# Doğrulanacak en fazla tahmin sayısı (her biri bir veri isteği)
+MAX_TICKER_GUESSES = 3
+
+
+def _ticker_exists(symbol: str) -> bool:
+    """
+    Tahmin edilen ticker için son günlerde fiyat verisi var mı?
+    Doğrudan sağlayıcıya sorulur: aday fiyat deposuna yazılmaz, geri doldurma tetiklenmez.
+    """
+    try:
+        df = get_provider().history(symbol, interval="1d", period="5d")
+    except Exception:
+        return False
+    return df is not None and not df.empty
+
+
+def _guess_ticker(text: str) -> Optional[str]:
+    """
+    Web metnindeki 3-5 harfli büyük kelimelerden ilk geçerli ticker.
+    Sıradan kelimeler de bu kalıba uyduğu için her aday veriyle doğrulanır.
+    """
+    candidates = []
+    for word in re.findall(r'\b([A-Z]{3,5})\b', text):
+        if word not in TICKER_STOPWORDS and word not in candidates:
+            candidates.append(word)
+    for candidate in candidates[:MAX_TICKER_GUESSES]:
+        if _ticker_exists(candidate):
+            return candidate
+    return None
+
 
 def resolve_symbol(query: str) -> str:
     """
     Verilen sorguyu yfinance sembolüne çevirir.
-    1. Önce eşleme tablosuna bakar
-    2. Bulamazsa direkt yfinance'ı dener
-    3. O da başarısız olursa web_search ile arar
+    1. Sembol indeksi (statik tablo + alias deposundan öğrenilenler): tam, sonra kısmi eşleşme
+    2. Sorgu zaten sembol formatındaysa (.IS, -USD, =F, büyük harf ticker) olduğu gibi
+    3. Alias deposunda yakın zamanda sonuçsuz kalmışsa (negatif kayıt) web'e gitmeden fallback
+    4. Alias deposunda süresi dolmamış tahmini kayıt varsa o sembol
+    5. web_search: .IS sembolü ya da veriyle doğrulanmış ticker tahmini aranır;
+       .IS sonucu süresiz (indekse de eklenir), tahmin GUESS_TTL süreli,
+       bulunamayan negatif olarak depoya yazılır
+    Ağ veya depo hataları kaydedilmez; fallback büyük harfli sorgudur.
     """
-    import re
     query_lower = query.lower().strip()
     
-    # Direkt eşleşme
-    if query_lower in SYMBOL_MAP:
-        resolved = SYMBOL_MAP[query_lower]
-        print(f"[Symbol Resolver] '{query}' → '{resolved}' (tablo)")
+    # İndeks: direkt eşleşme, ardından en uzun kısmi eşleşme
+    match = SYMBOL_INDEX.lookup(query)
+    if match:
+        resolved, key, kind = match
+        if kind == "exact":
+            print(f"[Symbol Resolver] '{query}' → '{resolved}' (tablo)")
+        else:
+            print(f"[Symbol Resolver] '{query}' ~ '{key}' → '{resolved}' (kısmi)")
         return resolved
     
-    # Kısmi eşleşme (kelime içeriyorsa)
-    for key, symbol in SYMBOL_MAP.items():
-        if key in query_lower or query_lower in key:
-            print(f"[Symbol Resolver] '{query}' ~ '{key}' → '{symbol}' (kısmi)")
-            return symbol
-    
     # Zaten geçerli bir sembol formatı mı? (.IS, -USD, =F içeriyor veya tamamen büyük harf)
     if "." in query or "-" in query or "=" in query:
         print(f"[Symbol Resolver] '{query}' (format geçerli, direkt kullan)")
@@ -89,46 +200,105 @@ def resolve_symbol(query: str) -> str:
         print(f"[Symbol Resolver] '{query}' (zaten ticker formatında)")
         return query
     
-    # Web search ile sembol ara
-    print(f"[Symbol Resolver] '{query}' tabloda yok, web_search deneniyor...")
+    fallback = query.upper().replace(" ", "")[:6]
+    
     try:
+        # Yakın zamanda sonuçsuz kalan sorgular için tekrar web'e gitme
+        store = get_alias_store()
+        if store.is_negative(query_lower):
+            print(f"[Symbol Resolver] '{query}' negatif önbellekte, web_search atlandı → '{fallback}'")
+            return fallback
+        guessed = store.guessed(query_lower)
+        if guessed:
+            print(f"[Symbol Resolver] '{query}' → '{guessed}' (tahmin, depodan)")
+            return guessed
+        
+        # Web search ile sembol ara
+        print(f"[Symbol Resolver] '{query}' tabloda yok, web_search deneniyor...")
         from ddgs import DDGS
         search_query = f"{query} hisse senedi yfinance sembol ticker"
         
         with DDGS() as ddgs:
             results = list(ddgs.text(search_query, region='tr-tr', max_results=3))
         
-        if results:
-            # Sonuçlardan sembol bulmaya çalış
-            combined_text = " ".join([r.get("body", "") + " " + r.get("title", "") for r in results])
-            
-            # BIST sembolleri (.IS ile biter) ara
-            bist_match = re.search(r'\b([A-Z]{3,6})\.IS\b', combined_text.upper())
-            if bist_match:
-                found_symbol = bist_match.group(0)
-                print(f"[Symbol Resolver] Web'den bulundu: '{query}' → '{found_symbol}'")
-                # Tabloya ekle ki bir dahaki sefere hızlı olsun
-                SYMBOL_MAP[query_lower] = found_symbol
-                return found_symbol
-            
-            # Genel ticker sembolleri (3-5 büyük harf)
-            ticker_match = re.search(r'\b([A-Z]{3,5})\b', combined_text.upper())
-            if ticker_match:
-                found_symbol = ticker_match.group(1)
-                # Yaygın kelimeler değilse
-                if found_symbol not in ["THE", "AND", "FOR", "USD", "TRY", "EUR"]:
-                    print(f"[Symbol Resolver] Web'den tahmin: '{query}' → '{found_symbol}'")
-                    return found_symbol
+        # Sonuçlardan sembol bulmaya çalış
+        combined_text = " ".join([r.get("body", "") + " " + r.get("title", "") for r in results]).upper()
+        
+        # BIST sembolleri (.IS ile biter) ara
+        bist_match = re.search(r'\b([A-Z]{3,6})\.IS\b', combined_text)
+        if bist_match:
+            found_symbol = bist_match.group(0)
+            print(f"[Symbol Resolver] Web'den bulundu: '{query}' → '{found_symbol}'")
+            # Tabloya ve kalıcı depoya ekle ki bir dahaki sefere hızlı olsun
+            _learn_symbol(query_lower, found_symbol)
+            return found_symbol
+        
+        # Tahmin: yalnızca bu sorgu için, süreli (indekse girmez)
+        guessed = _guess_ticker(combined_text)
+        if guessed:
+            print(f"[Symbol Resolver] Web'den tahmin: '{query}' → '{guessed}'")
+            store.put(query_lower, guessed, ttl=GUESS_TTL)
+            return guessed
+        
+        # Arama çalıştı ama doğrulanan sembol çıkmadı: bir süre tekrar deneme
+        store.put_negative(query_lower)
     
     except Exception as e:
+        # Ağ / depo hataları geçicidir, negatif olarak kaydedilmez
         print(f"[Symbol Resolver] Web search hatası: {e}")
     
     # Hiçbir şey bulunamadı - büyük harfe çevir ve dene
-    fallback = query.upper().replace(" ", "")[:6]
     print(f"[Symbol Resolver] Fallback: '{query}' → '{fallback}'")
     return fallback
 
 
+# =============================================================================
+# PROBE - analyze_stock için tek turda veri bulma
+# =============================================================================
+# Tek istekte çekilen en geniş pencere; daha kısa pencereler yerelde türetilir
+PROBE_PERIOD = "1mo"
+
+
+def _probe_candidates(symbol: str) -> List[str]:
+    """Çıplak ticker'lar için BIST (.IS) adayını da ekler."""
+    candidates = [symbol]
+    if symbol.isupper() and "." not in symbol and "-" not in symbol:
+        candidates.append(f"{symbol}.IS")
+    return candidates
+
+
+def _probe_history(symbol: str):
+    """
+    Tüm adayların PROBE_PERIOD geçmişini ve .info'sunu aynı anda ister; çıplak sembol önceliklidir.
+    En kötü durumda bile tek ağ turu: kazanan adayın .info'su history ile birlikte gelir.
+    Returns: (kullanılan sembol, history veya None, kullanılan sembolün .info future'ı)
+    """
+    candidates = _probe_candidates(symbol)
+    pool = get_executor()
+    futures = [pool.submit(get_history, c, PROBE_PERIOD) for c in candidates]
+    info_futures = {c: pool.submit(get_info, c) for c in candidates}
+    
+    for candidate, future in zip(candidates, futures):
+        try:
+            h = future.result()
+        except Exception:
+            continue
+        if not h.empty:
+            if candidate != symbol:
+                print(f"[analyze_stock] {symbol} bulunamadı, BIST verisi kullanıldı: {candidate}")
+            return candidate, h, info_futures[candidate]
+    return symbol, None, info_futures[symbol]
+
+
+def _period_label(h) -> Optional[str]:
+    """Elde edilen veri penceresinin etiketi (eski 1mo → 5d → 1d sırasıyla uyumlu)."""
+    if h is None or h.empty:
+        return None
+    if len(h) > 5:
+        return "1mo"
+    return "5d" if len(h) > 1 else "1d"
+
+
 # =============================================================================
 # TOOL 1: analyze_stock (Complete stock analysis in ONE call)
 # =============================================================================
@@ -142,43 +312,14 @@ def analyze_stock(symbol: str) -> Dict[str, Any]:
     Args:
         symbol: Stock ticker or asset name (e.g., "NVDA", "Nvidia", "Bitcoin", "Altın", "SAHOL.IS")
     """
-    import yfinance as yf
-    
     # Sembolü çözümle (Nvidia → NVDA, Altın → GC=F vb.)
     original_input = symbol
     symbol = resolve_symbol(symbol)
     print(f"[analyze_stock] {original_input} → {symbol}")
     
-    # Farklı zaman periyotları ile fallback dene
-    periods_to_try = ["1mo", "5d", "1d"]
-    h = None
-    used_period = None
-    
-    # İlk deneme: verilen sembol
-    for period in periods_to_try:
-        try:
-            t = yf.Ticker(symbol)
-            h = t.history(period=period)
-            if not h.empty:
-                used_period = period
-                break
-        except Exception:
-            continue
-    
-    # İkinci deneme: .IS suffix ekle (BIST hisseleri için)
-    if (h is None or h.empty) and symbol.isupper() and "." not in symbol and "-" not in symbol:
-        bist_symbol = f"{symbol}.IS"
-        print(f"[analyze_stock] {symbol} bulunamadı, BIST denemesi: {bist_symbol}")
-        for period in periods_to_try:
-            try:
-                t = yf.Ticker(bist_symbol)
-                h = t.history(period=period)
-                if not h.empty:
-                    symbol = bist_symbol  # Başarılı, sembolü güncelle
-                    used_period = period
-                    break
-            except Exception:
-                continue
+    # Çıplak sembol ve .IS adayı tek turda, en geniş periyotla paralel denenir
+    symbol, h, info_future = _probe_history(symbol)
+    used_period = _period_label(h)
     
     if h is None or h.empty:
         return {
@@ -189,28 +330,26 @@ def analyze_stock(symbol: str) -> Dict[str, Any]:
         }
     
     try:
-        t = yf.Ticker(symbol)
-        info = t.info
+        info = info_future.result()
         
         p = float(h['Close'].iloc[-1])
         p_start = float(h['Close'].iloc[0])
         chg = ((p - p_start) / p_start) * 100
-        vol = h['Close'].std() / h['Close'].mean() * 100
         
-        # Simple RSI
-        gains = [max(0, h['Close'].iloc[i] - h['Close'].iloc[i-1]) for i in range(1, min(15, len(h)))]
-        losses = [max(0, h['Close'].iloc[i-1] - h['Close'].iloc[i]) for i in range(1, min(15, len(h)))]
-        rsi = 100 - (100 / (1 + (sum(gains)/(sum(losses)+0.001))))
+        # Wilder RSI + günlük getiri volatilitesi (tools.indicators)
+        snap = snapshot(h['Close'].to_numpy())
+        rsi = float(snap["rsi"])
+        vol = float(snap["volatility"])
         
-        # Sinyal hesaplama
-        sig = "AL" if rsi < 30 or chg > 5 else "SAT" if rsi > 70 or chg < -5 else "TUT"
+        # Sinyal hesaplama (kural tools.backtest ile geriye dönük test edilir)
+        sig = signal_label(rsi, chg)
         
         # Sonuç
         result = {
             "sembol": symbol.replace(".IS", "").replace("-USD", "").replace("=F", ""),
             "fiyat": round(p, 2),
             "degisim": f"{chg:+.1f}%",
-            "volatilite": f"{vol:.1f}%",
+            "volatilite": f"{vol:.1f}%" if vol == vol else "-",
             "rsi": round(rsi, 0),
             "sinyal": sig,
             "periyot": used_period
@@ -245,42 +384,35 @@ def analyze_stock(symbol: str) -> Dict[str, Any]:
 def scan_sector(sector: str) -> Dict[str, Any]:
     """
     Scan all stocks in a sector, return top 3 picks.
-    Sectors: banka, holding, havacılık, enerji, perakende, teknoloji, otomotiv
+    Sectors: banka, holding, havacılık, enerji, perakende, teknoloji, otomotiv,
+    sigorta, gyo, çimento, demir-çelik, kimya, gıda, telekom, tekstil, sağlık...
     
     Args:
         sector: Sector name (Turkish)
     """
-    import yfinance as yf
     print(f"[scan_sector] {sector}")
     
-    SECTORS = {
-        "banka": ["GARAN.IS", "AKBNK.IS", "YKBNK.IS", "ISCTR.IS"],
-        "holding": ["SAHOL.IS", "KCHOL.IS", "SISE.IS"],
-        "havacılık": ["THYAO.IS", "PGSUS.IS", "TAVHL.IS"],
-        "enerji": ["TUPRS.IS", "PETKM.IS", "AKSEN.IS"],
-        "perakende": ["BIMAS.IS", "MGROS.IS", "SOKM.IS"],
-        "teknoloji": ["ASELS.IS", "LOGO.IS"],
-        "otomotiv": ["TOASO.IS", "FROTO.IS", "DOAS.IS"]
-    }
-    
     key = sector.lower().replace("ı", "i")
     symbols = next((v for k, v in SECTORS.items() if k in key or key in k), None)
+    if not symbols:
+        # Listede olmayan sektörler BIST evren dosyasından (tools/data) bulunur
+        symbols = get_screener().sector_symbols(sector) or None
     
     if not symbols:
-        return {"err": f"Unknown sector. Available: {list(SECTORS.keys())}"}
+        return {"err": f"Unknown sector. Available: {get_screener().sectors()}"}
     
-    results = []
-    for sym in symbols:
-        try:
-            h = yf.Ticker(sym).history(period="1mo")
-            if h.empty: continue
-            chg = ((h['Close'].iloc[-1] - h['Close'].iloc[0]) / h['Close'].iloc[0]) * 100
-            results.append({"s": sym.replace(".IS",""), "p": round(float(h['Close'].iloc[-1]),1), "chg": f"{chg:+.1f}%"})
-        except Exception as e:
-            print(f"[scan_sector] {sym} hatası: {e}")
-            continue
+    # Sektör depodan tek hizalı matris olarak okunur (bayatlar toplu indirilir),
+    # sıralama vektörel yapılır; frame() memmap'in kopyasız görünümüdür
+    closes = load_matrix(symbols, "Close", period="1mo").frame()
+    ranked = rank_by_return(closes)
+    if not ranked.empty:
+        # RSI tüm sektör için tek geçişte (semboller × zaman)
+        ranked["rsi"] = snapshot(closes[ranked.index].to_numpy().T)["rsi"]
+    results = [
+        {"s": sym.replace(".IS",""), "p": round(float(row.p),1), "chg": f"{row.chg:+.1f}%", "rsi": round(float(row.rsi),0)}
+        for sym, row in ranked.head(3).iterrows()
+    ]
     
-    results.sort(key=lambda x: float(x["chg"].replace("%","").replace("+","")), reverse=True)
     return {"sector": sector, "top3": results[:3], "best": results[0]["s"] if results else "-"}
 
 
@@ -295,37 +427,155 @@ def compare(symbols: List[str]) -> Dict[str, Any]:
     Args:
         symbols: List of 2-3 stock symbols (e.g., ["SAHOL.IS", "KCHOL.IS"])
     """
-    import yfinance as yf
     print(f"[compare] {symbols}")
     
+    symbols = list(dict.fromkeys(symbols[:3]))
+    
+    # Depo güncellemeleri + .info çağrıları aynı anda; süresi dolan semboller raporlanır
+    store = get_price_store()
+    jobs = {}
+    for sym in symbols:
+        jobs[(sym, "h")] = partial(store.update, sym, "1d")
+        jobs[(sym, "i")] = partial(get_info, sym)
+    fetched = run_parallel(jobs)
+    for key, err in fetched.errors.items():
+        if key[1] == "h":
+            print(f"[compare] {key[0]} hatası: {err}")
+    
+    # Güncellenen semboller tek hizalı kapanış matrisinden okunur
+    ready = [sym for sym in symbols if (sym, "h") in fetched.results]
+    closes = load_matrix(ready, "Close", period="1mo", refresh=False)
+    
     results = []
-    for sym in symbols[:3]:
-        try:
-            t = yf.Ticker(sym)
-            h = t.history(period="1mo")
-            info = t.info
-            if h.empty: continue
-            chg = ((h['Close'].iloc[-1] - h['Close'].iloc[0]) / h['Close'].iloc[0]) * 100
-            results.append({
-                "s": sym.replace(".IS",""),
-                "p": round(float(h['Close'].iloc[-1]),1),
-                "chg": f"{chg:+.1f}%",
-                "pe": round(info.get("trailingPE",0),1) or "-"
-            })
-        except Exception as e:
-            print(f"[compare] {sym} hatası: {e}")
-            continue
+    for sym, row in zip(ready, closes.values):
+        c = row[~np.isnan(row)]
+        if c.size == 0: continue
+        info = fetched.results.get((sym, "i")) or {}
+        chg = ((c[-1] - c[0]) / c[0]) * 100
+        snap = snapshot(c)
+        results.append({
+            "s": sym.replace(".IS",""),
+            "p": round(float(c[-1]),1),
+            "chg": f"{chg:+.1f}%",
+            "rsi": round(float(snap["rsi"]),0),
+            "pe": round(info.get("trailingPE",0),1) or "-"
+        })
     
     if not results:
-        return {"err": "No data"}
+        out = {"err": "No data"}
+    else:
+        best = max(results, key=lambda x: float(x["chg"].replace("%","").replace("+","")))
+        out = {"stocks": results, "winner": best["s"]}
     
-    best = max(results, key=lambda x: float(x["chg"].replace("%","").replace("+","")))
-    return {"stocks": results, "winner": best["s"]}
+    timed_out = sorted({sym for sym, _ in fetched.timed_out})
+    if timed_out:
+        out["timeout"] = timed_out
+    return out
 
 
 # =============================================================================
 # TOOL 4: get_news (Company news headlines - HYBRID TAVILY/RSS)
 # =============================================================================
+# Map common Turkish names to search-friendly versions
+ASSET_KEYWORDS = {
+    "bitcoin": "Bitcoin BTC kripto",
+    "btc": "Bitcoin BTC kripto",
+    "altın": "Altın altın fiyatı gram",
+    "altin": "Altın altın fiyatı gram",
+    "dolar": "Dolar USD TL kur",
+    "euro": "Euro EUR TL kur",
+    "gümüş": "Gümüş gümüş fiyatı ons",
+    "petrol": "Petrol brent ham petrol",
+}
+
+def _tavily_key() -> Optional[str]:
+    import os
+    tavily_key = os.getenv("TAVILY_API_KEY")
+    if tavily_key and "your_tavily_api_key_here" not in tavily_key:
+        return tavily_key
+    return None
+
+
+def _tavily_query(company: str) -> str:
+    """Smart query construction"""
+    if company.lower() in ["altın", "gold"]:
+        return "ons altın gram altın fiyat analizi yorum"
+    if company.lower() in ["bitcoin", "btc"]:
+        return "bitcoin btc kripto para piyasa analizi"
+    return f"{company} haberleri son durum finans piyasa"
+
+
+def _format_tavily(company: str, response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Tavily yanıtını tool çıktısına çevirir; sonuç yoksa None (RSS'e düşülür)."""
+    results = response.get("results", [])
+    if not results:
+        return None
+    news_data = []
+    for res in results:
+        news_data.append({
+            "title": res.get("title", ""),
+            "url": res.get("url", ""),
+            "content": res.get("content", "")[:200] + "...",
+            "score": res.get("score"),
+            "date": res.get("published_date", "Güncel")
+        })
+    
+    # Başlık + özet başına sözlük skoru (tools.sentiment)
+    sent = aggregate(score_headlines(f"{n['title']} {n['content']}" for n in news_data))
+    
+    return {
+        "asset": company,
+        "source": "Tavily API (High Quality)",
+        "news": [f"{n['title']} ({n['date']})" for n in news_data],
+        "summaries": [n["content"] for n in news_data[:3]],
+        "sentiment": sent["sentiment"],
+        "sentiment_score": f"{sent['score']:+d}" if sent["score"] else "0",
+        "headline_scores": sent["headlines"],
+        "urls": [n["url"] for n in news_data[:3]]
+    }
+
+
+def _rss_url(company: str):
+    """Google News RSS adresi ve zenginleştirilmiş arama terimi."""
+    from urllib.parse import quote
+    search_term = ASSET_KEYWORDS.get(company.lower().strip(), company)
+    financial_keywords = "fiyat piyasa yatırım"
+    search_query = f"{search_term} {financial_keywords}"
+    encoded_query = quote(search_query, safe='')
+    url = f"https://news.google.com/rss/search?q={encoded_query}&hl=tr&gl=TR&ceid=TR:tr"
+    return url, search_term
+
+
+def _format_rss(company: str, search_term: str, feed) -> Dict[str, Any]:
+    # Filter for relevancy
+    relevancy_terms = company.lower().split() + search_term.lower().split()[:2]
+    
+    relevant_headlines = []
+    for entry in feed.entries[:10]:
+        title = entry.get("title", "")
+        if any(term in title.lower() for term in relevancy_terms):
+            if " - " in title:
+                headline, source = title.rsplit(" - ", 1)
+            else:
+                headline, source = title, "Bilinmeyen"
+            relevant_headlines.append({"title": headline, "source": source})
+        if len(relevant_headlines) >= 5: break
+    
+    # Sentiment
+    sent = aggregate(score_headlines(h["title"] for h in relevant_headlines))
+    
+    news_list = [h["title"] for h in relevant_headlines[:3]]
+    
+    return {
+        "asset": company,
+        "source": "Google RSS (Basliklar)",
+        "news": news_list if news_list else ["İlgili haber bulunamadı"],
+        "sentiment": sent["sentiment"],
+        "headline_scores": sent["headlines"][:3],
+        "note": "Detayli icerik icin Tavily API key ekleyin"
+    }
+
+
 @tool
 def get_news(company: str) -> Dict[str, Any]:
     """
@@ -335,77 +585,18 @@ def get_news(company: str) -> Dict[str, Any]:
     Args:
         company: Company/asset name (e.g., "Bitcoin", "THYAO", "Altın")
     """
-    import os
-    import feedparser
-    from urllib.parse import quote
-    from datetime import datetime, timedelta
-    
     print(f"[get_news] {company}")
     
     # 1. TRY TAVILY API FIRST (Better content)
-    tavily_key = os.getenv("TAVILY_API_KEY")
-    if tavily_key and "your_tavily_api_key_here" not in tavily_key:
+    tavily_key = _tavily_key()
+    if tavily_key:
         try:
-            from tavily import TavilyClient
             print(f"[get_news] Using Tavily for {company}")
             
-            client = TavilyClient(api_key=tavily_key)
-            
-            # Smart query construction
-            search_query = f"{company} haberleri son durum finans piyasa"
-            if company.lower() in ["altın", "gold"]:
-                search_query = "ons altın gram altın fiyat analizi yorum"
-            elif company.lower() in ["bitcoin", "btc"]:
-                search_query = "bitcoin btc kripto para piyasa analizi"
-            
-            # Advanced search with news topic
-            response = client.search(
-                query=search_query,
-                search_depth="advanced",
-                topic="news",
-                max_results=5,
-                include_answer=False,
-                include_images=False
-            )
-            
-            results = response.get("results", [])
-            if results:
-                news_data = []
-                for res in results:
-                    news_data.append({
-                        "title": res.get("title", ""),
-                        "url": res.get("url", ""),
-                        "content": res.get("content", "")[:200] + "...",
-                        "score": res.get("score"),
-                        "date": res.get("published_date", "Güncel")
-                    })
-                
-                # Simple sentiment on content
-                positive_words = ["yükseliş", "artış", "rekor", "kâr", "olumlu", "boğa", "kazanç", "fırsat"]
-                negative_words = ["düşüş", "zarar", "kriz", "risk", "olumsuz", "ayı", "kayıp", "satış"]
-                
-                all_text = " ".join([n["content"].lower() + n["title"].lower() for n in news_data])
-                pos_count = sum(1 for w in positive_words if w in all_text)
-                neg_count = sum(1 for w in negative_words if w in all_text)
-                
-                sent_score = "0"
-                sentiment = "NÖTR"
-                if pos_count > neg_count:
-                    sent_score = f"+{pos_count - neg_count}"
-                    sentiment = "OLUMLU"
-                elif neg_count > pos_count:
-                    sent_score = f"-{neg_count - pos_count}"
-                    sentiment = "OLUMSUZ"
-                
-                return {
-                    "asset": company,
-                    "source": "Tavily API (High Quality)",
-                    "news": [f"{n['title']} ({n['date']})" for n in news_data],
-                    "summaries": [n["content"] for n in news_data[:3]],
-                    "sentiment": sentiment,
-                    "sentiment_score": sent_score,
-                    "urls": [n["url"] for n in news_data[:3]]
-                }
+            response = tavily_search.search(_tavily_query(company), tavily_key)
+            result = _format_tavily(company, response)
+            if result:
+                return result
                 
         except Exception as e:
             print(f"[get_news] Tavily error: {e}, falling back to RSS")
@@ -414,129 +605,151 @@ def get_news(company: str) -> Dict[str, Any]:
 
     # 2. FALLBACK TO GOOGLE RSS (Free, robust)
     print(f"[get_news] Using RSS Fallback for {company}")
-    
-    # Map common Turkish names to search-friendly versions
-    ASSET_KEYWORDS = {
-        "bitcoin": "Bitcoin BTC kripto",
-        "btc": "Bitcoin BTC kripto",
-        "altın": "Altın altın fiyatı gram",
-        "altin": "Altın altın fiyatı gram",
-        "dolar": "Dolar USD TL kur",
-        "euro": "Euro EUR TL kur",
-        "gümüş": "Gümüş gümüş fiyatı ons",
-        "petrol": "Petrol brent ham petrol",
-    }
-    
-    # Get enhanced search term
-    search_term = ASSET_KEYWORDS.get(company.lower().strip(), company)
-    financial_keywords = "fiyat piyasa yatırım"
-    search_query = f"{search_term} {financial_keywords}"
-    encoded_query = quote(search_query, safe='')
-    url = f"https://news.google.com/rss/search?q={encoded_query}&hl=tr&gl=TR&ceid=TR:tr"
+    url, search_term = _rss_url(company)
     
     try:
-        feed = feedparser.parse(url)
-        
-        # Filter for relevancy
-        relevancy_terms = company.lower().split() + search_term.lower().split()[:2]
-        
-        relevant_headlines = []
-        for entry in feed.entries[:10]:
-            title = entry.get("title", "")
-            if any(term in title.lower() for term in relevancy_terms):
-                if " - " in title:
-                    headline, source = title.rsplit(" - ", 1)
-                else:
-                    headline, source = title, "Bilinmeyen"
-                relevant_headlines.append({"title": headline, "source": source})
-            if len(relevant_headlines) >= 5: break
-        
-        # Sentiment
-        positive_words = ["kâr", "artış", "büyüme", "rekor", "yükseliş", "kazanç", "ralli"]
-        negative_words = ["zarar", "düşüş", "kriz", "risk", "satış", "kaybetti", "geriledi"]
-        
-        all_text = " ".join([h["title"].lower() for h in relevant_headlines])
-        pos_count = sum(1 for w in positive_words if w in all_text)
-        neg_count = sum(1 for w in negative_words if w in all_text)
-        
-        sent = "OLUMLU" if pos_count > neg_count else "OLUMSUZ" if neg_count > pos_count else "NÖTR"
-        
-        news_list = [h["title"] for h in relevant_headlines[:3]]
-        
-        return {
-            "asset": company,
-            "source": "Google RSS (Basliklar)",
-            "news": news_list if news_list else ["İlgili haber bulunamadı"],
-            "sentiment": sent,
-            "note": "Detayli icerik icin Tavily API key ekleyin"
-        }
+        feed = FEED_CACHE.get(url)
+        return _format_rss(company, search_term, feed)
         
     except Exception as e:
         return {"error": str(e), "asset": company}
 
 
+async def _aget_news(company: str) -> Dict[str, Any]:
+    """get_news'in async yolu: AsyncTavilyClient ve feed önbelleğinin async tarafı."""
+    print(f"[get_news] {company} (async)")
+    
+    tavily_key = _tavily_key()
+    if tavily_key:
+        try:
+            response = await tavily_search.asearch(_tavily_query(company), tavily_key)
+            result = _format_tavily(company, response)
+            if result:
+                return result
+        except Exception as e:
+            print(f"[get_news] Tavily error: {e}, falling back to RSS")
+
+    url, search_term = _rss_url(company)
+    try:
+        feed = await FEED_CACHE.aget(url)
+        return _format_rss(company, search_term, feed)
+    except Exception as e:
+        return {"error": str(e), "asset": company}
+
+
 # =============================================================================
 # TOOL 5: build_portfolio (Allocate money to stocks)
 # =============================================================================
+PORTFOLIO_LOOKBACK = "1y"    # kovaryans penceresi (depodaki günlük kapanışlar)
+
+
 @tool
-def build_portfolio(amount: float, symbols: List[str]) -> Dict[str, Any]:
+def build_portfolio(amount: float, symbols: List[str], mode: str = "equal") -> Dict[str, Any]:
     """
-    Allocate investment amount across stocks equally.
+    Allocate investment amount across stocks in whole shares.
+    Modes: equal, inverse_vol, min_variance, risk_parity, max_sharpe
+    (weights from 1y daily return covariance).
     
     Args:
         amount: Investment amount in TL (e.g., 100000)
         symbols: List of stock symbols (e.g., ["SAHOL.IS", "GARAN.IS", "THYAO.IS"])
+        mode: Weighting mode (default "equal")
     """
-    import yfinance as yf
-    print(f"[build_portfolio] {amount} TL -> {symbols}")
+    print(f"[build_portfolio] {amount} TL -> {symbols} ({mode})")
     
+    # Tekrarlanan semboller tek pozisyon (matris satırları da tekilleştirilmiş sembollerle hizalı)
+    symbols = list(dict.fromkeys(symbols))
     n = len(symbols)
     if n == 0:
         return {"err": "No symbols"}
+    resolved = resolve_mode(mode)
+    if resolved is None:
+        return {"err": f"Unknown mode. Available: {list(PORTFOLIO_MODES)}"}
     
-    per_stock = amount / n
-    positions = []
-    total = 0
+    # Fiyatlar paralel çekilir; süresi dolanlar pozisyona girmez, bütçe diğerlerine dağıtılır
+    fetched = run_parallel({sym: partial(get_history, sym, "1d") for sym in symbols})
     
+    held = []
     for sym in symbols:
-        try:
-            h = yf.Ticker(sym).history(period="1d")
-            p = float(h['Close'].iloc[-1]) if not h.empty else 0
-            shares = int(per_stock / p) if p > 0 else 0
-            val = shares * p
-            positions.append({"s": sym.replace(".IS",""), "qty": shares, "val": round(val,0)})
-            total += val
-        except Exception as e:
-            print(f"[build_portfolio] {sym} hatası: {e}")
+        if sym in fetched.errors:
+            print(f"[build_portfolio] {sym} hatası: {fetched.errors[sym]}")
             continue
+        if sym not in fetched.results:
+            continue
+        h = fetched.results[sym]
+        held.append((sym, float(h['Close'].iloc[-1]) if not h.empty else 0.0))
+    
+    prices = np.array([p for _, p in held])
+    priced = [sym for sym, p in held if p > 0]
+    weights = np.zeros(len(held))
+    info: Dict[str, Any] = {"mode": "equal"}
+    if priced:
+        # Kovaryans, depodaki hizalı 1 yıllık kapanış matrisinden tek geçişte
+        closes = (load_matrix(priced, "Close", period=PORTFOLIO_LOOKBACK, ffill=True).values
+                  if resolved != "equal" else np.empty((len(priced), 0)))
+        weights[prices > 0], info = optimize(closes, resolved)
+    shares = allocate_lots(amount, weights, prices)
+    
+    positions = []
+    for (sym, p), w, qty in zip(held, weights, shares):
+        positions.append({"s": sym.replace(".IS",""), "qty": int(qty), "val": round(qty * p, 0),
+                          "w": f"{w * 100:.1f}%"})
+    total = float(shares @ prices) if held else 0.0
     
-    return {"positions": positions, "invested": round(total,0), "cash": round(amount-total,0)}
+    result = {"positions": positions, "invested": round(total,0), "cash": round(amount-total,0), **info}
+    if fetched.timed_out:
+        result["timeout"] = list(fetched.timed_out)
+    return result
 
 
 # =============================================================================
 # TOOL 6: get_forex (Currency rates)
 # =============================================================================
 @tool
-def get_forex(pair: str = "USDTRY") -> Dict[str, Any]:
+def get_forex(pair: str = "USDTRY", pairs: Optional[List[str]] = None) -> Dict[str, Any]:
     """
-    Get currency exchange rate.
+    Get currency exchange rates. Several pairs are answered from one fetch.
     
     Args:
-        pair: Currency pair (e.g., "USDTRY", "EURTRY", "GBPTRY")
+        pair: Currency pair (e.g., "USDTRY", "EURTRY", "GBPTRY") or comma-separated pairs;
+              empty for the main TRY rates (USDTRY, EURTRY, GBPTRY, EURUSD)
+        pairs: Optional list of more pairs (e.g., ["USDTRY", "EURTRY", "EURUSD"])
     """
-    import yfinance as yf
-    print(f"[get_forex] {pair}")
-    
-    symbol = f"{pair}=X"
-    h = yf.Ticker(symbol).history(period="5d")
-    
+    names = split_pairs([pair, *(pairs or [])]) or list(FX_DEFAULT_PAIRS)
+    print(f"[get_forex] {', '.join(names)}")
+
+    engine = get_fx_engine()
+    quotes = {}
+    if any(engine.supports(n) for n in names):
+        try:
+            quotes = {n: engine.quote(n) for n in names}
+        except Exception as e:
+            print(f"[get_forex] Kur matrisi kurulamadı: {e}")
+
+    # Matristen türetilemeyen pariteler eskisi gibi tek tek sorgulanır
+    missing = [n for n in names if quotes.get(n) is None]
+    fetched = run_parallel({n: partial(_forex_direct, n) for n in missing}) if missing else None
+    for n in missing:
+        quotes[n] = fetched.results.get(n) or {"pair": n, "err": f"No data for {n}"}
+
+    if len(names) == 1:
+        q = quotes[names[0]]
+        return {"err": q["err"]} if "err" in q else q
+    result = {"rates": [quotes[n] for n in names]}
+    if fetched and fetched.timed_out:
+        result["timeout"] = list(fetched.timed_out)
+    return result
+
+
+def _forex_direct(pair: str) -> Dict[str, Any]:
+    legs = parse_pair(pair)
+    name = "".join(legs) if legs else pair
+    h = get_history(f"{name}=X", period="5d")
     if h.empty:
-        return {"err": f"No data for {pair}"}
-    
+        return {"pair": name, "err": f"No data for {name}"}
     rate = float(h['Close'].iloc[-1])
     chg = ((rate - h['Close'].iloc[0]) / h['Close'].iloc[0]) * 100
-    
-    return {"pair": pair, "rate": round(rate, 2), "chg": f"{chg:+.2f}%"}
+    return {"pair": name, "rate": round(rate, 2 if rate >= 10 else 4), "chg": f"{chg:+.2f}%"}
 
 
 # =============================================================================
@@ -550,10 +763,9 @@ def get_fundamentals(symbol: str) -> Dict[str, Any]:
     Args:
         symbol: Stock ticker (e.g., "SAHOL.IS")
     """
-    import yfinance as yf
     print(f"[get_fundamentals] {symbol}")
     
-    info = yf.Ticker(symbol).info
+    info = get_info(symbol)
     
     return {
         "s": symbol.replace(".IS",""),
@@ -584,6 +796,79 @@ def quick_answer(question: str) -> Dict[str, Any]:
 # =============================================================================
 # TOOL 9: web_search (Search the internet)
 # =============================================================================
+WEB_FETCH_TOP_N = 3          # içeriği paralel çekilen ilk N arama sonucu
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+def _ddgs_search(query: str) -> List[Dict[str, str]]:
+    from ddgs import DDGS
+    search_results = []
+    with DDGS() as ddgs:
+        for r in ddgs.text(query, region='tr-tr', max_results=3):
+            search_results.append({
+                "title": r.get("title", ""),
+                "snippet": r.get("body", ""),
+                "url": r.get("href", "")
+            })
+    return search_results
+
+
+def _extract_text(page: bytes) -> str:
+    """Sayfanın (baştan kesilmiş) ana metnini çıkarır, ilk 1500 karakteri döndürür."""
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(page.decode("utf-8", errors="replace"), HTML_PARSER)
+    
+    # Script ve style etiketlerini kaldır
+    for tag in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
+        tag.decompose()
+    
+    # Ana içeriği bul
+    article = soup.find('article') or soup.find('main') or soup.find('div', class_='content')
+    if article:
+        text = article.get_text(separator=' ', strip=True)
+    else:
+        text = soup.get_text(separator=' ', strip=True)
+    
+    # Temizle ve kısalt
+    text = ' '.join(text.split())  # Fazla boşlukları temizle
+    return text[:1500]  # İlk 1500 karakter
+
+
+def _fetch_urls(search_results: List[Dict[str, str]]) -> List[str]:
+    return [r["url"] for r in search_results[:WEB_FETCH_TOP_N] if r.get("url")]
+
+
+def _format_search(query: str, search_results: List[Dict[str, str]],
+                   urls: List[str], pages: List[Optional[bytes]]) -> Dict[str, Any]:
+    """Sıralamadaki ilk okunabilir sayfanın metnini kullanır; hiçbiri yoksa ilk snippet."""
+    extracted_content, source_url = "", ""
+    for url, page in zip(urls, pages):
+        if page:
+            extracted_content = _extract_text(page)
+            if extracted_content:
+                source_url = url
+                print(f"[web_search] Extracted {len(extracted_content)} chars from {url[:50]}")
+                break
+    if not extracted_content and search_results:
+        extracted_content = search_results[0].get("snippet", "")
+    
+    return {
+        "query": query,
+        "results": [
+            {"title": r["title"][:80], "snippet": r["snippet"][:200]} 
+            for r in search_results[:3]
+        ],
+        "full_content": extracted_content if extracted_content else "İçerik çekilemedi",
+        "source_url": source_url or (search_results[0]["url"] if search_results else "")
+    }
+
+
 @tool
 def web_search(query: str) -> Dict[str, Any]:
     """
@@ -596,69 +881,215 @@ def web_search(query: str) -> Dict[str, Any]:
     print(f"[web_search] {query}")
     
     try:
-        from ddgs import DDGS
-        import requests
-        from bs4 import BeautifulSoup
-        
         # 1. Arama sonuçlarını al
-        search_results = []
-        with DDGS() as ddgs:
-            for r in ddgs.text(query, region='tr-tr', max_results=3):
-                search_results.append({
-                    "title": r.get("title", ""),
-                    "snippet": r.get("body", ""),
-                    "url": r.get("href", "")
-                })
+        search_results = _ddgs_search(query)
         
-        # 2. İlk sonucun içeriğini çek
-        extracted_content = ""
-        if search_results and search_results[0].get("url"):
-            try:
-                url = search_results[0]["url"]
-                print(f"[web_search] Fetching content from: {url[:50]}...")
-                
-                headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-                response = requests.get(url, headers=headers, timeout=10)
-                response.encoding = 'utf-8'
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Script ve style etiketlerini kaldır
-                    for tag in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-                        tag.decompose()
-                    
-                    # Ana içeriği bul
-                    article = soup.find('article') or soup.find('main') or soup.find('div', class_='content')
-                    if article:
-                        text = article.get_text(separator=' ', strip=True)
-                    else:
-                        text = soup.get_text(separator=' ', strip=True)
-                    
-                    # Temizle ve kısalt
-                    text = ' '.join(text.split())  # Fazla boşlukları temizle
-                    extracted_content = text[:1500]  # İlk 1500 karakter
-                    
-                    print(f"[web_search] Extracted {len(extracted_content)} chars of content")
-                    
-            except Exception as fetch_error:
-                print(f"[web_search] Content fetch error: {fetch_error}")
-                extracted_content = search_results[0].get("snippet", "")
+        # 2. İlk N sonucun başını paylaşılan oturumla paralel çek
+        urls = _fetch_urls(search_results)
+        fetched = run_parallel({url: partial(fetch_page, url) for url in urls}, timeout=HTTP_TIMEOUT)
+        for url, err in fetched.errors.items():
+            print(f"[web_search] Content fetch error ({url[:50]}): {err}")
+        pages = [fetched.results.get(url) for url in urls]
         
-        return {
-            "query": query,
-            "results": [
-                {"title": r["title"][:80], "snippet": r["snippet"][:200]} 
-                for r in search_results[:3]
-            ],
-            "full_content": extracted_content if extracted_content else "İçerik çekilemedi",
-            "source_url": search_results[0]["url"] if search_results else ""
-        }
+        return _format_search(query, search_results, urls, pages)
     
     except Exception as e:
         return {"err": str(e)[:100]}
 
 
+async def _aweb_search(query: str) -> Dict[str, Any]:
+    """web_search'in async yolu: DDGS tool havuzunda, sayfalar paylaşılan httpx istemcisiyle."""
+    print(f"[web_search] {query} (async)")
+    
+    try:
+        search_results = await run_blocking(_ddgs_search, query)
+        
+        urls = _fetch_urls(search_results)
+        pages = await asyncio.gather(*[afetch_page(url) for url in urls], return_exceptions=True)
+        for url, page in zip(urls, pages):
+            if isinstance(page, Exception):
+                print(f"[web_search] Content fetch error ({url[:50]}): {page}")
+        pages = [None if isinstance(page, Exception) else page for page in pages]
+        
+        return _format_search(query, search_results, urls, pages)
+    
+    except Exception as e:
+        return {"err": str(e)[:100]}
+
+
+# =============================================================================
+# TOOL 10: screen_stocks (Screen the whole BIST universe)
+# =============================================================================
+@tool
+def screen_stocks(sector: str = "", rsi_below: Optional[float] = None, rsi_above: Optional[float] = None,
+                  min_return: Optional[float] = None, sort_by: str = "momentum", top: int = 5) -> Dict[str, Any]:
+    """
+    Screen the BIST universe (~270 liquid stocks, not every listed company) by indicators
+    and return the top matches.
+    Examples: oversold banks → sector="banka", rsi_below=30; best momentum → sort_by="momentum", top=5.
+    
+    Args:
+        sector: Optional sector filter (e.g., "banka", "enerji", "gyo"); empty = whole universe
+        rsi_below: Only stocks with RSI below this value
+        rsi_above: Only stocks with RSI above this value
+        min_return: Only stocks with 1-month return (%) at least this value
+        sort_by: "momentum" (1-month return), "rsi" (lowest first), "volatilite" or "hacim" (volume z-score)
+        top: Number of results (max 20)
+    """
+    print(f"[screen_stocks] sector={sector!r} rsi<{rsi_below} rsi>{rsi_above} ret>={min_return} by={sort_by}")
+    screener = get_screener()
+    # Evren snapshot'ı istek yolunda kurulmaz (soğuk kurulum tool süre sınırını aşabilir):
+    # hiç yoksa arka planda kurulur, bayatsa eski snapshot'la yanıtlanıp arka planda yenilenir
+    if not screener.ready:
+        screener.refresh_in_background()
+        return {"err": "Tarama verisi hazırlanıyor (warming up). Biraz sonra tekrar deneyin "
+                       "veya analyze_stock / scan_sector kullanın.", "warming_up": True}
+    if not screener.is_fresh():
+        screener.refresh_in_background()
+    try:
+        return screener.query(
+            sector=sector or None, rsi_below=rsi_below, rsi_above=rsi_above,
+            min_return=min_return, sort_by=sort_by, top=max(1, min(int(top), 20)),
+            ascending=sort_by.lower() == "rsi", max_age=float("inf")
+        )
+    except Exception as e:
+        return {"err": f"Tarama hatası: {str(e)[:80]}"}
+
+
+# =============================================================================
+# TOOL 11: backtest_signal (Historical performance of the AL/SAT/TUT rule)
+# =============================================================================
+def _pct(x: float) -> str:
+    return f"{x * 100:+.1f}%" if x == x else "-"
+
+
+def _rule_summary(r: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "rule": r["rule"].describe(),
+        "hit": f"{r['hit_rate'] * 100:.0f}%" if r["hit_rate"] == r["hit_rate"] else "-",
+        "ret": _pct(r["portfolio_return"]),
+        "cagr": _pct(r["portfolio_cagr"]),
+        "dd": _pct(r["portfolio_drawdown"]),
+        "trades": r["trades"],
+    }
+
+
+@tool
+def backtest_signal(sector: str = "", symbols: Optional[List[str]] = None,
+                    period: str = BACKTEST_PERIOD, variants: bool = False) -> Dict[str, Any]:
+    """
+    Backtest analyze_stock's AL/SAT/TUT signal rule on historical daily prices.
+    Reports hit rate, return, CAGR and max drawdown vs buy & hold.
+    
+    Args:
+        sector: BIST sector (e.g., "banka"); a sector or symbols is required
+        symbols: Optional explicit symbols (e.g., ["THYAO.IS", "GARAN.IS"])
+        period: History window: "1y", "2y" or "5y" (default)
+        variants: Also test threshold variants and return the best 3
+    """
+    print(f"[backtest_signal] sector={sector!r} symbols={symbols} period={period} variants={variants}")
+    if period not in ("1y", "2y", "5y"):
+        return {"err": "period must be 1y, 2y or 5y"}
+    
+    screener = get_screener()
+    if symbols:
+        universe = list(dict.fromkeys(symbols))
+    elif sector:
+        universe = screener.sector_symbols(sector)
+        if not universe:
+            return {"err": f"Unknown sector. Available: {screener.sectors()}"}
+    else:
+        # Tüm evren ~270 sembolün derin (5y) indirmesi demek; istek yolunda kurulmaz
+        return {"err": f"Sector or symbols required. Available sectors: {screener.sectors()}"}
+    
+    try:
+        rules = rule_grid() if variants else None
+        out = run_backtest(universe, period, rules)
+    except Exception as e:
+        return {"err": f"Backtest hatası: {str(e)[:80]}"}
+    if not out["results"]:
+        return {"err": "No data"}
+    
+    results = out["results"]
+    default = next((r for r in results if r["rule"] == DEFAULT_RULE), results[0])
+    summary = {
+        "symbols": len(out["symbols"]),
+        "bars": out["bars"],
+        **_rule_summary(default),
+        "buy_hold": _pct(default["buy_hold_return"]),
+        "exposure": f"{default['exposure'] * 100:.0f}%",
+    }
+    if variants:
+        summary["best"] = [_rule_summary(r) for r in results[:3]]
+        summary["rank"] = results.index(default) + 1
+    return summary
+
+
+# =============================================================================
+# ASYNC VARIANTS (ainvoke / async ToolNode)
+# =============================================================================
+# yfinance senkron olduğundan bu tool'ların gövdeleri sınırlı tool havuzunda
+# çalışır; veri zaten önbellekteyse event loop üzerinde doğrudan yanıtlanır.
+async def _aanalyze_stock(symbol: str) -> Dict[str, Any]:
+    return await run_blocking(analyze_stock.func, symbol)
+
+
+async def _ascan_sector(sector: str) -> Dict[str, Any]:
+    return await run_blocking(scan_sector.func, sector)
+
+
+async def _acompare(symbols: List[str]) -> Dict[str, Any]:
+    return await run_blocking(compare.func, symbols)
+
+
+async def _abuild_portfolio(amount: float, symbols: List[str], mode: str = "equal") -> Dict[str, Any]:
+    return await run_blocking(build_portfolio.func, amount, symbols, mode)
+
+
+async def _aget_forex(pair: str = "USDTRY", pairs: Optional[List[str]] = None) -> Dict[str, Any]:
+    engine = get_fx_engine()
+    names = split_pairs([pair, *(pairs or [])]) or list(FX_DEFAULT_PAIRS)
+    # Tazeyse matristen veya doğrudan paritenin önbelleğinden event loop üzerinde yanıtlanır
+    if all(engine.is_fresh() if engine.supports(n) else HISTORY_CACHE.peek((f"{n}=X", "5d", "1d"))[0]
+           for n in names):
+        return get_forex.func(pair, pairs)
+    return await run_blocking(get_forex.func, pair, pairs)
+
+
+async def _aget_fundamentals(symbol: str) -> Dict[str, Any]:
+    if get_fundamentals_cache().is_fresh(symbol):
+        return get_fundamentals.func(symbol)
+    return await run_blocking(get_fundamentals.func, symbol)
+
+
+async def _aquick_answer(question: str) -> Dict[str, Any]:
+    return quick_answer.func(question)
+
+
+async def _ascreen_stocks(sector: str = "", rsi_below: Optional[float] = None, rsi_above: Optional[float] = None,
+                          min_return: Optional[float] = None, sort_by: str = "momentum", top: int = 5) -> Dict[str, Any]:
+    # screen_stocks snapshot'ı istek yolunda kurmaz; sorgu vektörel ve hızlıdır
+    return screen_stocks.func(sector, rsi_below, rsi_above, min_return, sort_by, top)
+
+
+async def _abacktest_signal(sector: str = "", symbols: Optional[List[str]] = None,
+                            period: str = BACKTEST_PERIOD, variants: bool = False) -> Dict[str, Any]:
+    return await run_blocking(backtest_signal.func, sector, symbols, period, variants)
+
+
+analyze_stock.coroutine = _aanalyze_stock
+scan_sector.coroutine = _ascan_sector
+compare.coroutine = _acompare
+get_news.coroutine = _aget_news
+build_portfolio.coroutine = _abuild_portfolio
+get_forex.coroutine = _aget_forex
+get_fundamentals.coroutine = _aget_fundamentals
+quick_answer.coroutine = _aquick_answer
+web_search.coroutine = _aweb_search
+screen_stocks.coroutine = _ascreen_stocks
+backtest_signal.coroutine = _abacktest_signal
+
+
 # =============================================================================
 # EXPORT
 # =============================================================================
@@ -671,5 +1102,7 @@ ALL_TOOLS = [
     get_forex,          # 6. Currency rates
     get_fundamentals,   # 7. Valuation ratios
     quick_answer,       # 8. General questions
-    web_search          # 9. Internet search
+    web_search,         # 9. Internet search
+    screen_stocks,      # 10. BIST-wide screener
+    backtest_signal     # 11. Signal rule backtest
 ]
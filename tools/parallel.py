@@ -0,0 +1,208 @@
+"""
+Parallel Fetching
+=================
+Shared, bounded thread pool for network-bound market data calls.
+
+yfinance senkron çalışır; aynı anda birden fazla sembol/aday çekmek için
+tüm tool'lar tek bir sınırlı havuzu paylaşır. Havuz görevleri bu havuza
+tekrar iş gönderip beklememelidir (kilitlenme riski).
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence
+
+
+MAX_FETCH_WORKERS = 8
+FETCH_TIMEOUT = 10           # saniye; her iş gönderildiği andan itibaren
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Süreç genelinde paylaşılan fetch havuzu."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS, thread_name_prefix="fetch")
+    return _executor
+
+
+class ParallelResult(NamedTuple):
+    """run_parallel çıktısı: başarılı sonuçlar, zaman aşımına uğrayanlar, hatalar."""
+    results: Dict[Hashable, Any]
+    timed_out: List[Hashable]
+    errors: Dict[Hashable, str]
+
+
+def run_parallel(jobs: Dict[Hashable, Callable[[], Any]], timeout: Optional[float] = None) -> ParallelResult:
+    """
+    İşleri paylaşılan havuzda aynı anda çalıştırır ve kısmi sonuç döndürür.
+    Süresi dolan işler beklenmez; arka planda bitenler yine önbelleğe yazılır.
+    timeout verilmezse FETCH_TIMEOUT kullanılır.
+    """
+    pool = get_executor()
+    deadline = time.monotonic() + (FETCH_TIMEOUT if timeout is None else timeout)
+    futures = {key: pool.submit(fn) for key, fn in jobs.items()}
+
+    results: Dict[Hashable, Any] = {}
+    timed_out: List[Hashable] = []
+    errors: Dict[Hashable, str] = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FuturesTimeout:
+            future.cancel()      # henüz başlamadıysa kuyruktan çıkar
+            timed_out.append(key)
+        except Exception as e:
+            errors[key] = str(e)[:80]
+    return ParallelResult(results, timed_out, errors)
+
+
+# =============================================================================
+# ASYNC OFFLOADING
+# =============================================================================
+MAX_TOOL_WORKERS = 16        # aynı anda bloklayan tool gövdesi sayısı (async yol)
+
+_tool_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """
+    Async tool'ların senkron yfinance gövdeleri için ayrı, sınırlı havuz.
+    Bu gövdeler fetch havuzuna iş gönderip beklediği için aynı havuz kullanılamaz.
+    """
+    global _tool_executor
+    if _tool_executor is None:
+        with _executor_lock:
+            if _tool_executor is None:
+                _tool_executor = ThreadPoolExecutor(max_workers=MAX_TOOL_WORKERS, thread_name_prefix="tool")
+    return _tool_executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any) -> Any:
+    """Senkron fonksiyonu tool havuzunda çalıştırır, event loop'u bloklamaz."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_tool_executor(), partial(fn, *args))
+
+
+# =============================================================================
+# LONG-LIVED EVENT LOOP
+# =============================================================================
+class BackgroundLoop:
+    """
+    Ayrı thread'de çalışan tek, uzun ömürlü event loop.
+    Senkron sunucu (Flask/gunicorn) her istekte asyncio.run ile yeni loop
+    açarsa loop başına kurulan istemciler (tools.http, tools.tavily_search)
+    tek istek yaşar ve kapatılmadan sızar. Coroutine'ler bu loop'ta
+    çalıştırılırsa istemciler ve keep-alive bağlantıları istekler arasında
+    paylaşılır. stop() önce closers'ı (loop'a bağlı istemcileri kapatan
+    async fonksiyonlar) loop içinde çağırır, sonra loop'u durdurur.
+    Thread ilk run()'da başlar (gunicorn fork'undan sonra).
+    """
+
+    def __init__(self, closers: Sequence[Callable[[], Awaitable[Any]]] = (), name: str = "async-loop"):
+        self._closers = list(closers)
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name=self._name, daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Coroutine'i loop'ta çalıştırır ve sonucunu bekler (çağıran thread bloklanır)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure()).result(timeout)
+
+    async def _close_clients(self) -> None:
+        for closer in self._closers:
+            try:
+                await closer()
+            except Exception as e:
+                print(f"[Loop] İstemci kapatılamadı: {e}")
+
+    def stop(self, timeout: float = 10) -> None:
+        """İstemcileri kapatır ve loop'u durdurur; sonraki run() yeni loop açar."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_clients(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+
+
+# =============================================================================
+# SINGLE-FLIGHT
+# =============================================================================
+class SingleFlight:
+    """
+    Aynı anahtar için eşzamanlı çağrıları tek çağrıda birleştirir.
+    İlk gelen işi yapar, uçuştayken gelenler (thread ya da coroutine)
+    aynı sonucu/hatayı bekler. Biten çağrı hatırlanmaz; önbellek ayrı tutulur.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.shared = 0          # başka bir çağrının sonucunu paylaşan istek sayısı
+
+    def _join(self, key: Hashable):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None,
+                error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
@@ -0,0 +1,161 @@
+"""
+Portfolio Optimizer
+===================
+Vectorized portfolio weights and integer-lot allocation.
+
+Ağırlıklar fiyat deposundaki günlük kapanışların getirilerinden (N, T)
+NumPy ile hesaplanan kovaryans matrisine dayanır:
+- equal:        eşit ağırlık
+- inverse_vol:  1 / volatilite
+- min_variance: en düşük varyans (açığa satış yok)
+- risk_parity:  her sembolün risk katkısı eşit
+- max_sharpe:   en yüksek getiri/risk oranı (açığa satış yok)
+Ağırlıklar tam sayı lotlara, artan nakit en aza inecek şekilde çevrilir.
+"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+MODES = ("equal", "inverse_vol", "min_variance", "risk_parity", "max_sharpe")
+MODE_ALIASES = {
+    "esit": "equal", "eşit": "equal",
+    "inverse_volatility": "inverse_vol", "ters_vol": "inverse_vol",
+    "min_var": "min_variance", "minvar": "min_variance", "min_varyans": "min_variance",
+    "risk_paritesi": "risk_parity",
+    "sharpe": "max_sharpe",
+}
+TRADING_DAYS = 252
+MIN_OBSERVATIONS = 20        # bundan az ortak getiri gününde kovaryans güvenilmez → eşit ağırlık
+SHRINKAGE = 0.1              # kovaryans köşegene bu oranda büzülür (50+ sembolde kararlılık)
+RISK_PARITY_ITERATIONS = 500
+RISK_PARITY_TOLERANCE = 1e-8
+MAX_TOPUP_STEPS = 10_000     # artan nakit için tek lotluk alım adımı sınırı
+
+
+class Estimate(NamedTuple):
+    mean: np.ndarray         # (N,) günlük ortalama getiri
+    cov: np.ndarray          # (N, N) günlük kovaryans (büzülmüş)
+    observations: int
+
+
+def resolve_mode(mode: str) -> Optional[str]:
+    key = (mode or "equal").strip().lower().replace("-", "_").replace(" ", "_")
+    key = MODE_ALIASES.get(key, key)
+    return key if key in MODES else None
+
+
+def estimate(closes: np.ndarray, shrinkage: float = SHRINKAGE) -> Optional[Estimate]:
+    """
+    (N, T) ileri doldurulmuş kapanışlardan ortalama ve kovaryans.
+    Tüm sembollerin verisi olan ortak pencere kullanılır; yetersizse None.
+    """
+    closes = np.asarray(closes, dtype=float)
+    if closes.ndim != 2 or closes.shape[1] < 2:
+        return None
+    valid = ~np.isnan(closes)
+    if not valid[:, -1].all():
+        return None
+    start = int((~valid).sum(axis=1).max())      # ffill sonrası NaN'lar yalnızca baştadır
+    window = closes[:, start:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = window[:, 1:] / window[:, :-1] - 1
+    if returns.shape[1] < MIN_OBSERVATIONS or not np.isfinite(returns).all():
+        return None
+    cov = np.atleast_2d(np.cov(returns))
+    cov = (1 - shrinkage) * cov + shrinkage * np.diag(np.diag(cov))
+    return Estimate(returns.mean(axis=1), cov, returns.shape[1])
+
+
+def _long_only_solve(cov: np.ndarray, b: np.ndarray) -> Optional[np.ndarray]:
+    """
+    w ∝ Σ⁻¹ b, açığa satış olmadan: negatif ağırlıklı semboller çıkarılıp
+    kalan alt sistem yeniden çözülür (aktif küme yaklaşımı).
+    """
+    n = len(b)
+    active = b > 0 if np.any(b <= 0) else np.ones(n, dtype=bool)
+    for _ in range(n):
+        if not active.any():
+            return None
+        w = np.zeros(n)
+        sub = np.ix_(active, active)
+        w[active] = np.linalg.lstsq(cov[sub], b[active], rcond=None)[0]
+        if (w[active] > 0).all():
+            return w / w.sum()
+        active &= w > 0
+    return None
+
+
+def _risk_parity(cov: np.ndarray) -> np.ndarray:
+    """Eşit risk katkısı: w_i (Σw)_i sabit olana dek çarpımsal güncelleme."""
+    w = 1 / np.sqrt(np.diag(cov))
+    w /= w.sum()
+    for _ in range(RISK_PARITY_ITERATIONS):
+        contrib = np.maximum(w * (cov @ w), 1e-18)
+        target = contrib.mean()
+        if np.abs(contrib - target).max() <= RISK_PARITY_TOLERANCE * contrib.sum():
+            break
+        w *= np.sqrt(target / contrib)
+        w /= w.sum()
+    return w
+
+
+def optimize(closes: np.ndarray, mode: str) -> Tuple[np.ndarray, Dict]:
+    """
+    (N, T) kapanışlardan `mode` ağırlıkları. Veri yetersizse eşit ağırlığa düşer.
+    İkinci değer: kullanılan mod, gözlem sayısı ve yıllık beklenen volatilite (%).
+    """
+    n = len(closes)
+    equal = np.full(n, 1 / n) if n else np.empty(0)
+    if mode == "equal" or n == 0:
+        return equal, {"mode": "equal"}
+    est = estimate(closes)
+    if est is None:
+        return equal, {"mode": "equal", "note": "Yetersiz fiyat geçmişi, eşit ağırlık kullanıldı"}
+
+    used = mode
+    if mode == "inverse_vol":
+        w = 1 / np.sqrt(np.diag(est.cov))
+        w /= w.sum()
+    elif mode == "risk_parity":
+        w = _risk_parity(est.cov)
+    else:
+        w = _long_only_solve(est.cov, est.mean) if mode == "max_sharpe" else None
+        if w is None:
+            # max_sharpe: pozitif beklenen getirili sembol yoksa min varyans
+            used = "min_variance"
+            w = _long_only_solve(est.cov, np.ones(n))
+        if w is None:
+            return equal, {"mode": "equal", "note": "Optimizasyon çözülemedi, eşit ağırlık kullanıldı"}
+
+    vol = float(np.sqrt(w @ est.cov @ w * TRADING_DAYS) * 100)
+    return w, {"mode": used, "obs": est.observations, "vol": round(vol, 1)}
+
+
+def allocate_lots(amount: float, weights: np.ndarray, prices: np.ndarray, lot: int = 1) -> np.ndarray:
+    """
+    Hedef tutarları (amount * weights) tam lotlara çevirir; pay adetlerini döndürür.
+    Önce aşağı yuvarlanır, artan nakit hedefinin en çok gerisinde kalan ve
+    alınabilen sembole lot lot eklenir (kalan nakit < en ucuz alınabilir lot).
+    """
+    prices = np.asarray(prices, dtype=float)
+    buyable = np.isfinite(prices) & (prices > 0) & (np.asarray(weights, dtype=float) > 0)
+    if not buyable.any():
+        return np.zeros(len(prices), dtype=np.int64)
+    weights = np.where(buyable, weights, 0.0)
+    cost = np.where(buyable, prices * lot, 0.0)
+    target = amount * weights / weights.sum()
+    units = np.zeros(len(prices))
+    units[buyable] = np.floor(target[buyable] / cost[buyable])
+    cash = amount - float(units @ cost)
+
+    for _ in range(MAX_TOPUP_STEPS):
+        affordable = buyable & (cost <= cash)
+        if not affordable.any():
+            break
+        deficit = np.where(affordable, target - units * cost, -np.inf)
+        i = int(np.argmax(deficit))
+        units[i] += 1
+        cash -= cost[i]
+    return units.astype(np.int64) * lot
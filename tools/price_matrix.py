@@ -0,0 +1,160 @@
+"""
+Price Matrix
+============
+Aligned, memory-mapped (symbols × time) matrices on top of the price store.
+
+Yüzlerce sembol için sembol başına DataFrame kurmak yerine fiyat deposundaki
+sütun dosyaları ortak bir zaman eksenine hizalanıp tek bir diskteki matrise
+yazılır ve np.memmap (salt okunur) olarak döndürülür:
+- Günlük barlar yerel takvim gününe göre hizalanır (BIST ve ABD aynı gün aynı sütunda),
+  gün içi barlar UTC zaman damgasına göre.
+- Eksik barlar NaN'dır (ffill=True ile ileri doldurulur).
+- Matris dosyası, sembollerin depo sürümü değişmedikçe yeniden kullanılır;
+  tekrar okumalar sayfa önbelleğinden gelir, RAM'e kopya yapılmaz.
+- Kurulum ve eski matrislerin silinmesi deponun yazım kilidi (PriceStore._exclusive,
+  süreçler arası fcntl) altında yapılır; geçici dosyalar benzersiz adlıdır, böylece
+  aynı depoyu paylaşan gunicorn worker'ları birbirinin dosyasını ezmez ya da silmez.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from tools.price_store import INTRADAY_INTERVALS, PriceStore, _window_start, get_price_store
+
+
+MATRIX_DIR = "matrix"
+MATRIX_CACHE_FILES = 64      # diskte tutulan en fazla matris (eskiler silinir)
+FFILL_BLOCK_ROWS = 64        # ileri doldurma geçici belleğini sınırlar
+
+
+class AlignedMatrix(NamedTuple):
+    """Semboller × zaman hizalı değerler; values bir np.memmap görünümüdür."""
+    symbols: List[str]
+    index: pd.DatetimeIndex
+    values: np.ndarray           # (semboller, zaman), float64, NaN = bar yok
+
+    def row(self, symbol: str) -> np.ndarray:
+        return self.values[self.symbols.index(symbol)]
+
+    def frame(self) -> pd.DataFrame:
+        """(zaman × sembol) DataFrame; veri kopyalanmaz (values.T görünümü)."""
+        return pd.DataFrame(self.values.T, index=self.index, columns=self.symbols, copy=False)
+
+
+def _align_keys(ts: np.ndarray, interval: str, tz: Optional[str]) -> np.ndarray:
+    """Hizalama anahtarı: günlükte yerel günün gece yarısı (ns), gün içinde UTC ns."""
+    if interval in INTRADAY_INTERVALS:
+        return np.asarray(ts, dtype=np.int64)
+    index = pd.DatetimeIndex(np.asarray(ts).view("datetime64[ns]"))
+    if tz:
+        index = index.tz_localize("UTC").tz_convert(tz).tz_localize(None)
+    return index.normalize().as_unit("ns").asi8
+
+
+def _ffill_rows(values: np.ndarray) -> None:
+    """Her satırı yerinde ileri doldurur (baştaki NaN'lar kalır)."""
+    positions = np.arange(values.shape[1])
+    for start in range(0, values.shape[0], FFILL_BLOCK_ROWS):
+        block = values[start:start + FFILL_BLOCK_ROWS]
+        idx = np.where(np.isnan(block), 0, positions)
+        np.maximum.accumulate(idx, axis=1, out=idx)
+        block[:] = np.take_along_axis(block, idx, axis=1)
+
+
+def _matrix_path(store: PriceStore, key: Dict) -> str:
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:20]
+    return os.path.join(store.root, MATRIX_DIR, digest)
+
+
+def _prune(directory: str, keep: int = MATRIX_CACHE_FILES) -> None:
+    files = sorted(
+        (os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".f8")),
+        key=os.path.getmtime,
+    )
+    for path in files[:-keep]:
+        for name in (path, path[:-len(".f8")] + ".json"):
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+
+
+def _open(path: str, info: Dict) -> AlignedMatrix:
+    shape = tuple(info["shape"])
+    values = (np.memmap(path + ".f8", dtype=np.float64, mode="r", shape=shape)
+              if shape[0] * shape[1] else np.empty(shape))
+    index = pd.DatetimeIndex(np.asarray(info["axis"], dtype=np.int64).view("datetime64[ns]"),
+                             name="Datetime" if info["intraday"] else "Date")
+    if info["intraday"]:
+        index = index.tz_localize("UTC")
+    return AlignedMatrix(list(info["symbols"]), index, values)
+
+
+def load_matrix(symbols: Sequence[str], field: str = "Close", period: str = "1mo",
+                interval: str = "1d", ffill: bool = False, refresh: bool = True,
+                store: Optional[PriceStore] = None) -> AlignedMatrix:
+    """
+    Sembollerin `field` sütununu ortak zaman eksenine hizalı döndürür.
+    Her sembolün penceresi kendi son barına göre `period`'dur (get_history ile aynı).
+    refresh=True: bayat semboller önce depoda güncellenir (toplu indirme).
+    Sonuç satır sırası `symbols` sırasıdır; verisi olmayan sembolün satırı NaN'dır.
+    """
+    store = store or get_price_store()
+    symbols = list(dict.fromkeys(symbols))
+    if refresh:
+        store.update_many(symbols, interval)
+
+    metas = [store.meta(s, interval) for s in symbols]
+    key = {"symbols": symbols, "field": field, "period": period,
+           "interval": interval, "ffill": ffill}
+    signature = [[m["rows"], m.get("version", 0)] for m in metas]
+    path = _matrix_path(store, key)
+
+    with store._exclusive():
+        try:
+            with open(path + ".json", encoding="utf-8") as f:
+                info = json.load(f)
+            if info["signature"] == signature:
+                return _open(path, info)
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+        # Her sembolün penceresi memmap üzerinden dilimlenir (kopya yok)
+        parts = []
+        for sym, meta in zip(symbols, metas):
+            cols = store.columns(sym, interval)
+            start = _window_start(cols["ts"], period, interval, meta.get("tz"))
+            parts.append((_align_keys(cols["ts"][start:], interval, meta.get("tz")), cols[field][start:]))
+        axis = np.unique(np.concatenate([k for k, _ in parts])) if parts else np.empty(0, np.int64)
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        shape = (len(symbols), len(axis))
+        if shape[0] * shape[1]:
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".f8.tmp")
+            os.close(fd)
+            out = np.memmap(tmp, dtype=np.float64, mode="w+", shape=shape)
+            out[:] = np.nan
+            for i, (keys, values) in enumerate(parts):
+                if len(keys):
+                    out[i, np.searchsorted(axis, keys)] = values
+            if ffill:
+                _ffill_rows(out)
+            out.flush()
+            del out
+            os.replace(tmp, path + ".f8")
+
+        info = {"symbols": symbols, "shape": shape, "axis": axis.tolist(),
+                "intraday": interval in INTRADAY_INTERVALS, "signature": signature}
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        os.replace(tmp, path + ".json")
+        _prune(directory)
+        return _open(path, info)
@@ -0,0 +1,464 @@
+"""
+Price Store
+===========
+On-disk columnar OHLCV store with incremental append.
+
+Her (sembol, interval) için bir dizin, her sütun için bir ham dosya tutulur:
+    <CACHE_DIR>/prices/<interval>/<SYMBOL>/{ts.i8, Open.f8, ..., Volume.f8, meta.json}
+Dosyalar yalnızca sona eklenir ve np.memmap ile okunur; satır sayısı meta.json'dadır
+(önce veri, sonra meta yazılır — yarım kalan ekleme bir sonraki yazımda kesilir).
+
+İlk istekte interval'in geri doldurma penceresi (STORE_BACKFILL) indirilir;
+sonrasında yalnızca sondan ikinci saklanan bardan itibaren yeni barlar çekilir. Son bar
+(gün içi devam eden mum) her güncellemede yerinde yenilenir. Günlük barlar
+yerel takvim gününe göre anahtarlanır: Ticker.history'nin borsa saatli
+dizini ile yf.download'ın saat dilimsiz tarihleri aynı güne düşer (indirilen
+tablolar sembolün borsa saat dilimine yerleştirilir). Tüm history
+okumaları bu depodan pencere kesilerek karşılanır. Daha uzun geçmiş gereken
+işler (backtest) ensure_depth() ile sembolün dosyalarını bir kez derinleştirir.
+
+yfinance fiyatları auto_adjust ile verir: bölünme, bedelsiz ve temettüden
+sonra eski barlar geriye dönük değişir. Artımlı indirmede yeniden çekilen
+kapanmış bar (sondan ikinci) saklanandan ADJUSTMENT_TOLERANCE'tan fazla
+farklıysa sembolün tüm penceresi yeniden indirilir ve dosyaları değiştirilir.
+
+Yazımlar (ekleme, meta, yeniden yazma) depo kökündeki .lock dosyasının fcntl
+kilidiyle süreçler arası sıralanır; gunicorn worker'ları aynı depoyu paylaşır
+(aynı sembolü iki worker birlikte indirebilir, dosyalar yine tutarlı kalır).
+fcntl olmayan platformlarda depo tek süreçli kullanılmalıdır.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:          # Windows: yalnızca süreç içi kilit
+    fcntl = None
+
+from tools.batch import BATCH_CHUNK_SIZE, _split_frame
+from tools.cache import CACHE_DIR, MARKET_HOURS, history_ttl, market_for_symbol
+from tools.market_data import get_provider
+from tools.parallel import run_parallel
+
+
+PRICE_STORE_DIR = "prices"
+OHLCV_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+# interval → ilk indirmede çekilen pencere; daha uzun periyotlar depoyu atlar
+STORE_BACKFILL = {"1d": "1y", "1h": "1mo"}
+PERIOD_DAYS = {
+    "1d": 1, "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183,
+    "1y": 366, "2y": 731, "5y": 1827,
+}
+INTRADAY_INTERVALS = {"1h"}
+# Bu sayıdan az bayat sembol tek tek (paralel Ticker.history) güncellenir,
+# fazlası toplu indirme (provider.download) ile BATCH_CHUNK_SIZE'lık toplu isteklerle
+BATCH_MIN_SYMBOLS = 4
+# Yeniden çekilen kapanmış barın saklanandan bağıl farkı bunu aşarsa
+# geçmiş geriye dönük düzeltilmiştir (bölünme/bedelsiz/temettü)
+ADJUSTMENT_TOLERANCE = 1e-3
+
+
+def period_supported(period: str, interval: str) -> bool:
+    """Bu (period, interval) isteği depodan karşılanabilir mi?"""
+    backfill = STORE_BACKFILL.get(interval)
+    return backfill is not None and PERIOD_DAYS.get(period, 10**6) <= PERIOD_DAYS[backfill]
+
+
+def exchange_tz(symbol: str) -> Optional[str]:
+    """Sembolün borsa saat dilimi (BIST/US); bilinmiyorsa None."""
+    hours = MARKET_HOURS.get(market_for_symbol(symbol))
+    return str(hours[0]) if hours else None
+
+
+def _window_start(ts: np.ndarray, period: str, interval: str, tz: Optional[str]) -> int:
+    """Son bara göre `period` penceresinin ilk satırı (yfinance periyot anlamıyla)."""
+    n = len(ts)
+    if n == 0:
+        return 0
+    if period.endswith("d"):
+        days = int(period[:-1])
+        if interval not in INTRADAY_INTERVALS:
+            return max(0, n - days)
+        # Gün içi: son `days` işlem gününün barları
+        index = pd.DatetimeIndex(ts.view("datetime64[ns]"))
+        if tz:
+            index = index.tz_localize("UTC").tz_convert(tz)
+        dates = index.normalize().unique()
+        first_day = dates[max(0, len(dates) - days)]
+        return int(np.searchsorted(index.normalize(), first_day, side="left"))
+    months = {"mo": 1, "y": 12}
+    unit = "mo" if period.endswith("mo") else "y"
+    offset = pd.DateOffset(months=int(period[:-len(unit)]) * months[unit])
+    cutoff = (pd.Timestamp(int(ts[-1])) - offset).value
+    return int(np.searchsorted(ts, cutoff, side="left"))
+
+
+class PriceStore:
+    """Append-only columnar files per (symbol, interval), read through np.memmap."""
+
+    def __init__(self, root: str, clock: Callable[[], float] = time.time):
+        self.root = root
+        self._clock = clock
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._write_lock = threading.Lock()     # dosya ekleme + meta yazımı
+        self.fetches = 0
+        self.appended = 0
+
+    # -------------------------------------------------------------------------
+    # FILES
+    # -------------------------------------------------------------------------
+    def _dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, symbol.replace("/", "_"))
+
+    def _lock(self, symbol: str, interval: str) -> threading.Lock:
+        key = (symbol, interval)
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @contextmanager
+    def _exclusive(self):
+        """Yazım kilidi: süreç içinde threading.Lock, süreçler arasında <root>/.lock üzerinde fcntl."""
+        with self._write_lock:
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(self.root, exist_ok=True)
+            with open(os.path.join(self.root, ".lock"), "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def meta(self, symbol: str, interval: str) -> Dict[str, Any]:
+        return self._read_meta(self._dir(symbol, interval))
+
+    @staticmethod
+    def _read_meta(path: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"rows": 0, "checked_at": 0.0, "tz": None, "version": 0}
+
+    def _write_meta(self, path: str, meta: Dict[str, Any]) -> None:
+        tmp = os.path.join(path, "meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(path, "meta.json"))
+
+    def columns(self, symbol: str, interval: str) -> Dict[str, np.ndarray]:
+        """
+        Saklanan sütunlar: "ts" (int64, UTC ns) ve OHLCV (float64).
+        Diziler salt okunur np.memmap görünümleridir; kopya yapılmaz.
+        """
+        return self._columns(self._dir(symbol, interval))
+
+    def _columns(self, path: str) -> Dict[str, np.ndarray]:
+        rows = self._read_meta(path)["rows"]
+        if rows == 0:
+            return {"ts": np.empty(0, dtype=np.int64), **{c: np.empty(0) for c in OHLCV_COLUMNS}}
+        out = {"ts": np.memmap(os.path.join(path, "ts.i8"), dtype=np.int64, mode="r", shape=(rows,))}
+        for c in OHLCV_COLUMNS:
+            out[c] = np.memmap(os.path.join(path, f"{c}.f8"), dtype=np.float64, mode="r", shape=(rows,))
+        return out
+
+    def write(self, symbol: str, interval: str, df: pd.DataFrame, tz: Optional[str] = None) -> int:
+        """
+        Yeni barları ekler: son saklanan bardan eski olanlar atlanır, aynı
+        zaman damgalı bar yerinde güncellenir. Eklenen satır sayısını döndürür.
+        tz: saat dilimsiz günlük dizinin yerleştirileceği dilim (depo boşsa).
+        """
+        with self._exclusive():
+            return self._write(self._dir(symbol, interval), df, interval, tz)
+
+    @staticmethod
+    def _timestamps(df: pd.DataFrame, interval: str, stored_tz: Optional[str],
+                    tz: Optional[str]) -> Tuple[np.ndarray, Optional[str]]:
+        """
+        (UTC ns dizisi, saat dilimi). Günlük barlar kendi yerel takvim günlerine
+        indirgenip deponun (yoksa gelen tablonun, o da yoksa `tz`) diliminde
+        gece yarısına yerleştirilir; gün içi barlar olduğu gibi UTC'ye çevrilir.
+        """
+        index = pd.DatetimeIndex(df.index)
+        if interval in INTRADAY_INTERVALS:
+            tz = str(index.tz) if index.tz is not None else None
+        else:
+            tz = stored_tz or (str(index.tz) if index.tz is not None else tz)
+            index = (index.tz_localize(None) if index.tz is not None else index).normalize()
+            if tz:
+                index = index.tz_localize(tz)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        return index.as_unit("ns").asi8, tz
+
+    def _write(self, path: str, df: pd.DataFrame, interval: str = "1d", tz: Optional[str] = None) -> int:
+        os.makedirs(path, exist_ok=True)
+        meta = self._read_meta(path)
+        rows = meta["rows"]
+
+        ts, tz = self._timestamps(df, interval, meta.get("tz") if rows else None, tz)
+        order = np.argsort(ts, kind="stable")
+        ts = ts[order]
+        values = {c: df[c].to_numpy(dtype=np.float64)[order] if c in df else np.full(len(ts), np.nan)
+                  for c in OHLCV_COLUMNS}
+
+        last = self._columns(path)["ts"][-1] if rows else None
+        if last is not None:
+            same = np.flatnonzero(ts == last)
+            if same.size:
+                i = same[-1]
+                for name, dtype, arr in [("ts.i8", np.int64, ts)] + [(f"{c}.f8", np.float64, values[c]) for c in OHLCV_COLUMNS]:
+                    with open(os.path.join(path, name), "r+b") as f:
+                        f.seek((rows - 1) * 8)
+                        f.write(np.asarray(arr[i:i + 1], dtype=dtype).tobytes())
+            newer = ts > last
+        else:
+            newer = np.ones(len(ts), dtype=bool)
+        # Aynı toplu yanıttaki tekrarlanan damgalar tek satıra indirilir
+        newer &= np.concatenate([[True], np.diff(ts) > 0]) if len(ts) else newer
+
+        added = int(newer.sum())
+        if added:
+            for name, arr in [("ts.i8", ts)] + [(f"{c}.f8", values[c]) for c in OHLCV_COLUMNS]:
+                file_path = os.path.join(path, name)
+                with open(file_path, "ab") as f:
+                    f.truncate(rows * 8)    # yarım kalmış önceki eklemeyi at
+                    f.write(np.ascontiguousarray(arr[newer]).tobytes())
+        # version her yazımda artar; hizalı matrisler bununla geçersizlenir
+        meta.update(rows=rows + added, tz=meta.get("tz") or tz, version=meta.get("version", 0) + 1)
+        self._write_meta(path, meta)
+        self.appended += added
+        return added
+
+    def mark_checked(self, symbol: str, interval: str) -> None:
+        path = self._dir(symbol, interval)
+        os.makedirs(path, exist_ok=True)
+        with self._exclusive():
+            meta = self.meta(symbol, interval)
+            meta["checked_at"] = self._clock()
+            self._write_meta(path, meta)
+
+    def clear(self) -> None:
+        with self._locks_guard:
+            self._locks.clear()
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.fetches = self.appended = 0
+
+    # -------------------------------------------------------------------------
+    # UPDATE + READ
+    # -------------------------------------------------------------------------
+    def update(self, symbol: str, interval: str, max_age: Optional[float] = None) -> None:
+        """Depo `max_age` saniyeden eskiyse yalnızca eksik barları indirir."""
+        max_age = history_ttl(symbol) if max_age is None else max_age
+        with self._lock(symbol, interval):
+            meta = self.meta(symbol, interval)
+            if self._clock() - meta["checked_at"] < max_age:
+                return
+            self.fetches += 1
+            if meta["rows"]:
+                df = get_provider().history(symbol, interval=interval,
+                                            start=self._start_date(symbol, interval, meta))
+            else:
+                df = get_provider().history(symbol, interval=interval, period=STORE_BACKFILL[interval])
+            if df is not None and not df.empty:
+                self._merge(symbol, interval, df)
+            elif not meta["rows"]:
+                return          # bilinmeyen sembol: diske iz bırakma (boş sonuç bellekte önbelleklenir)
+            self.mark_checked(symbol, interval)
+
+    def _start_date(self, symbol: str, interval: str, meta: Dict[str, Any]) -> str:
+        """
+        Artımlı indirmenin başlangıcı: sondan ikinci saklanan barın (yerel) günü.
+        Bu kapanmış bar düzeltme denetimi (_adjusted) için yeniden çekilir.
+        """
+        ts = self.columns(symbol, interval)["ts"]
+        start = pd.Timestamp(int(ts[-2] if len(ts) > 1 else ts[-1]), tz="UTC")
+        if meta.get("tz"):
+            start = start.tz_convert(meta["tz"])
+        return start.strftime("%Y-%m-%d")
+
+    def _adjusted(self, symbol: str, interval: str, df: pd.DataFrame, tz: Optional[str] = None) -> bool:
+        """Yeniden çekilen kapanmış barın kapanışı saklanandan farklı mı (geriye dönük düzeltme)?"""
+        path = self._dir(symbol, interval)
+        meta = self._read_meta(path)
+        if meta["rows"] < 2 or "Close" not in df:
+            return False
+        cols = self._columns(path)
+        ts, _ = self._timestamps(df, interval, meta.get("tz"), tz)
+        hit = np.flatnonzero(ts == cols["ts"][-2])
+        if not hit.size:
+            return False
+        fresh = float(df["Close"].to_numpy(dtype=np.float64)[hit[-1]])
+        stored = float(cols["Close"][-2])
+        if np.isnan(fresh) or np.isnan(stored):
+            return False
+        return not np.isclose(fresh, stored, rtol=ADJUSTMENT_TOLERANCE, atol=0.0)
+
+    def _rebackfill(self, symbol: str, interval: str) -> bool:
+        """Sembolün saklanan derinliğini baştan indirip dosyalarını değiştirir; indirme boşsa False."""
+        depth = self.meta(symbol, interval).get("depth") or STORE_BACKFILL[interval]
+        print(f"[PriceStore] {symbol}: geçmiş geriye dönük düzeltilmiş (bölünme/temettü), {depth} yeniden indiriliyor")
+        self.fetches += 1
+        df = get_provider().history(symbol, interval=interval, period=depth)
+        if df is None or df.empty:
+            return False
+        self._rewrite(symbol, interval, df, depth, merge=False)
+        return True
+
+    def _merge(self, symbol: str, interval: str, df: pd.DataFrame, tz: Optional[str] = None) -> None:
+        """Artımlı barları ekler; kapanmış bar değişmişse önce sembolü yeniden doldurur."""
+        if self._adjusted(symbol, interval, df, tz) and self._rebackfill(symbol, interval):
+            return
+        self.write(symbol, interval, df, tz=tz)
+
+    def stale(self, symbols, interval: str, max_age: Optional[float] = None):
+        """Son kontrolü `max_age` (varsayılan: history_ttl) saniyeden eski semboller."""
+        now = self._clock()
+        return [
+            s for s in dict.fromkeys(symbols)
+            if now - self.meta(s, interval)["checked_at"] >= (history_ttl(s) if max_age is None else max_age)
+        ]
+
+    def update_many(self, symbols, interval: str = "1d", max_age: Optional[float] = None) -> int:
+        """
+        Birçok sembolü günceller; indirilen sembol sayısını döndürür.
+        Az sayıda sembol paralel update() ile, fazlası toplu indirme ile:
+        boş depolar geri doldurma penceresiyle, diğerleri en eski başlangıç gününden (_start_date) itibaren.
+        """
+        stale = self.stale(symbols, interval, max_age)
+        if len(stale) < BATCH_MIN_SYMBOLS:
+            jobs = {s: partial(self.update, s, interval, max_age) for s in stale}
+            fetched = run_parallel(jobs)
+            for s, err in fetched.errors.items():
+                print(f"[PriceStore] {s} güncellenemedi: {err}")
+            return len(fetched.results)
+
+        metas = {s: self.meta(s, interval) for s in stale}
+        empty = [s for s in stale if not metas[s]["rows"]]
+        known = [s for s in stale if metas[s]["rows"]]
+        groups = [(empty, {"period": STORE_BACKFILL[interval]})]
+        if known:
+            start = min(self._start_date(s, interval, metas[s]) for s in known)
+            groups.append((known, {"start": start}))
+
+        updated = 0
+        for group, window in groups:
+            for s, h in self._download(group, interval, **window):
+                if h is not None and not h.empty:
+                    with self._lock(s, interval):
+                        self._merge(s, interval, h, tz=exchange_tz(s))
+                elif not metas[s]["rows"]:
+                    continue
+                self.mark_checked(s, interval)
+                updated += 1
+        return updated
+
+    def _download(self, symbols, interval: str, **window):
+        """
+        (sembol, DataFrame) çiftleri: BATCH_CHUNK_SIZE'lık toplu indirme istekleriyle.
+        İndirme hatası olan parçanın sembolleri atlanır; veri gelmeyenler None.
+        """
+        for i in range(0, len(symbols), BATCH_CHUNK_SIZE):
+            chunk = symbols[i:i + BATCH_CHUNK_SIZE]
+            try:
+                df = get_provider().download(chunk, interval=interval, **window)
+            except Exception as e:
+                print(f"[PriceStore] Toplu indirme hatası ({len(chunk)} sembol): {e}")
+                continue
+            self.fetches += 1
+            split = _split_frame(df, chunk)
+            for s in chunk:
+                yield s, split.get(s)
+
+    # -------------------------------------------------------------------------
+    # DEPTH
+    # -------------------------------------------------------------------------
+    def depth_days(self, symbol: str, interval: str) -> int:
+        """Saklanan geçmişin derinliği (gün): son geri doldurma/derinleştirme penceresi."""
+        meta = self.meta(symbol, interval)
+        return PERIOD_DAYS[meta.get("depth") or STORE_BACKFILL[interval]] if meta["rows"] else 0
+
+    def ensure_depth(self, symbols, period: str, interval: str = "1d") -> int:
+        """
+        Geçmişi `period`'dan sığ olan sembolleri bir kez derin indirir ve dosyalarını
+        yeniden yazar (eski dosyaların yeni barları korunur). Derinleştirilen sembol sayısı.
+        """
+        need = [s for s in dict.fromkeys(symbols) if self.depth_days(s, interval) < PERIOD_DAYS[period]]
+        deepened = 0
+        for s, h in self._download(need, interval, period=period):
+            if h is None or h.empty:
+                continue
+            with self._lock(s, interval):
+                self._rewrite(s, interval, h, period)
+            deepened += 1
+        return deepened
+
+    def _rewrite(self, symbol: str, interval: str, df: pd.DataFrame, depth: str, merge: bool = True) -> None:
+        """
+        Derin indirme + mevcut dosyaların daha yeni barları → yeni dizin, sonra yer değiştirme.
+        merge=False: mevcut barlar alınmaz (düzeltilmiş geçmiş eskisinin yerine geçer).
+        """
+        path = self._dir(symbol, interval)
+        tmp, old = path + ".rewrite", path + ".old"
+        with self._exclusive():
+            shutil.rmtree(tmp, ignore_errors=True)
+            shutil.rmtree(old, ignore_errors=True)
+            previous = self._read_meta(path)
+            # Saat dilimsiz derin indirme mevcut dosyaların diliminde yazılır
+            self._write(tmp, df, interval, previous.get("tz") or exchange_tz(symbol))
+            if merge and previous["rows"]:
+                self._write(tmp, self.frame(symbol, interval), interval)
+            meta = self._read_meta(tmp)
+            meta.update(checked_at=previous["checked_at"], depth=depth,
+                        version=previous.get("version", 0) + meta["version"])
+            self._write_meta(tmp, meta)
+            if os.path.exists(path):
+                os.replace(path, old)
+            os.replace(tmp, path)
+            shutil.rmtree(old, ignore_errors=True)
+
+    def frame(self, symbol: str, interval: str, period: Optional[str] = None) -> pd.DataFrame:
+        """Saklanan barlardan `period` penceresi (yfinance history biçiminde); None: tümü."""
+        cols = self.columns(symbol, interval)
+        if len(cols["ts"]) == 0:
+            return pd.DataFrame()
+        tz = self.meta(symbol, interval).get("tz")
+        start = _window_start(cols["ts"], period, interval, tz) if period else 0
+        index = pd.DatetimeIndex(np.array(cols["ts"][start:]).view("datetime64[ns]"),
+                                 name="Datetime" if interval in INTRADAY_INTERVALS else "Date")
+        if tz:
+            index = index.tz_localize("UTC").tz_convert(tz)
+        return pd.DataFrame({c: np.array(cols[c][start:]) for c in OHLCV_COLUMNS}, index=index)
+
+    def history(self, symbol: str, period: str, interval: str = "1d") -> pd.DataFrame:
+        self.update(symbol, interval)
+        return self.frame(symbol, interval, period)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"fetches": self.fetches, "appended": self.appended}
+
+
+_store: Optional[PriceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Süreç genelinde tek PriceStore (CACHE_DIR/prices)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PriceStore(os.path.join(CACHE_DIR, PRICE_STORE_DIR))
+    return _store
@@ -0,0 +1,163 @@
+"""
+LLM Rate Limiting
+=================
+Token-bucket limiter per LLM provider.
+
+Her düğümde sabit RATE_LIMIT_DELAY uykusu yerine sağlayıcı başına bir kova
+tutulur: kova doluyken istek hiç beklemez, bütçe tükenince yalnızca bir
+sonraki jetona kadar beklenir. Eşzamanlı istekler kovadan sırayla jeton
+ayırır (rezervasyon), böylece toplam hız süreç genelinde sınırlanır.
+
+LLM_RATE_LIMIT_DIR verilirse kova durumu bu dizindeki bir dosyada
+(fcntl kilidiyle) tutulur ve aynı makinedeki tüm gunicorn worker'ları
+ortak bütçeyi paylaşır. fcntl olmayan platformlarda süreç içi kovaya düşülür.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+try:
+    import fcntl
+except ImportError:          # Windows: worker'lar arası paylaşım yok
+    fcntl = None
+
+
+# (dakikada istek, patlama kapasitesi); ücretsiz katman sınırlarının altında
+LLM_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "openrouter": (20, 4),
+    "gemini": (10, 2),
+}
+LLM_RATE_LIMIT_DEFAULT = (30, 4)
+# "rpm" ya da "rpm/patlama": tüm sağlayıcılar için tablo yerine kullanılır
+LLM_RATE_LIMIT = os.getenv("LLM_RATE_LIMIT", "")
+LLM_RATE_LIMIT_DIR = os.getenv("LLM_RATE_LIMIT_DIR", "")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. reserve() jetonu hemen ayırır ve gereken
+    bekleme süresini döndürür; acquire() bu süre kadar uyur.
+    """
+
+    def __init__(self, rate: float, burst: float = 1, clock: Callable[[], float] = time.monotonic,
+                 name: str = ""):
+        self.rate = rate             # saniyede jeton
+        self.burst = burst
+        self.name = name
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.delayed = 0
+        self.total_delay = 0.0
+
+    def _take(self, tokens: float, updated: float, now: float, n: float) -> float:
+        """Dolumdan sonra n jeton düşülmüş bakiye (negatif: sıradaki rezervasyonlar)."""
+        return min(self.burst, tokens + max(0.0, now - updated) * self.rate) - n
+
+    def _reserve(self, n: float) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = self._take(self._tokens, self._updated, now, n)
+            self._updated = now
+            return max(0.0, -self._tokens / self.rate)
+
+    def reserve(self, n: float = 1) -> float:
+        """n jeton ayırır; kullanılabilir olana kadar beklenecek süre (saniye)."""
+        delay = self._reserve(n)
+        with self._lock:
+            self.acquired += 1
+            if delay > 0:
+                self.delayed += 1
+                self.total_delay += delay
+        return delay
+
+    def acquire(self, n: float = 1) -> float:
+        """Gerekirse bekler; eklenen kuyruk gecikmesini döndürür."""
+        delay = self.reserve(n)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def aacquire(self, n: float = 1) -> float:
+        delay = self.reserve(n)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "total_delay": round(self.total_delay, 3),
+        }
+
+
+class SharedTokenBucket(TokenBucket):
+    """Durumu dosyada tutulan kova; aynı dosyayı açan süreçler bütçeyi paylaşır."""
+
+    def __init__(self, path: str, rate: float, burst: float = 1, clock: Callable[[], float] = time.time,
+                 name: str = ""):
+        super().__init__(rate, burst, clock, name)
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def _reserve(self, n: float) -> float:
+        with self._lock, open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                now = self._clock()
+                tokens = self._take(state.get("tokens", self.burst), state.get("updated", now), now, n)
+                f.seek(0)
+                f.truncate()
+                json.dump({"tokens": tokens, "updated": now}, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return max(0.0, -tokens / self.rate)
+
+
+def _limits(provider: str) -> Tuple[float, float]:
+    if LLM_RATE_LIMIT:
+        rpm, _, burst = LLM_RATE_LIMIT.partition("/")
+        return float(rpm), float(burst or 1)
+    return LLM_RATE_LIMITS.get(provider, LLM_RATE_LIMIT_DEFAULT)
+
+
+def make_limiter(provider: str, shared_dir: str = LLM_RATE_LIMIT_DIR) -> TokenBucket:
+    rpm, burst = _limits(provider)
+    if shared_dir and fcntl is not None:
+        return SharedTokenBucket(os.path.join(shared_dir, f"llm-{provider}.bucket"), rpm / 60, burst, name=provider)
+    if shared_dir:
+        print("[RateLimit] fcntl yok; worker'lar arası paylaşım kapalı, süreç içi kova kullanılıyor")
+    return TokenBucket(rpm / 60, burst, name=provider)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str) -> TokenBucket:
+    """Sağlayıcı başına süreç genelinde tek kova."""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(provider)
+            if limiter is None:
+                limiter = _limiters[provider] = make_limiter(provider)
+    return limiter
+
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
@@ -0,0 +1,292 @@
+"""
+BIST Screener
+=============
+Full-universe screener over a columnar snapshot of the latest indicators.
+
+Evren (sembol → sektör) tools/data/bist_universe.csv dosyasından okunur.
+Kapsam kısmidir (~270 sembol, BIST'in tamamı değil); dosyada olmayan
+hisseler tarama ve sektör sonuçlarında yer almaz.
+Snapshot her sembol için tek satırlık sütunlar tutar (fiyat, 1 aylık getiri,
+RSI, volatilite, hacim z-skoru); fiyat deposundaki hizalı, memory-mapped
+kapanış/hacim matrislerinden BATCH_CHUNK_SIZE'lık satır bloklarıyla hesaplanır. Sorgular ("RSI < 30 bankalar", "en iyi 5 momentum")
+vektörel maskeler ve argpartition ile milisaniyeler içinde yanıtlanır.
+Snapshot istek yolunda kurulmaz: start_refresh / refresh_in_background
+arka planda kurar, screen_stocks henüz hiç kurulmadıysa "warming up" döner.
+"""
+
+import csv
+import os
+import threading
+import time
+import warnings
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from tools.batch import BATCH_CHUNK_SIZE
+from tools.indicators import snapshot
+from tools.price_matrix import load_matrix
+from tools.symbol_index import normalize_tr
+
+
+UNIVERSE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "bist_universe.csv")
+SCREENER_PERIOD = "3mo"      # RSI ısınması için ~60 bar
+MOMENTUM_WINDOW = 21         # getiri penceresi (bar) ≈ 1 ay
+VOLUME_WINDOW = 20           # hacim z-skoru için önceki bar sayısı
+SCREENER_TTL = 15 * 60       # saniye; bu süreden eski snapshot sorguda yenilenir
+REFRESH_INTERVAL = 15 * 60   # arka plan yenileme aralığı
+
+# Sıralama anahtarı → snapshot sütunu
+SORT_KEYS = {
+    "momentum": "ret",
+    "getiri": "ret",
+    "rsi": "rsi",
+    "volatilite": "volatility",
+    "volatility": "volatility",
+    "hacim": "volume_z",
+    "volume": "volume_z",
+}
+
+
+def load_universe(path: str = UNIVERSE_FILE) -> Dict[str, str]:
+    """CSV'den yfinance sembolü (.IS) → sektör eşlemesi. '#' ile başlayan satırlar yorumdur."""
+    with open(path, encoding="utf-8") as f:
+        rows = csv.DictReader(line for line in f if not line.startswith("#"))
+        return {f"{r['symbol'].strip().upper()}.IS": r["sector"].strip() for r in rows if r.get("symbol")}
+
+
+class IndicatorSnapshot(NamedTuple):
+    """Evrenin sütunsal göstergeleri; tüm diziler (N,) ve aynı sembol sırasında."""
+    symbols: np.ndarray          # str
+    sector_codes: np.ndarray     # int, sector_names dizinine
+    sector_names: List[str]
+    price: np.ndarray
+    ret: np.ndarray              # MOMENTUM_WINDOW barlık % getiri
+    rsi: np.ndarray
+    volatility: np.ndarray
+    volume_z: np.ndarray
+    updated_at: float
+
+
+def _block_indicators(closes: np.ndarray, volumes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Bir satır bloğunun göstergeleri. closes ileri doldurulmuş, volumes ham;
+    ikisi de (semboller, zaman). Verisi olmayan semboller NaN.
+    """
+    n = len(closes)
+    out = {k: np.full(n, np.nan) for k in ("price", "ret", "rsi", "volatility", "volume_z")}
+    rows = np.flatnonzero(~np.isnan(closes[:, -1])) if closes.shape[1] else np.empty(0, dtype=int)
+    if rows.size == 0:
+        return out
+
+    c = np.asarray(closes[rows])
+    snap = snapshot(c)
+    out["price"][rows] = snap["price"]
+    out["rsi"][rows] = snap["rsi"]
+    out["volatility"][rows] = snap["volatility"]
+    if c.shape[1] > MOMENTUM_WINDOW:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["ret"][rows] = (c[:, -1] / c[:, -1 - MOMENTUM_WINDOW] - 1) * 100
+    else:
+        out["ret"][rows] = snap["change_pct"]
+
+    v = np.asarray(volumes[rows])
+    if v.shape[1] > 2:
+        hist = v[:, -1 - VOLUME_WINDOW:-1]
+        with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nanmean(hist, axis=1)
+            std = np.nanstd(hist, axis=1, ddof=1)
+            z = (v[:, -1] - mean) / std
+        out["volume_z"][rows] = np.where(np.isfinite(z), z, np.nan)
+    return out
+
+
+def build_snapshot(universe: Dict[str, str], chunk_size: int = BATCH_CHUNK_SIZE) -> IndicatorSnapshot:
+    """
+    Evreni fiyat deposunda günceller (bayatlar toplu indirilir) ve hizalı
+    matrislerden sütunsal snapshot üretir (HISTORY_CACHE kullanılmaz).
+    Matrisler memmap'tir; bellekte aynı anda yalnızca bir blok bulunur.
+    """
+    symbols = list(universe)
+    sector_names = sorted(set(universe.values()))
+    code_of = {name: i for i, name in enumerate(sector_names)}
+    columns = {k: np.full(len(symbols), np.nan) for k in ("price", "ret", "rsi", "volatility", "volume_z")}
+
+    closes = load_matrix(symbols, "Close", period=SCREENER_PERIOD, ffill=True).values
+    volumes = load_matrix(symbols, "Volume", period=SCREENER_PERIOD, refresh=False).values
+    for start in range(0, len(symbols), chunk_size):
+        block = slice(start, start + chunk_size)
+        for key, values in _block_indicators(closes[block], volumes[block]).items():
+            columns[key][block] = values
+
+    return IndicatorSnapshot(
+        symbols=np.array(symbols),
+        sector_codes=np.array([code_of[universe[s]] for s in symbols], dtype=np.int32),
+        sector_names=sector_names,
+        updated_at=time.time(),
+        **columns,
+    )
+
+
+def top_k(values: np.ndarray, k: int, descending: bool = True) -> np.ndarray:
+    """En büyük (veya küçük) k değerin dizinleri, sıralı. NaN'lar dahil edilmez."""
+    idx = np.flatnonzero(~np.isnan(values))
+    if k <= 0 or idx.size == 0:
+        return idx[:0]
+    keys = -values[idx] if descending else values[idx]
+    if idx.size > k:
+        part = np.argpartition(keys, k - 1)[:k]
+        idx, keys = idx[part], keys[part]
+    return idx[np.argsort(keys, kind="stable")]
+
+
+class Screener:
+    """Holds the universe snapshot and answers filter/top-k queries."""
+
+    def __init__(self, universe: Optional[Dict[str, str]] = None, ttl: float = SCREENER_TTL):
+        self._universe = universe
+        self.ttl = ttl
+        self._snapshot: Optional[IndicatorSnapshot] = None
+        self._lock = threading.Lock()
+        self._background: Optional[threading.Thread] = None
+        self._background_lock = threading.Lock()
+
+    @property
+    def universe(self) -> Dict[str, str]:
+        if self._universe is None:
+            self._universe = load_universe()
+        return self._universe
+
+    def sectors(self) -> List[str]:
+        return sorted(set(self.universe.values()))
+
+    def sector_symbols(self, sector: str) -> List[str]:
+        """Sektör adına (Türkçe karakter duyarsız, kısmi) uyan semboller."""
+        name = self.match_sector(sector)
+        return [s for s, sec in self.universe.items() if sec == name] if name else []
+
+    def match_sector(self, sector: str) -> Optional[str]:
+        key = normalize_tr(sector)
+        if not key:
+            return None
+        names = self.sectors()
+        for name in names:
+            if normalize_tr(name) == key:
+                return name
+        return next((n for n in names if normalize_tr(n) in key or key in normalize_tr(n)), None)
+
+    def refresh(self) -> IndicatorSnapshot:
+        """Snapshot'ı yeniden kurar; eşzamanlı çağrılar tek yenilemeyi bekler."""
+        started = time.time()
+        with self._lock:
+            if self._snapshot is not None and self._snapshot.updated_at >= started:
+                return self._snapshot
+            snap = build_snapshot(self.universe)
+            self._snapshot = snap
+        valid = int(np.isfinite(snap.price).sum())
+        print(f"[Screener] {valid}/{len(snap.symbols)} sembol, {time.time() - started:.1f}s")
+        return snap
+
+    def refresh_in_background(self) -> bool:
+        """Snapshot'ı istek yolunun dışında yeniler; zaten yenileniyorsa yeni iş başlatmaz."""
+        with self._background_lock:
+            if self._background is not None and self._background.is_alive():
+                return False
+
+            def _run():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"[Screener] Yenileme hatası: {e}")
+
+            self._background = threading.Thread(target=_run, name="screener-warmup", daemon=True)
+            self._background.start()
+            return True
+
+    @property
+    def ready(self) -> bool:
+        """En az bir kez kurulmuş (bayat olsa da) snapshot var mı?"""
+        return self._snapshot is not None
+
+    def snapshot(self, max_age: Optional[float] = None) -> IndicatorSnapshot:
+        snap = self._snapshot
+        max_age = self.ttl if max_age is None else max_age
+        if snap is None or time.time() - snap.updated_at > max_age:
+            snap = self.refresh()
+        return snap
+
+    def is_fresh(self) -> bool:
+        snap = self._snapshot
+        return snap is not None and time.time() - snap.updated_at <= self.ttl
+
+    def query(self, sector: Optional[str] = None,
+              rsi_below: Optional[float] = None, rsi_above: Optional[float] = None,
+              min_return: Optional[float] = None, max_return: Optional[float] = None,
+              min_volume_z: Optional[float] = None,
+              sort_by: str = "momentum", top: int = 5, ascending: bool = False,
+              max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Filtrelerin hepsine uyan sembollerden sort_by'a göre ilk `top` tanesi."""
+        snap = self.snapshot(max_age)
+        mask = np.isfinite(snap.price)
+        if sector:
+            name = self.match_sector(sector)
+            if name is None:
+                return {"err": f"Unknown sector. Available: {snap.sector_names}"}
+            mask &= snap.sector_codes == snap.sector_names.index(name)
+        # NaN karşılaştırmaları False döner; eksik gösterge filtreyi geçmez
+        if rsi_below is not None:
+            mask &= snap.rsi < rsi_below
+        if rsi_above is not None:
+            mask &= snap.rsi > rsi_above
+        if min_return is not None:
+            mask &= snap.ret >= min_return
+        if max_return is not None:
+            mask &= snap.ret <= max_return
+        if min_volume_z is not None:
+            mask &= snap.volume_z >= min_volume_z
+
+        column = getattr(snap, SORT_KEYS.get(sort_by.lower(), "ret"))
+        ranked = top_k(np.where(mask, column, np.nan), top, descending=not ascending)
+        return {
+            "matches": int(mask.sum()),
+            "universe": len(snap.symbols),
+            "rows": [{
+                "s": snap.symbols[i].replace(".IS", ""),
+                "sector": snap.sector_names[snap.sector_codes[i]],
+                "p": round(float(snap.price[i]), 2),
+                "chg": f"{snap.ret[i]:+.1f}%" if np.isfinite(snap.ret[i]) else "-",
+                "rsi": round(float(snap.rsi[i]), 0) if np.isfinite(snap.rsi[i]) else "-",
+                "vol": round(float(snap.volatility[i]), 1) if np.isfinite(snap.volatility[i]) else "-",
+                "vz": round(float(snap.volume_z[i]), 1) if np.isfinite(snap.volume_z[i]) else "-",
+            } for i in ranked],
+        }
+
+
+_screener: Optional[Screener] = None
+_screener_lock = threading.Lock()
+
+
+def get_screener() -> Screener:
+    """Süreç genelinde tek Screener."""
+    global _screener
+    if _screener is None:
+        with _screener_lock:
+            if _screener is None:
+                _screener = Screener()
+    return _screener
+
+
+def start_refresh(interval: float = REFRESH_INTERVAL) -> threading.Thread:
+    """Snapshot'ı arka planda kurar ve `interval` saniyede bir yeniler (istek yolunun dışında)."""
+    def _loop():
+        while True:
+            try:
+                get_screener().refresh()
+            except Exception as e:
+                print(f"[Screener] Yenileme hatası: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=_loop, name="screener-refresh", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,155 @@
+"""
+Lexicon Sentiment
+=================
+Compiled-lexicon sentiment scoring for Turkish financial headlines.
+
+Sözlük, ortak önekleri birleştirilmiş (trie) tek bir regex'e derlenir ve
+Türkçe karakterleri indirgenmiş metinde kelime başından eşleşir ("düşüşe",
+"Yükselişle" → kök eşleşmesi). Kök olarak başka kelimelerin önüne denk gelen
+kısa terimler (kâr → "kararı", "karşı"; boğa → "Boğaziçi") yalnızca
+TERM_FORMS'taki çekimli biçimleriyle tam kelime eşleşir. Her eşleşme sayılır; skor = olumlu - olumsuz.
+Toplu skorlamada tüm başlıklar tek metinde birleştirilip tek geçişte taranır.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Tuple
+
+from tools.symbol_index import fold_tr
+
+
+POSITIVE_TERMS = (
+    "yükseliş", "artış", "rekor", "kâr", "olumlu", "boğa", "kazanç",
+    "fırsat", "büyüme", "ralli",
+)
+NEGATIVE_TERMS = (
+    "düşüş", "zarar", "kriz", "risk", "olumsuz", "ayı", "kayıp",
+    "satış", "kaybetti", "geriledi",
+)
+# Kök olarak eşleşirse yanlış pozitif veren kısa terimler yalnızca tam kelime eşleşir
+# ("ayı" → "ayında" sayılmasın)
+WHOLE_WORD_TERMS = ("ayı",)
+# Kökü başka kelimelerin öneki olan terimler: yalnızca bu çekimler (tam kelime) sayılır.
+# "kâra"/"kârda" biçimleri "kara" (siyah) ve "karda" (yağan kar) ile karıştığından listede yok.
+TERM_FORMS: Dict[str, Tuple[str, ...]] = {
+    "kâr": ("kâr", "kârı", "kârın", "kârını", "kârlar", "kârları", "kârlarını",
+            "kârlı", "kârlılık", "kârlılığı", "kârlılığını"),
+    "boğa": ("boğa", "boğası", "boğaya", "boğanın", "boğalar", "boğaları"),
+}
+
+
+class SentimentScore(NamedTuple):
+    positive: int
+    negative: int
+
+    @property
+    def score(self) -> int:
+        return self.positive - self.negative
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Terimleri ortak önekleri paylaşan, en uzunu tercih eden bir regex'e çevirir."""
+    root: Dict[str, Any] = {}
+    for term in terms:
+        node = root
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, Any]) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            return ("(?:" + body + ")" if len(alts) == 1 else body) + "?"
+        return body
+
+    return emit(root)
+
+
+class Lexicon:
+    """Positive/negative term lists compiled into a single regex."""
+
+    def __init__(self, positive: Iterable[str] = POSITIVE_TERMS,
+                 negative: Iterable[str] = NEGATIVE_TERMS,
+                 whole_word: Iterable[str] = WHOLE_WORD_TERMS,
+                 forms: Mapping[str, Iterable[str]] = TERM_FORMS):
+        self.polarity: Dict[str, int] = {}
+        for term in positive:
+            self.polarity[fold_tr(term)] = 1
+        for term in negative:
+            self.polarity[fold_tr(term)] = -1
+        exact = {fold_tr(t) for t in whole_word}
+        # Çekim listesi olan terimin kökü yerine biçimleri tam kelime eşleşir
+        for term, variants in forms.items():
+            sign = self.polarity.pop(fold_tr(term), None)
+            if sign is None:
+                continue
+            for variant in variants:
+                self.polarity[fold_tr(variant)] = sign
+                exact.add(fold_tr(variant))
+        stems = [t for t in self.polarity if t not in exact]
+        alternatives = [_trie_pattern(stems)] if stems else []
+        if exact & self.polarity.keys():
+            alternatives.insert(0, _trie_pattern(exact & self.polarity.keys()) + r"\b")
+        body = r"\b(?:" + "|".join(alternatives) + ")"
+        self._pattern = re.compile(body)
+        # Toplu tarama: satır sonu da bir "token"dır, başlık sınırını işaretler
+        self._batch_pattern = re.compile(r"\n|" + body)
+
+    def score(self, text: str) -> SentimentScore:
+        """Tek metnin olumlu/olumsuz eşleşme sayıları."""
+        pos = neg = 0
+        polarity = self.polarity
+        for term in self._pattern.findall(fold_tr(text)):
+            if polarity[term] > 0:
+                pos += 1
+            else:
+                neg += 1
+        return SentimentScore(pos, neg)
+
+    def score_batch(self, texts: Iterable[str]) -> List[SentimentScore]:
+        """Metinleri tek taramada skorlar; sıra korunur."""
+        texts = [t.replace("\n", " ") for t in texts]
+        if not texts:
+            return []
+        polarity = self.polarity
+        pos, neg = [0] * len(texts), [0] * len(texts)
+        i = 0
+        for term in self._batch_pattern.findall(fold_tr("\n".join(texts))):
+            if term == "\n":
+                i += 1
+            elif polarity[term] > 0:
+                pos[i] += 1
+            else:
+                neg[i] += 1
+        return [SentimentScore(p, n) for p, n in zip(pos, neg)]
+
+
+def label(score: int) -> str:
+    return "OLUMLU" if score > 0 else "OLUMSUZ" if score < 0 else "NÖTR"
+
+
+def aggregate(scores: Iterable[SentimentScore]) -> Dict[str, Any]:
+    """Başlık skorlarından toplam skor ve etiket."""
+    scores = list(scores)
+    pos = sum(s.positive for s in scores)
+    neg = sum(s.negative for s in scores)
+    return {
+        "sentiment": label(pos - neg),
+        "score": pos - neg,
+        "positive": pos,
+        "negative": neg,
+        "headlines": [s.score for s in scores],
+    }
+
+
+DEFAULT_LEXICON = Lexicon()
+
+
+def score_headline(text: str) -> SentimentScore:
+    return DEFAULT_LEXICON.score(text)
+
+
+def score_headlines(texts: Iterable[str]) -> List[SentimentScore]:
+    return DEFAULT_LEXICON.score_batch(texts)
@@ -0,0 +1,163 @@
+"""
+Symbol Index
+============
+Prebuilt lookup structure for resolve_symbol.
+
+Üç katman, hepsi Türkçe karakterleri normalize edilmiş anahtarlar üzerinde:
+1. exact    → hash tablosu, O(1)
+2. contains → sorgunun İÇİNDE geçen en uzun takma ad (Aho-Corasick, O(len(sorgu)))
+3. partial  → sorgunun bir PARÇASI olduğu en kısa takma ad (alt-dizgi tablosu, O(1))
+
+Sonuçlar deterministiktir: eşit uzunlukta adaylarda önce konum, sonra
+alfabetik sıra belirleyicidir.
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+# Bu uzunluğun altındaki sorgular partial katmanına girmez ("a" → altın olmasın)
+MIN_PARTIAL_LEN = 3
+
+# Büyük İ/I, lower()'dan önce indirgenir ("İ".lower() iki karakterdir)
+_TR_UPPER = (("İ", "i"), ("I", "i"))
+# Şapkalı ünlüler de indirgenir: "kâr" çoğu başlıkta "kar" diye yazılır
+_TR_LOWER = (("ı", "i"), ("ş", "s"), ("ğ", "g"), ("ü", "u"), ("ö", "o"), ("ç", "c"),
+             ("â", "a"), ("î", "i"), ("û", "u"))
+
+
+def fold_tr(text: str) -> str:
+    """Türkçe karakterleri ASCII karşılıklarına indirger ve küçük harf yapar (uzunluk korunur)."""
+    # Zincirlenmiş str.replace, dict tabanlı str.translate'ten uzun metinlerde ~10x hızlıdır
+    for a, b in _TR_UPPER:
+        text = text.replace(a, b)
+    text = text.lower()
+    for a, b in _TR_LOWER:
+        text = text.replace(a, b)
+    return text
+
+
+def normalize_tr(text: str) -> str:
+    """fold_tr + tek boşluk."""
+    return " ".join(fold_tr(text).split())
+
+
+class SymbolIndex:
+    """Alias → symbol index with exact, Aho-Corasick containment and partial tiers."""
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None):
+        self._exact: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._dirty = True
+        # Aho-Corasick otomatı
+        self._goto: List[Dict[str, int]] = []
+        self._fail: List[int] = []
+        self._best: List[Optional[str]] = []
+        # Alt-dizgi → en kısa takma ad
+        self._partial: Dict[str, str] = {}
+        for alias, symbol in (aliases or {}).items():
+            key = normalize_tr(alias)
+            if key:
+                self._exact.setdefault(key, symbol)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def __contains__(self, alias: str) -> bool:
+        return normalize_tr(alias) in self._exact
+
+    def add(self, alias: str, symbol: str) -> None:
+        """Takma ad ekler/günceller; otomat bir sonraki aramada yeniden kurulur."""
+        key = normalize_tr(alias)
+        if not key:
+            return
+        with self._lock:
+            self._exact[key] = symbol
+            self._dirty = True
+
+    # -------------------------------------------------------------------------
+    # BUILD
+    # -------------------------------------------------------------------------
+    def _build(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        best: List[Optional[str]] = [None]
+        for key in self._exact:
+            node = 0
+            for ch in key:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    best.append(None)
+                node = nxt
+            best[node] = key
+
+        # Failure linkleri (BFS); her düğüm, sonek zincirindeki en uzun takma adı tutar
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                inherited = best[fail[child]]
+                if best[child] is None or (inherited and len(inherited) > len(best[child])):
+                    best[child] = inherited
+
+        partial: Dict[str, str] = {}
+        for key in sorted(self._exact, key=lambda k: (len(k), k)):
+            for i in range(len(key)):
+                for j in range(i + MIN_PARTIAL_LEN, len(key) + 1):
+                    partial.setdefault(key[i:j], key)
+
+        self._goto, self._fail, self._best, self._partial = goto, fail, best, partial
+        self._dirty = False
+
+    def _ensure_built(self) -> None:
+        if self._dirty:
+            with self._lock:
+                if self._dirty:
+                    self._build()
+
+    # -------------------------------------------------------------------------
+    # LOOKUP
+    # -------------------------------------------------------------------------
+    def longest_contained(self, text: str) -> Optional[str]:
+        """Metin içinde geçen en uzun takma ad (eşitlikte en soldaki)."""
+        self._ensure_built()
+        goto, fail, best = self._goto, self._fail, self._best
+        node, found = 0, None
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            alias = best[node]
+            if alias and (found is None or len(alias) > len(found)):
+                found = alias
+        return found
+
+    def lookup(self, query: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Sorguyu çözümler.
+        Returns: (symbol, eşleşen takma ad, katman) veya None
+        """
+        key = normalize_tr(query)
+        if not key:
+            return None
+        symbol = self._exact.get(key)
+        if symbol:
+            return symbol, key, "exact"
+
+        alias = self.longest_contained(key)
+        if alias:
+            return self._exact[alias], alias, "contains"
+
+        alias = self._partial.get(key) if len(key) >= MIN_PARTIAL_LEN else None
+        if alias:
+            return self._exact[alias], alias, "partial"
+        return None
@@ -0,0 +1,111 @@
+"""
+Tavily Search Cache
+===================
+Short-lived result cache and single-flight layer for Tavily news searches.
+
+Tavily "advanced" araması hem yavaş hem ücretlidir; aynı dakika içinde
+beş kullanıcı altını sorduğunda tek istek yeterlidir.
+- Sorgular normalize edilir ("Altın  Haberleri" == "altin haberleri").
+- Sonuçlar TAVILY_TTL boyunca bellekte tutulur.
+- Uçuştaki aynı sorguya gelen çağrılar (sync veya async) o isteği bekler.
+- İstemciler API anahtarı başına bir kez kurulur.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict
+
+from tools.cache import TTLCache
+from tools.parallel import SingleFlight
+from tools.symbol_index import normalize_tr
+
+
+TAVILY_TTL = 120             # saniye; haber akışı için yeterince taze
+TAVILY_CACHE_SIZE = 256
+
+TAVILY_SEARCH_ARGS = dict(
+    search_depth="advanced",
+    topic="news",
+    max_results=5,
+    include_answer=False,
+    include_images=False
+)
+
+TAVILY_CACHE = TTLCache(maxsize=TAVILY_CACHE_SIZE)
+_flight = SingleFlight()
+
+_clients: Dict[str, Any] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Önbellek anahtarı: Türkçe karakterler indirgenmiş, küçük harf, tek boşluk."""
+    return normalize_tr(query)
+
+
+def get_tavily_client(api_key: str):
+    """API anahtarı başına tek TavilyClient (requests oturumu yeniden kullanılır)."""
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                from tavily import TavilyClient
+                client = _clients[api_key] = TavilyClient(api_key=api_key)
+    return client
+
+
+def get_async_tavily_client(api_key: str):
+    """Çalışan event loop ve API anahtarı başına tek AsyncTavilyClient."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        per_loop = _async_clients.setdefault(loop, {})
+        client = per_loop.get(api_key)
+        if client is None:
+            from tavily import AsyncTavilyClient
+            client = per_loop[api_key] = AsyncTavilyClient(api_key=api_key)
+    return client
+
+
+async def aclose_async_clients() -> None:
+    """Mevcut loop'un AsyncTavilyClient'larını kapatır (loop kapanmadan önce çağrılmalı)."""
+    with _clients_lock:
+        per_loop = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in per_loop.values():
+        await client.close()
+
+
+def search(query: str, api_key: str) -> Dict[str, Any]:
+    """Önbellekli Tavily haber araması. Hatalar önbelleğe yazılmaz, çağırana iletilir."""
+    key = normalize_query(query)
+    found, response = TAVILY_CACHE.get(key)
+    if found:
+        return response
+
+    def _fetch():
+        response = get_tavily_client(api_key).search(query=query, **TAVILY_SEARCH_ARGS)
+        TAVILY_CACHE.set(key, response, TAVILY_TTL)
+        return response
+
+    return _flight.do(key, _fetch)
+
+
+async def asearch(query: str, api_key: str) -> Dict[str, Any]:
+    """search() ile aynı önbellek ve single-flight, AsyncTavilyClient ile."""
+    key = normalize_query(query)
+    found, response = TAVILY_CACHE.get(key)
+    if found:
+        return response
+
+    async def _fetch():
+        response = await get_async_tavily_client(api_key).search(query=query, **TAVILY_SEARCH_ARGS)
+        TAVILY_CACHE.set(key, response, TAVILY_TTL)
+        return response
+
+    return await _flight.ado(key, _fetch)
+
+
+def search_stats() -> Dict[str, Any]:
+    return {**TAVILY_CACHE.stats(), "shared_in_flight": _flight.shared}
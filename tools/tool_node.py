@@ -0,0 +1,298 @@
+"""
+Agent Tool Node
+===============
+ToolNode with per-call timeouts, timing and result memoization.
+
+Modelin tek yanıtta ürettiği tool çağrıları (ör. analyze_stock + get_news +
+get_forex) aynı anda çalışır; tur en yavaş çağrı kadar sürer, toplamı kadar değil.
+- Her çağrının kendi süre sınırı vardır (TOOL_TIMEOUTS, yoksa TOOL_CALL_TIMEOUT);
+  süresi dolan çağrı beklenmez, yerine hata içeren bir ToolMessage döner.
+- ToolMessage'lar modelin çağrı sırasıyla döner (tamamlanma sırası değil).
+- Her ToolMessage'ın response_metadata'sına "elapsed_ms" eklenir.
+
+Senkron yolda çağrılar paylaşılan tool havuzunda (tools.parallel) çalışır;
+süresi dolan gövde arka planda biter, sonucu önbelleğe yine yazılır.
+
+ParallelToolNode, ToolNode'un çağrı başına kancalarını (_run_one/_arun_one)
+genişletir. Bunlar özel API'dir; requirements.txt langgraph-prebuilt'i 1.x
+aralığına sabitler ve imza değişirse modül yüklenirken açık bir hata verilir.
+
+ToolMemo (isteğe bağlı): sonuçlar (tool adı, kanonik argümanlar) anahtarıyla
+süreç genelinde tutulur. Reflection'ın geri gönderdiği turda ya da başka bir
+kullanıcının saniyeler sonraki aynı sorusunda çağrı anında yanıtlanır.
+Aynı turda iki kez üretilen çağrı tek çalıştırmada birleşir (SingleFlight).
+Tazelik tool başına TOOL_FRESHNESS ile belirlenir; tabloda olmayan tool'lar
+ve hata sonuçları saklanmaz.
+"""
+
+import asyncio
+import contextvars
+import inspect
+import json
+import threading
+import time
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Union
+
+from langchain_core.messages import ToolMessage
+from langgraph.prebuilt import ToolNode
+
+from tools.cache import CACHE_TTL_CLOSED, CACHE_TTL_OPEN, TTLCache, history_ttl, market_for_symbol
+from tools.parallel import SingleFlight, get_tool_executor
+
+
+TOOL_CALL_TIMEOUT = 30.0     # saniye; tek tool çağrısı için varsayılan sınır
+# Tüm evreni tarayan / çok sembollü tool'lar soğuk önbellekte daha uzun sürer
+TOOL_TIMEOUTS: Dict[str, float] = {
+    "screen_stocks": 60.0,
+    "backtest_signal": 60.0,
+    "build_portfolio": 45.0,
+}
+
+
+# =============================================================================
+# MEMOIZATION
+# =============================================================================
+TOOL_MEMO_SIZE = 512
+
+
+def _symbol_ttl(*symbols: str) -> float:
+    """
+    Sembollerin piyasalarına göre en kısa TTL. Henüz çözülmemiş adlar
+    (altın, bitcoin, THYAO) hangi piyasada olduğu bilinmediğinden açık sayılır.
+    """
+    ttls = [history_ttl(s) if market_for_symbol(s) != "US" else CACHE_TTL_OPEN for s in symbols if s]
+    return min(ttls, default=CACHE_TTL_OPEN)
+
+
+# Sonucun ne kadar süre taze sayılacağı: saniye ya da argümanlardan TTL hesaplayan fonksiyon
+TOOL_FRESHNESS: Dict[str, Union[float, Callable[[Dict[str, Any]], float]]] = {
+    "analyze_stock": lambda args: _symbol_ttl(args["symbol"]),
+    "compare": lambda args: _symbol_ttl(*args["symbols"]),
+    "build_portfolio": lambda args: _symbol_ttl(*args["symbols"]),
+    "scan_sector": lambda args: _symbol_ttl("XU100.IS"),
+    "screen_stocks": lambda args: _symbol_ttl("XU100.IS"),
+    "get_forex": lambda args: _symbol_ttl("USDTRY=X"),
+    "get_fundamentals": CACHE_TTL_CLOSED,
+    "backtest_signal": CACHE_TTL_CLOSED,      # günlük barlar
+    "get_news": 300,
+    "web_search": 900,
+}
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def canonical_args(tool: Any, args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Argümanların kanonik hali: şemadaki varsayılanlar doldurulur, tipler
+    şemaya göre dönüştürülür, metinler boşluk/büyük-küçük harf farkından arındırılır.
+    Liste sırası korunur (compare/build_portfolio çıktısı sıraya bağlı).
+    """
+    schema = getattr(tool, "args_schema", None)
+    if schema is not None and hasattr(schema, "model_validate"):
+        try:
+            args = schema.model_validate(args).model_dump()
+        except Exception:
+            pass                 # geçersiz argümanlar olduğu gibi anahtarlanır; hata zaten saklanmaz
+    return _normalize(args)
+
+
+def _cacheable(message: ToolMessage) -> bool:
+    if message.status == "error":
+        return False
+    try:
+        payload = json.loads(message.content)
+    except (TypeError, ValueError):
+        return True
+    return not (isinstance(payload, dict) and "err" in payload)
+
+
+class ToolMemo:
+    """Tool sonuçları için TTL önbelleği + eşzamanlı aynı çağrıların birleştirilmesi."""
+
+    def __init__(self, freshness: Optional[Dict[str, Any]] = None, maxsize: int = TOOL_MEMO_SIZE,
+                 clock: Callable[[], float] = time.monotonic):
+        self.freshness = dict(TOOL_FRESHNESS if freshness is None else freshness)
+        self.cache = TTLCache(maxsize=maxsize, clock=clock)
+        self.flight = SingleFlight()
+
+    def key(self, call: Dict[str, Any], tool: Any) -> Optional[Hashable]:
+        """Çağrının anahtarı; tazelik politikası olmayan tool için None (saklanmaz)."""
+        if tool is None or call["name"] not in self.freshness:
+            return None
+        args = json.dumps(canonical_args(tool, call["args"]), sort_keys=True, ensure_ascii=False, default=str)
+        return call["name"], args
+
+    def ttl(self, call: Dict[str, Any]) -> float:
+        policy = self.freshness[call["name"]]
+        return policy(call["args"]) if callable(policy) else policy
+
+    def _store(self, key: Hashable, call: Dict[str, Any], output: Any) -> Any:
+        if isinstance(output, ToolMessage) and _cacheable(output):
+            try:
+                ttl = self.ttl(call)
+            except Exception:
+                ttl = 0          # politika argümanları okuyamadı; saklama
+            if ttl > 0:
+                self.cache.set(key, output.model_copy(update={"response_metadata": {}}), ttl)
+        return output
+
+    @staticmethod
+    def _reply(output: Any, call: Dict[str, Any], source: str) -> Any:
+        """Başka bir çağrının sonucunu bu çağrının tool_call_id'siyle yeni mesaj olarak döndürür."""
+        if not isinstance(output, ToolMessage):
+            return output
+        return output.model_copy(update={
+            "id": None,
+            "tool_call_id": call["id"],
+            "response_metadata": {source: True},
+        })
+
+    def _own(self, output: Any, call: Dict[str, Any]) -> Any:
+        """Lider çağrı kendi sonucunu alır; aynı turdaki kopyalar paylaşılan sonucu."""
+        if getattr(output, "tool_call_id", call["id"]) == call["id"]:
+            return output
+        return self._reply(output, call, "shared")
+
+    def lookup(self, key: Hashable, call: Dict[str, Any]) -> Optional[ToolMessage]:
+        found, message = self.cache.get(key)
+        return self._reply(message, call, "cached") if found else None
+
+    def run(self, key: Hashable, call: Dict[str, Any], fn: Callable[[], Any]) -> Any:
+        return self._own(self.flight.do(key, lambda: self._store(key, call, fn())), call)
+
+    async def arun(self, key: Hashable, call: Dict[str, Any], fn: Callable[[], Any]) -> Any:
+        async def run():
+            return self._store(key, call, await fn())
+        return self._own(await self.flight.ado(key, run), call)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), "shared": self.flight.shared}
+
+
+_memo: Optional[ToolMemo] = None
+_memo_lock = threading.Lock()
+
+
+def get_tool_memo() -> ToolMemo:
+    """Süreç genelinde tek ToolMemo (tüm oturumlar paylaşır)."""
+    global _memo
+    if _memo is None:
+        with _memo_lock:
+            if _memo is None:
+                _memo = ToolMemo()
+    return _memo
+
+
+# =============================================================================
+# TOOL NODE
+# =============================================================================
+# ToolNode'un genişletilen özel kancalarının beklenen parametreleri (langgraph-prebuilt 1.x)
+TOOL_NODE_HOOK_PARAMS = ("self", "call", "input_type", "tool_runtime")
+
+
+def _check_tool_node_hooks() -> None:
+    """Kurulu ToolNode'un kancaları beklenen imzada değilse sessizce yanlış çalışmak yerine hata verir."""
+    for name in ("_run_one", "_arun_one"):
+        hook = getattr(ToolNode, name, None)
+        if hook is None or tuple(inspect.signature(hook).parameters) != TOOL_NODE_HOOK_PARAMS:
+            raise ImportError(
+                f"ParallelToolNode langgraph-prebuilt 1.x gerektirir: ToolNode.{name} bulunamadı ya da imzası "
+                f"{TOOL_NODE_HOOK_PARAMS} değil (requirements.txt aralığına bakın)"
+            )
+
+
+_check_tool_node_hooks()
+
+
+class ParallelToolNode(ToolNode):
+    """Tool çağrılarını eşzamanlı, çağrı başına süre sınırıyla çalıştırır ve süre ölçer."""
+
+    def __init__(self, tools: Sequence, *, timeouts: Optional[Dict[str, float]] = None,
+                 default_timeout: float = TOOL_CALL_TIMEOUT, memo: Optional[ToolMemo] = None,
+                 **kwargs: Any):
+        super().__init__(tools, **kwargs)
+        self.timeouts = dict(TOOL_TIMEOUTS if timeouts is None else timeouts)
+        self.default_timeout = default_timeout
+        self.memo = memo
+
+    def timeout_for(self, name: str) -> float:
+        return self.timeouts.get(name, self.default_timeout)
+
+    def _memo_key(self, call) -> Optional[Hashable]:
+        return self.memo.key(call, self.tools_by_name.get(call["name"])) if self.memo is not None else None
+
+    def _timeout_message(self, call, timeout: float) -> ToolMessage:
+        return ToolMessage(
+            content=json.dumps({"err": f"{call['name']} {timeout:.0f}s içinde yanıt vermedi"}, ensure_ascii=False),
+            name=call["name"],
+            tool_call_id=call["id"],
+            status="error",
+        )
+
+    def _timed(self, output: Any, call, started: float, timed_out: bool = False) -> Any:
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        messages = output if isinstance(output, list) else [output]
+        for message in messages:
+            if isinstance(message, ToolMessage):
+                message.response_metadata["elapsed_ms"] = elapsed_ms
+        meta = getattr(output, "response_metadata", {})
+        note = " (zaman aşımı)" if timed_out else " (önbellek)" if meta.get("cached") \
+            else " (aynı turda paylaşıldı)" if meta.get("shared") else ""
+        print(f"[Tools] {call['name']}: {elapsed_ms / 1000:.2f}s{note}")
+        return output
+
+    def _run_one(self, call, input_type, tool_runtime):
+        timeout = self.timeout_for(call["name"])
+        started = time.perf_counter()
+        key = self._memo_key(call)
+        if key is not None:
+            cached = self.memo.lookup(key, call)
+            if cached is not None:
+                return self._timed(cached, call, started)
+
+        run_one = super()._run_one
+
+        def job():
+            if key is None:
+                return run_one(call, input_type, tool_runtime)
+            return self.memo.run(key, call, lambda: run_one(call, input_type, tool_runtime))
+
+        # ToolNode her çağrıyı ayrı thread'de çalıştırır; gövde tool havuzunda koşar ki beklenmeden bırakılabilsin
+        ctx = contextvars.copy_context()
+        future = get_tool_executor().submit(ctx.run, job)
+        try:
+            return self._timed(future.result(timeout=timeout), call, started)
+        except FuturesTimeout:
+            future.cancel()      # henüz başlamadıysa kuyruktan çıkar
+            return self._timed(self._timeout_message(call, timeout), call, started, timed_out=True)
+
+    async def _arun_one(self, call, input_type, tool_runtime):
+        timeout = self.timeout_for(call["name"])
+        started = time.perf_counter()
+        key = self._memo_key(call)
+        if key is None:
+            pending = super()._arun_one(call, input_type, tool_runtime)
+        else:
+            cached = self.memo.lookup(key, call)
+            if cached is not None:
+                return self._timed(cached, call, started)
+            arun_one = super()._arun_one
+            # Süre dolsa da paylaşılan çağrı iptal edilmez: bekleyen kopyalar ve önbellek sonucu alır
+            pending = asyncio.shield(self.memo.arun(key, call, lambda: arun_one(call, input_type, tool_runtime)))
+        try:
+            output = await asyncio.wait_for(pending, timeout)
+        except asyncio.TimeoutError:
+            return self._timed(self._timeout_message(call, timeout), call, started, timed_out=True)
+        return self._timed(output, call, started)